@@ -0,0 +1,93 @@
+"""
+End-to-end crew throughput against the local fake model backend.
+
+Usage:
+    python benchmarks/bench_e2e.py [--levels 1,4,16,64] [--runs N] [--task both]
+                                   [--latency S] [--tokens-per-sec N] [--response-tokens N]
+                                   [--error-rate F]
+
+Runs ``HelloWorldCrew.execute`` for ``--runs`` prompts at each concurrency
+level, with every stage streaming from the fake backend instead of Gemini,
+and reports runs/sec plus p50/p95/p99 run latency and time-to-first-token
+(from the start of a run to the first token of any of its stages).
+
+The response cache is turned off so every stage streams.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from hello_world.crew import CrewRun, HelloWorldCrew
+from hello_world.llm import FakeBackend
+from hello_world.loadgen import run_load
+
+from fake_env import fake_env
+
+PROMPTS = [
+    "Compare solid state battery suppliers",
+    "Summarize recent results on sodium ion cells",
+    "What changed in EV charging standards this year",
+    "Assess the credibility of battery recycling claims",
+]
+
+
+async def run_level(crew, concurrency, runs, task_type):
+    async def request(i):
+        run = CrewRun(PROMPTS[i % len(PROMPTS)], task_type)
+        start = time.perf_counter()
+        await crew.execute(run)
+        firsts = [s.first_token_at for s in run.stream_stats.values() if s.first_token_at is not None]
+        return {"ttft": min(firsts) - start if firsts else None}
+
+    return await run_load(request, runs, concurrency)
+
+
+def run(levels, runs, task_type, backend):
+    # Token echo would dominate the measurement
+    with fake_env(backend):
+        crew = HelloWorldCrew()
+        crew.warm_up()
+        results = [asyncio.run(run_level(crew, level, runs, task_type)) for level in levels]
+    return {
+        "task_type": task_type,
+        "runs_per_level": runs,
+        "backend": {
+            "latency": backend.latency,
+            "tokens_per_sec": backend.tokens_per_sec,
+            "response_tokens": backend.response_tokens,
+            "error_rate": backend.error_rate,
+            **backend.stats(),
+        },
+        "levels": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end crew benchmark on the fake model backend")
+    parser.add_argument("--levels", default="1,4,16,64", help="Comma separated concurrency levels")
+    parser.add_argument("--runs", type=int, default=64, help="Runs per concurrency level")
+    parser.add_argument("--task", default="both", choices=["research", "execute", "analyze", "both"])
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--response-tokens", type=int, default=120)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+    backend = FakeBackend(
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        response_tokens=args.response_tokens,
+        error_rate=args.error_rate,
+    )
+    report = run(levels, args.runs, args.task, backend)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark the streaming HTML extractor over a corpus of saved pages.
+
+Usage:
+    python benchmarks/bench_extraction.py [CORPUS_DIR] [--max-bytes N] [--repeat N]
+
+Without a corpus directory a synthetic corpus (small articles up to
+multi-megabyte pages) is generated. Reports pages/sec, MB/sec and peak RSS.
+"""
+
+import argparse
+import json
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from hello_world.tools.extraction import DEFAULT_MAX_BYTES, StreamingHTMLExtractor
+
+CHUNK_SIZE = 64 * 1024
+
+
+def synthetic_page(paragraphs, rows, seed):
+    rng = random.Random(seed)
+    words = ["market", "research", "data", "trend", "analysis", "growth", "signal", "model", "source"]
+    body = []
+    for i in range(paragraphs):
+        text = " ".join(rng.choice(words) for _ in range(60))
+        body.append(f"<p>{text} &amp; more.</p>")
+        if i % 50 == 0:
+            body.append("<ul>" + "".join(f"<li>item {j}</li>" for j in range(10)) + "</ul>")
+    table = "".join(f"<tr><td>{r}</td><td>{rng.random():.4f}</td></tr>" for r in range(rows))
+    return (
+        "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
+        f"<title>Synthetic page {seed}</title>"
+        "<meta name='author' content='Bench'><meta name='description' content='Synthetic'>"
+        "<script>var x = 1;</script></head><body><nav><a href='/'>Home</a></nav>"
+        f"<article>{''.join(body)}<table>{table}</table></article></body></html>"
+    ).encode("utf-8")
+
+
+def build_corpus(directory):
+    sizes = [(20, 10)] * 40 + [(400, 200)] * 8 + [(4000, 2000)] * 2
+    for i, (paragraphs, rows) in enumerate(sizes):
+        (directory / f"page_{i:03d}.html").write_bytes(synthetic_page(paragraphs, rows, i))
+
+
+def extract_file(path, max_bytes):
+    extractor = StreamingHTMLExtractor(max_bytes=max_bytes)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk or not extractor.feed_bytes(chunk):
+                break
+    return extractor.finish()
+
+
+def run(corpus, max_bytes, repeat):
+    pages = sorted(p for p in corpus.iterdir() if p.is_file())
+    processed_bytes = 0
+    truncated = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in pages:
+            result = extract_file(path, max_bytes)
+            processed_bytes += result["bytes_processed"]
+            truncated += result["truncated"]
+    elapsed = time.perf_counter() - start
+    count = len(pages) * repeat
+    return {
+        "pages": count,
+        "elapsed": elapsed,
+        "pages_per_sec": count / elapsed if elapsed else 0.0,
+        "mb_per_sec": processed_bytes / elapsed / 1e6 if elapsed else 0.0,
+        "largest_page_bytes": max((p.stat().st_size for p in pages), default=0),
+        "truncated_pages": truncated,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming HTML extraction benchmark")
+    parser.add_argument("corpus", nargs="?", help="Directory of saved HTML pages")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        report = run(Path(args.corpus), args.max_bytes, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_corpus(Path(tmp))
+            report = run(Path(tmp), args.max_bytes, args.repeat)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Micro-benchmarks of the hot paths with regression gates.
+
+Usage:
+    python benchmarks/bench_hot_paths.py [CASE ...] [--baseline PATH] [--save-baseline]
+                                         [--tolerance F] [--budget-ms MS] [--rounds N]
+
+Times catalog loading and lookups, CustomTool dispatch, ReACT validation,
+prompt loading and building, and the streaming loop over synthetic
+chunks, then compares each case with the stored baseline. Exits with
+status 1 when a case is more than ``--tolerance`` slower than its baseline
+or when one call takes longer than ``--budget-ms``, which defaults to the
+"Response Time" threshold in config/analysis.yaml.
+
+Run with ``--save-baseline`` on the reference machine to record a new
+baseline after an intended change.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from hello_world.microbench import (
+    CASES, DEFAULT_TOLERANCE, compare, failures, load_baseline, response_time_budget_ms, run_cases,
+    save_baseline
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hot path micro-benchmarks with regression gates")
+    parser.add_argument("cases", nargs="*", help=f"Cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown against the baseline, as a fraction")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Maximum time per call (default: Response Time threshold)")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    # Every stream must reach the streaming loop, not the response cache
+    os.environ["CACHE_ENABLED"] = "false"
+    budget_ms = args.budget_ms if args.budget_ms is not None else response_time_budget_ms()
+    results = run_cases(args.cases or None, rounds=args.rounds)
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_baseline(args.baseline, baseline)
+        report = compare(results, {}, args.tolerance, budget_ms)
+    else:
+        report = compare(results, load_baseline(args.baseline), args.tolerance, budget_ms)
+
+    failed = failures(report)
+    json.dump({"budget_ms": budget_ms, "tolerance": args.tolerance, "cases": report,
+               "failed": [entry["case"] for entry in failed]}, sys.stdout, indent=2)
+    print()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
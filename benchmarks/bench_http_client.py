@@ -0,0 +1,78 @@
+"""
+Fetch throughput of the pooled HTTP client against a local server.
+
+Usage:
+    python benchmarks/bench_http_client.py [--fetches N] [--concurrency N]
+                                           [--max-per-host N] [--page-kb N]
+
+Serves a ``--page-kb`` KB page from an in-process aiohttp server and
+fetches it ``--fetches`` times with at most ``--concurrency`` requests in
+flight, through one HttpClient limited to ``--max-per-host`` connections.
+Reports fetches/sec, p50/p95/p99 fetch latency and how many connections
+the server saw.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from aiohttp import web
+
+from hello_world.loadgen import run_load
+from hello_world.tools.http_client import HttpClient
+
+
+async def run(fetches, concurrency, max_per_host, page_kb):
+    body = b"<html><body>" + b"x" * (page_kb * 1024) + b"</body></html>"
+    connections = set()
+
+    async def page(request):
+        connections.add(request.transport.get_extra_info("peername"))
+        return web.Response(body=body, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    url = f"http://127.0.0.1:{port}/page"
+
+    client = HttpClient(max_per_host=max_per_host)
+    try:
+        async def fetch(index):
+            result = await client.fetch(url)
+            if result.status != 200:
+                raise RuntimeError(f"HTTP {result.status}")
+
+        report = await run_load(fetch, fetches, concurrency)
+    finally:
+        await client.close()
+        await runner.cleanup()
+    return {
+        "max_per_host": max_per_host,
+        "page_bytes": len(body),
+        **report,
+        "connections": len(connections),
+        "client": dict(client.stats),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pooled HTTP client throughput against a local server")
+    parser.add_argument("--fetches", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-per-host", type=int, default=10)
+    parser.add_argument("--page-kb", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args.fetches, args.concurrency, args.max_per_host, args.page_kb))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Crew runs against a per-minute model quota, with and without the rate limiter.
+
+Usage:
+    python benchmarks/bench_rate_limit.py [--runs N] [--rpm N] [--period S]
+                                          [--task research] [--latency S]
+                                          [--tokens-per-sec N] [--response-tokens N]
+
+Starts ``--runs`` concurrent crew runs against the fake model backend with
+a quota of ``--rpm`` requests per ``--period`` seconds, once with an
+unlimited rate limiter and once with one configured to the same quota.
+Both retry as the agents' ``error_handling`` allows. Reports failed runs,
+429 responses from the backend, runs/sec, p50/p99 run latency and the
+limiter's own counters.
+
+The response cache and single-flight sharing are turned off so every run
+reaches the backend.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from hello_world.crew import CrewRun, HelloWorldCrew
+from hello_world.llm import FakeBackend, RateLimiter, set_rate_limiter
+from hello_world.loadgen import summarize
+
+from fake_env import fake_env
+
+
+async def run_all(crew, runs, task_type):
+    latencies = []
+    failed = 0
+
+    async def one(index):
+        nonlocal failed
+        start = time.perf_counter()
+        run = CrewRun(f"Quota benchmark prompt {index}", task_type)
+        try:
+            await crew.execute(run)
+        except Exception:
+            failed += 1
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    return latencies, failed, time.perf_counter() - start
+
+
+def run(runs, rpm, period, task_type, make_backend):
+    report = {"runs": runs, "rpm_quota": rpm, "quota_period": period, "task_type": task_type, "modes": {}}
+    with fake_env(SINGLE_FLIGHT_ENABLED="false"):
+        crew = HelloWorldCrew()
+        crew.warm_up()
+    for mode, limiter in (("unlimited", RateLimiter()), ("limited", RateLimiter(rpm=rpm, period=period))):
+        backend = make_backend()
+        previous_limiter = set_rate_limiter(limiter)
+        try:
+            with fake_env(backend, SINGLE_FLIGHT_ENABLED="false"):
+                latencies, failed, elapsed = asyncio.run(run_all(crew, runs, task_type))
+        finally:
+            set_rate_limiter(previous_limiter)
+        report["modes"][mode] = {
+            "failed_runs": failed,
+            "rate_limited": backend.stats()["rate_limited"],
+            "upstream_calls": backend.calls,
+            "elapsed": elapsed,
+            "runs_per_sec": runs / elapsed if elapsed else 0.0,
+            "latency": summarize(latencies),
+            "limiter": limiter.stats(),
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crew runs at a model quota, with and without the rate limiter")
+    parser.add_argument("--runs", type=int, default=64)
+    parser.add_argument("--rpm", type=int, default=16, help="Requests allowed per --period")
+    parser.add_argument("--period", type=float, default=1.0, help="Quota window in seconds")
+    parser.add_argument("--task", default="research", choices=["research", "execute", "analyze", "both"])
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=400.0)
+    parser.add_argument("--response-tokens", type=int, default=60)
+    args = parser.parse_args(argv)
+
+    report = run(args.runs, args.rpm, args.period, args.task, lambda: FakeBackend(
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        response_tokens=args.response_tokens,
+        rpm_quota=args.rpm,
+        quota_period=args.period,
+    ))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Overhead of token echo on the synthetic streaming benchmark.
+
+Usage:
+    python benchmarks/bench_render.py [--streams N] [--tokens N] [--repeat N]
+
+Streams ``--streams`` concurrent synthetic ReACT responses from the fake
+backend (no latency, unlimited token rate) through stream_gemini_response
+and compares ways of echoing the tokens: the old flushed print per chunk,
+and the buffered renderer in console, jsonl and silent mode. Output goes
+to a temporary file so every write and flush reaches the OS. Reports
+microseconds per chunk and the number of writes to the file.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from hello_world.crew import stream_gemini_response
+from hello_world.llm import FakeBackend, StreamStats
+from hello_world.render import CONSOLE, JSONL, SILENT, Renderer
+
+
+class CountingFile:
+    """Text file wrapper that counts writes and flushes"""
+
+    def __init__(self, f):
+        self.f = f
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return self.f.write(text)
+
+    def flush(self):
+        self.flushes += 1
+        self.f.flush()
+
+
+class PrintPerChunk:
+    """What stream_gemini_response did before the renderer: print and flush every chunk"""
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, text, stream=None):
+        print(text, end='', flush=True, file=self.file)
+
+    def end_stream(self, stream=None):
+        pass
+
+
+async def stream_all(backend, renderer, streams):
+    """Run the streams concurrently; returns the number of chunks echoed"""
+    stats = [StreamStats("fake") for _ in range(streams)]
+    await asyncio.gather(*(
+        stream_gemini_response(f"Compare battery suppliers {i}", backend=backend, renderer=renderer,
+                               stream_id=f"stage-{i}", stats=stats[i])
+        for i in range(streams)
+    ))
+    return sum(s.chunks for s in stats)
+
+
+def run(streams, tokens, repeat):
+    # Every stream must reach the model, not the response cache
+    os.environ["CACHE_ENABLED"] = "false"
+    backend = FakeBackend(latency=0.0, tokens_per_sec=0, response_tokens=tokens, chunk_tokens=1)
+    modes = {
+        "print_per_chunk": lambda out: PrintPerChunk(out),
+        CONSOLE: lambda out: Renderer(CONSOLE, file=out),
+        JSONL: lambda out: Renderer(JSONL, file=out),
+        SILENT: lambda out: Renderer(SILENT, file=out),
+    }
+    report = {"streams": streams, "tokens_per_stream": tokens, "modes": {}}
+    # Warm up imports and the event loop machinery before the first timed mode
+    asyncio.run(stream_all(backend, Renderer(SILENT), streams))
+    for name, make in modes.items():
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as f:
+            out = CountingFile(f)
+            renderer = make(out)
+            start = time.perf_counter()
+            chunks = sum(asyncio.run(stream_all(backend, renderer, streams)) for _ in range(repeat))
+            elapsed = time.perf_counter() - start
+            report["modes"][name] = {
+                "elapsed": elapsed,
+                "us_per_chunk": elapsed / chunks * 1e6,
+                "writes": out.writes,
+                "flushes": out.flushes,
+                "bytes": f.tell(),
+            }
+    base = report["modes"]["print_per_chunk"]["us_per_chunk"]
+    silent = report["modes"][SILENT]["us_per_chunk"]
+    for entry in report["modes"].values():
+        entry["overhead_vs_silent_us"] = entry["us_per_chunk"] - silent
+        entry["speedup_vs_print"] = base / entry["us_per_chunk"] if entry["us_per_chunk"] else 0.0
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Token echo overhead benchmark")
+    parser.add_argument("--streams", type=int, default=8, help="Concurrent streams")
+    parser.add_argument("--tokens", type=int, default=2000, help="Tokens per stream")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    report = run(args.streams, args.tokens, args.repeat)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
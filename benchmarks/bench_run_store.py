@@ -0,0 +1,115 @@
+"""
+Run store cost on the hot path, write throughput and analytics query latency.
+
+Usage:
+    python benchmarks/bench_run_store.py [--runs N] [--prompts N] [--batch-size N]
+                                         [--queries N] [--db PATH]
+
+Runs one crew run per task type against the fake model backend, then
+records ``--runs`` copies of them (spread over ``--prompts`` different
+prompts) into a fresh run store. Reports how long ``record`` blocks the
+caller, how fast the background writer gets the runs to disk, and the
+latency of the query API over the stored runs.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from hello_world.crew import CrewRun, HelloWorldCrew
+from hello_world.llm import FakeBackend
+from hello_world.loadgen import summarize
+from hello_world.store import RunStore
+
+from fake_env import fake_env
+
+TASK_TYPES = ("research", "execute", "analyze", "both")
+
+
+def sample_runs():
+    """One finished run per task type, from the fake backend"""
+    with fake_env(FakeBackend(latency=0.0, tokens_per_sec=0, response_tokens=120)):
+        crew = HelloWorldCrew()
+        crew.run_store = None
+        return [asyncio.run(crew.execute(CrewRun("Sample prompt", task_type))) for task_type in TASK_TYPES]
+
+
+def timed(func, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def run(runs, prompts, batch_size, queries, path):
+    samples = sample_runs()
+    store = RunStore(path, batch_size=batch_size)
+    record_times = []
+    start = time.perf_counter()
+    for i in range(runs):
+        record = copy.copy(samples[i % len(samples)])
+        record.run_id = uuid.uuid4().hex
+        record.prompt = f"Benchmark prompt {i % prompts}"
+        record.started_at = time.time()
+        started = time.perf_counter()
+        store.record(record)
+        record_times.append(time.perf_counter() - started)
+    store.flush()
+    elapsed = time.perf_counter() - start
+    stats = store.stats()
+
+    run_id = store.runs(limit=1)[0]["run_id"]
+    report = {
+        "runs": runs,
+        "prompts": prompts,
+        "batch_size": batch_size,
+        "record": summarize(record_times),
+        "write": {
+            "elapsed": elapsed,
+            "runs_per_sec": stats["written"] / elapsed if elapsed else 0.0,
+            "batches": stats["batches"],
+            "dropped": stats["dropped"],
+            "errors": stats["errors"],
+            "db_bytes": os.path.getsize(path),
+        },
+        "queries": {
+            "runs_by_prompt": timed(lambda: store.runs(prompt="Benchmark prompt 0"), queries),
+            "latest_outputs": timed(lambda: store.latest_outputs("Benchmark prompt 0"), queries),
+            "get_run": timed(lambda: store.get_run(run_id), queries),
+            "stages_by_agent": timed(lambda: store.stages(agent="web_researcher"), queries),
+            "stage_summary": timed(store.stage_summary, queries),
+        },
+    }
+    store.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run store write and query performance")
+    parser.add_argument("--runs", type=int, default=5000)
+    parser.add_argument("--prompts", type=int, default=500, help="Different prompts the runs are spread over")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=50, help="Repetitions of each query")
+    parser.add_argument("--db", help="Database file (default: a temporary one)")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        report = run(args.runs, args.prompts, args.batch_size, args.queries, args.db)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(args.runs, args.prompts, args.batch_size, args.queries, os.path.join(tmp, "runs.db"))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Sustained load against the HTTP server on the fake model backend.
+
+Usage:
+    python benchmarks/bench_server.py [--levels 4,16,64] [--requests N] [--task research]
+                                      [--latency S] [--tokens-per-sec N] [--response-tokens N]
+                                      [--url http://127.0.0.1:8080]
+
+Starts a CrewServer in process on an ephemeral port (or targets a server
+already running at ``--url``) and, at each concurrency level, keeps that
+many streaming requests open until ``--requests`` have completed. Every
+request reads its server-sent events to the end. Reports requests/sec and
+p50/p95/p99 latency and time-to-first-token (first ``token`` event) as
+seen by the client.
+
+The load generator shares the event loop with the in-process server, so
+the numbers include the client's own parsing; use ``--url`` against a
+separate ``main.py --serve`` process to keep them apart. The response
+cache is turned off so every request streams from the model.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+from hello_world.llm import FakeBackend
+from hello_world.loadgen import run_load
+from hello_world.server import CrewServer
+
+from fake_env import fake_env
+
+PROMPTS = [
+    "Compare solid state battery suppliers",
+    "Summarize recent results on sodium ion cells",
+    "What changed in EV charging standards this year",
+    "Assess the credibility of battery recycling claims",
+]
+
+
+async def stream_request(session, url, prompt, task_type):
+    """POST one run and read its event stream; returns the client-side TTFT"""
+    start = time.perf_counter()
+    ttft = None
+    status = None
+    async with session.post(f"{url}/runs", json={"prompt": prompt, "task_type": task_type},
+                            headers={"Accept": "text/event-stream"}) as response:
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        event = None
+        async for line in response.content:
+            line = line.decode("utf-8").rstrip("\n")
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+                if event == "token" and ttft is None:
+                    ttft = time.perf_counter() - start
+            elif line.startswith("data: ") and event == "result":
+                status = json.loads(line[len("data: "):])["status"]
+    if status != "ok":
+        raise RuntimeError(f"Run finished with status {status}")
+    return {"ttft": ttft}
+
+
+async def run_levels(url, levels, requests, task_type):
+    connector = aiohttp.TCPConnector(limit=max(levels))
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = []
+        for level in levels:
+            async def request(i):
+                return await stream_request(session, url, PROMPTS[i % len(PROMPTS)], task_type)
+            results.append(await run_load(request, requests, level))
+        async with session.get(f"{url}/health") as response:
+            health = await response.json()
+    return results, health
+
+
+async def run_in_process(levels, requests, task_type):
+    server = CrewServer(max_runs=max(levels))
+    runner = web.AppRunner(server.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        results, health = await run_levels(f"http://127.0.0.1:{port}", levels, requests, task_type)
+    finally:
+        await runner.cleanup()
+    return results, health
+
+
+def run(levels, requests, task_type, backend, url=None):
+    if url:
+        results, health = asyncio.run(run_levels(url.rstrip("/"), levels, requests, task_type))
+        return {"url": url, "task_type": task_type, "requests_per_level": requests,
+                "levels": results, "server": health}
+
+    with fake_env(backend):
+        results, health = asyncio.run(run_in_process(levels, requests, task_type))
+    return {
+        "task_type": task_type,
+        "requests_per_level": requests,
+        "backend": {
+            "latency": backend.latency,
+            "tokens_per_sec": backend.tokens_per_sec,
+            "response_tokens": backend.response_tokens,
+            **backend.stats(),
+        },
+        "levels": results,
+        "server": health,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP server load test on the fake model backend")
+    parser.add_argument("--levels", default="4,16,64", help="Comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=128, help="Requests per concurrency level")
+    parser.add_argument("--task", default="research", choices=["research", "execute", "analyze", "both"])
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--response-tokens", type=int, default=120)
+    parser.add_argument("--url", help="Load an already running server instead of starting one")
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+    backend = FakeBackend(
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        response_tokens=args.response_tokens,
+    )
+    report = run(levels, args.requests, args.task, backend, url=args.url)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
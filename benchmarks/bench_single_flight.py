@@ -0,0 +1,99 @@
+"""
+Upstream calls saved by single-flight sharing under bursty traffic.
+
+Usage:
+    python benchmarks/bench_single_flight.py [--bursts N] [--burst-size N] [--distinct N]
+                                             [--task research] [--latency S]
+                                             [--tokens-per-sec N] [--response-tokens N]
+
+Sends ``--bursts`` bursts of ``--burst-size`` concurrent crew runs, each
+burst drawing its prompts from ``--distinct`` different user prompts (so a
+burst holds many identical requests), against the fake model backend,
+once with single-flight sharing off and once with it on. Reports upstream
+model calls, runs/sec and p50/p99 run latency for both.
+
+The response cache is turned off so sharing is the only source of reuse.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from hello_world.crew import CrewRun, HelloWorldCrew
+from hello_world.llm import FakeBackend
+from hello_world.loadgen import summarize
+
+from fake_env import fake_env
+
+PROMPTS = [
+    "Compare solid state battery suppliers",
+    "Summarize recent results on sodium ion cells",
+    "What changed in EV charging standards this year",
+    "Assess the credibility of battery recycling claims",
+]
+
+
+async def run_bursts(crew, bursts, burst_size, distinct, task_type):
+    latencies = []
+
+    async def one(prompt):
+        start = time.perf_counter()
+        await crew.execute(CrewRun(prompt, task_type))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(bursts):
+        await asyncio.gather(*(one(PROMPTS[i % distinct]) for i in range(burst_size)))
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def run(bursts, burst_size, distinct, task_type, make_backend):
+    report = {"bursts": bursts, "burst_size": burst_size, "distinct_prompts": distinct, "task_type": task_type,
+              "modes": {}}
+    with fake_env():
+        crew = HelloWorldCrew()
+        crew.warm_up()
+    for mode in ("off", "on"):
+        backend = make_backend()
+        with fake_env(backend, SINGLE_FLIGHT_ENABLED="true" if mode == "on" else "false"):
+            latencies, elapsed = asyncio.run(run_bursts(crew, bursts, burst_size, distinct, task_type))
+        report["modes"][mode] = {
+            "upstream_calls": backend.calls,
+            "runs": len(latencies),
+            "elapsed": elapsed,
+            "runs_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+            "latency": summarize(latencies),
+        }
+    off, on = report["modes"]["off"]["upstream_calls"], report["modes"]["on"]["upstream_calls"]
+    report["upstream_call_reduction"] = 1 - on / off if off else 0.0
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Single-flight sharing under bursty identical traffic")
+    parser.add_argument("--bursts", type=int, default=8)
+    parser.add_argument("--burst-size", type=int, default=32, help="Concurrent runs per burst")
+    parser.add_argument("--distinct", type=int, default=4, help="Different prompts per burst")
+    parser.add_argument("--task", default="research", choices=["research", "execute", "analyze", "both"])
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--response-tokens", type=int, default=120)
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.distinct <= len(PROMPTS):
+        parser.error(f"--distinct must be between 1 and {len(PROMPTS)}")
+    report = run(args.bursts, args.burst_size, args.distinct, args.task, lambda: FakeBackend(
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        response_tokens=args.response_tokens,
+    ))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Cold start: CLI ``--help``, crew import and time to the first prompt sent.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N] [--import-budget S]
+                                       [--first-prompt-budget S]
+
+Runs each case ``--repeat`` times, every time in a fresh interpreter so
+nothing is already imported, and reports the wall time of each along with
+any heavy dependency (crewAI, LangChain, the Gemini SDK, requests, bs4)
+the case pulled in. Exits with status 1 when the median ``--help`` or
+crew import takes longer than ``--import-budget`` seconds, or the median
+time to the first prompt longer than ``--first-prompt-budget``.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+from hello_world.loadgen import summarize
+
+HEAVY_MODULES = ["crewai", "langchain", "google.generativeai", "requests", "bs4"]
+REPORT_HEAVY = "[m for m in %r if m in sys.modules]" % (HEAVY_MODULES,)
+
+CASES = {
+    "help": f"""
+        import json, runpy, sys, time
+        sys.argv = ["main", "--help"]
+        start = time.perf_counter()
+        try:
+            runpy.run_module("hello_world.main", run_name="__main__")
+        except SystemExit:
+            pass
+        print()
+        print(json.dumps({{"elapsed": time.perf_counter() - start, "heavy": {REPORT_HEAVY}}}))
+    """,
+    "crew_import": f"""
+        import time
+        start = time.perf_counter()
+        import hello_world.crew
+        import hello_world.tools
+        elapsed = time.perf_counter() - start
+        import json, sys
+        print(json.dumps({{"elapsed": elapsed, "heavy": {REPORT_HEAVY}}}))
+    """,
+    "first_prompt": f"""
+        import time
+        start = time.perf_counter()
+        import asyncio, json, sys
+        from hello_world.crew import HelloWorldCrew, stream_gemini_response
+
+        sent = []
+
+        class FakeModel:
+            async def generate_content_async(self, prompt, generation_config=None, stream=False):
+                sent.append(time.perf_counter())
+                async def chunks():
+                    yield "[THOUGHT] ok"
+                return chunks()
+
+        crew = HelloWorldCrew()
+        config = crew.agent_catalog.get_agent_by_tag("research")
+        prompt = crew._get_agent_prompt(config, "startup benchmark")
+        asyncio.run(stream_gemini_response(prompt, model=FakeModel()))
+        print()
+        print(json.dumps({{"elapsed": sent[0] - start, "heavy": {REPORT_HEAVY}}}))
+    """,
+}
+
+
+def run_fresh(script):
+    """Run ``script`` in a fresh interpreter and return the JSON it prints last"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), CACHE_ENABLED="false")
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script)],
+        capture_output=True, text=True, env=env, timeout=60
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold start timings in fresh interpreters")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=0.5, help="Seconds allowed for --help and the crew import")
+    parser.add_argument("--first-prompt-budget", type=float, default=1.0, help="Seconds allowed until the first prompt is sent")
+    args = parser.parse_args(argv)
+
+    budgets = {"help": args.import_budget, "crew_import": args.import_budget, "first_prompt": args.first_prompt_budget}
+    cases = {}
+    for name, script in CASES.items():
+        reports = [run_fresh(script) for _ in range(args.repeat)]
+        timings = summarize([report["elapsed"] for report in reports])
+        cases[name] = {
+            "elapsed": timings,
+            "budget": budgets[name],
+            "heavy": sorted({module for report in reports for module in report["heavy"]}),
+            "failed": timings["p50"] > budgets[name],
+        }
+
+    failed = [name for name, case in cases.items() if case["failed"]]
+    json.dump({"repeat": args.repeat, "cases": cases, "failed": failed}, sys.stdout, indent=2)
+    print()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
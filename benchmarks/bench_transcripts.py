@@ -0,0 +1,81 @@
+"""
+Benchmark bulk ReACT transcript validation.
+
+Usage:
+    python benchmarks/bench_transcripts.py [FILE ...] [--lines N]
+
+Without transcript files a synthetic transcript of ``--lines`` lines
+(default two million) is generated, mixing valid and invalid sections with
+free text. Reports lines/sec and the per-rule counts.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import yaml
+
+from hello_world.config.react_validation import ReactValidator
+
+PROMPTS_PATH = "src/hello_world/config/prompts.yaml"
+
+SAMPLE_LINES = [
+    "Thought: I should compare the sources before drawing any conclusion",
+    "Thought: too short",
+    "[THOUGHT] The question needs recent market data from several regions",
+    "Action: search_web(query=\"solid state battery market 2025\")",
+    "Action: search_web",
+    "Action: fact_check()",
+    "[ACTION] validate_source(url=\"https://www.nature.com/articles/x\")",
+    "Observation: Found 12 relevant articles, 3 peer reviewed",
+    "[OBSERVATION] Two sources disagree on the growth rate",
+    "Reflection: the evidence is consistent enough to summarize",
+    "Plain narrative text that belongs to no section",
+]
+
+
+def write_synthetic(path, lines, seed=7):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(lines):
+            f.write(rng.choice(SAMPLE_LINES) + "\n")
+
+
+def run(paths):
+    with open(PROMPTS_PATH, "r") as f:
+        rules = yaml.safe_load(f)["templates"]["validation_rules"]
+    validator = ReactValidator(rules)
+
+    start = time.perf_counter()
+    report = validator.validate_transcript_files(paths)
+    elapsed = time.perf_counter() - start
+    report["elapsed"] = elapsed
+    report["lines_per_sec"] = report["lines"] / elapsed if elapsed else 0.0
+    report["mb_per_sec"] = sum(os.path.getsize(p) for p in paths) / elapsed / 1e6 if elapsed else 0.0
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk transcript validation benchmark")
+    parser.add_argument("files", nargs="*", help="Transcript files, one section per line")
+    parser.add_argument("--lines", type=int, default=2_000_000, help="Lines in the synthetic transcript")
+    args = parser.parse_args(argv)
+
+    if args.files:
+        report = run(args.files)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "transcript.txt")
+            write_synthetic(path, args.lines)
+            report = run([path])
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Shared setup for the benchmarks that run the crew on the fake model backend.
+"""
+
+import contextlib
+import os
+
+from hello_world.llm import set_backend
+from hello_world.render import Renderer, SILENT, set_renderer
+
+
+@contextlib.contextmanager
+def fake_env(backend=None, **env):
+    """
+    Run the block with token echo silenced, the response cache off, the
+    ``env`` variables set and, when given, ``backend`` as the model backend.
+    Everything is restored on exit.
+    """
+    settings = {"CACHE_ENABLED": "false", **env}
+    saved = {name: os.environ.get(name) for name in settings}
+    os.environ.update(settings)
+    previous_renderer = set_renderer(Renderer(SILENT))
+    previous_backend = set_backend(backend) if backend is not None else None
+    try:
+        yield
+    finally:
+        if backend is not None:
+            set_backend(previous_backend)
+        set_renderer(previous_renderer)
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
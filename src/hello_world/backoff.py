@@ -0,0 +1,15 @@
+"""
+Retry backoff shared by the model and HTTP clients
+"""
+
+import random
+
+
+def full_jitter_backoff(attempt: int, base: float, cap: float) -> float:
+    """
+    Seconds to wait before retry ``attempt`` (counted from 1).
+
+    Full jitter: uniform over [0, base * 2^(attempt - 1)], capped at ``cap``,
+    so clients retrying together spread out instead of retrying in step.
+    """
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
@@ -0,0 +1,149 @@
+"""
+Batch runner: JSONL prompts in, JSONL results out
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+from hello_world.crew import CrewRun
+
+VALID_TASK_TYPES = ("research", "execute", "analyze", "both")
+
+_END_OF_INPUT = object()
+
+
+def parse_batch_line(line: str, default_task: str = "both") -> Dict[str, Any]:
+    """
+    Parse one input line into a prompt request.
+
+    A line is either a JSON object with ``prompt`` and optional ``task_type``
+    and ``id`` fields, or a bare JSON string used as the prompt.
+
+    Raises:
+        ValueError: If the line is not a valid request
+    """
+    data = json.loads(line)
+    if isinstance(data, str):
+        data = {"prompt": data}
+    if not isinstance(data, dict):
+        raise ValueError("Each line must be a JSON object or string")
+    return parse_request(data, default_task)
+
+
+def parse_request(data: Dict[str, Any], default_task: str = "both") -> Dict[str, Any]:
+    """
+    Validate a decoded prompt request with ``prompt`` and optional ``task_type`` and ``id``.
+
+    Raises:
+        ValueError: If the request is not valid
+    """
+    prompt = data.get("prompt")
+    if not isinstance(prompt, str) or not prompt.strip():
+        raise ValueError("Missing required field: prompt")
+    task_type = data.get("task_type", default_task)
+    if task_type not in VALID_TASK_TYPES:
+        raise ValueError(f"Invalid task_type: {task_type}")
+    return {"id": data.get("id"), "prompt": prompt, "task_type": task_type}
+
+
+async def run_batch(
+    crew,
+    lines: Iterable[str],
+    out: TextIO,
+    concurrency: int = 4,
+    default_task: str = "both"
+) -> Dict[str, Any]:
+    """
+    Run every prompt in ``lines`` through ``crew`` and write one JSON result per line.
+
+    Input is read lazily and handed to ``concurrency`` workers through a
+    bounded queue, and each result is written and flushed as soon as its
+    prompt completes, so memory use does not depend on the input size.
+    Results are written in completion order and carry the input ``index``.
+
+    Args:
+        crew: A warm HelloWorldCrew (anything with ``execute(run)``)
+        lines: Iterable of JSONL input lines, e.g. an open file or stdin
+        out: Text stream the JSONL results are written to
+        concurrency: Maximum number of prompts in flight
+        default_task: Task type for lines that do not set ``task_type``
+
+    Returns:
+        Summary with counts, elapsed time and prompts/sec
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    summary = {"total": 0, "succeeded": 0, "failed": 0}
+    start = time.perf_counter()
+
+    def write(record):
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+
+    async def read_input():
+        iterator = iter(lines)
+        index = 0
+        while True:
+            # Reading may block on a pipe, so it happens off the event loop
+            line = await asyncio.to_thread(next, iterator, _END_OF_INPUT)
+            if line is _END_OF_INPUT:
+                break
+            if line.strip():
+                await queue.put((index, line))
+            index += 1
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, line = item
+            record = await _run_one(crew, index, line, default_task)
+            summary["total"] += 1
+            summary["succeeded" if record["status"] == "ok" else "failed"] += 1
+            write(record)
+
+    reader = asyncio.create_task(read_input())
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(reader, *workers)
+    finally:
+        for task in [reader, *workers]:
+            task.cancel()
+
+    summary["elapsed"] = time.perf_counter() - start
+    summary["prompts_per_sec"] = summary["total"] / summary["elapsed"] if summary["elapsed"] > 0 else 0.0
+    return summary
+
+
+def run_record(run: Optional[CrewRun], error: Optional[BaseException], started: float,
+               **fields: Any) -> Dict[str, Any]:
+    """Result record for one prompt: status, error, the run's outputs and timings, and elapsed time"""
+    record: Dict[str, Any] = {**fields, "status": "ok" if error is None else "error", "error": None}
+    if error is not None:
+        record["error"] = f"{type(error).__name__}: {error}"
+    if run is not None:
+        record.update(run.to_dict())
+    record["elapsed"] = time.perf_counter() - started
+    return record
+
+
+async def _run_one(crew, index: int, line: str, default_task: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    request_id = None
+    run: Optional[CrewRun] = None
+    error = None
+    try:
+        request = parse_batch_line(line, default_task)
+        request_id = request["id"]
+        run = CrewRun(request["prompt"], request["task_type"])
+        await crew.execute(run)
+    except Exception as e:
+        error = e
+    return run_record(run, error, started, index=index, id=request_id)
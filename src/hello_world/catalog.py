@@ -0,0 +1,208 @@
+"""
+Indexed agent catalog with a compiled on-disk snapshot
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import yaml
+
+from hello_world.prompts import PromptTemplate
+
+AGENT_TYPES = ['research', 'execution', 'analysis']
+SNAPSHOT_FILENAME = ".catalog_snapshot.json"
+SNAPSHOT_VERSION = 1
+
+
+class AgentCatalog:
+    """
+    Agent configurations loaded from the catalog directory.
+
+    Tags, capabilities and use cases from ``metadata.yaml`` are indexed when
+    the catalog loads, so lookups do not scan the agents. The parsed catalog
+    is written to a JSON snapshot next to the YAML files and reused on the
+    next start for as long as no source file has changed.
+    """
+
+    def __init__(self, agents_dir="src/hello_world/agents", snapshot_path=None, use_snapshot=True):
+        self.agents_dir = Path(agents_dir)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.agents_dir / SNAPSHOT_FILENAME
+        self.use_snapshot = use_snapshot
+        self.metadata = {}
+        self.agents = {}
+        self.fingerprint = ""
+        self.loaded_from_snapshot = False
+        self._load()
+
+    def _load(self):
+        sources = self._source_stats()
+        fingerprint = self._fingerprint(sources)
+        snapshot = self._read_snapshot(fingerprint) if self.use_snapshot else None
+
+        if snapshot is not None:
+            self.metadata = snapshot['metadata']
+            self.agents = snapshot['agents']
+            self.loaded_from_snapshot = True
+        else:
+            self.metadata = self._load_metadata()
+            self.agents = {}
+            self._load_agents()
+            self.loaded_from_snapshot = False
+            if self.use_snapshot:
+                self._write_snapshot(fingerprint)
+
+        self.fingerprint = fingerprint
+        self._build_indexes()
+        self._build_templates()
+
+    def _load_metadata(self):
+        with open(self.agents_dir / "metadata.yaml", 'r') as f:
+            return yaml.safe_load(f)
+
+    def _load_agents(self):
+        """Load all agent configurations from the catalog"""
+        for config_file in self._agent_files():
+            with open(config_file, 'r') as f:
+                config = yaml.safe_load(f)
+                self.agents[config['name']] = config
+
+    def _agent_files(self) -> List[Path]:
+        files = []
+        for agent_type in AGENT_TYPES:
+            agent_dir = self.agents_dir / agent_type
+            if agent_dir.exists():
+                files.extend(sorted(agent_dir.glob("*.yaml")))
+        return files
+
+    def _source_stats(self) -> Dict[str, List[int]]:
+        """mtime and size of every file the catalog is built from"""
+        stats = {}
+        for path in [self.agents_dir / "metadata.yaml"] + self._agent_files():
+            st = path.stat()
+            stats[path.relative_to(self.agents_dir).as_posix()] = [st.st_mtime_ns, st.st_size]
+        return stats
+
+    @staticmethod
+    def _fingerprint(sources: Dict[str, List[int]]) -> str:
+        payload = json.dumps({'version': SNAPSHOT_VERSION, 'sources': sources}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _read_snapshot(self, fingerprint: str) -> Optional[Dict]:
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if snapshot.get('fingerprint') != fingerprint:
+            return None
+        return snapshot
+
+    def _write_snapshot(self, fingerprint: str):
+        snapshot = {'fingerprint': fingerprint, 'metadata': self.metadata, 'agents': self.agents}
+        tmp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, default=str)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError:
+            # A read-only install still works, it just parses YAML every time
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def is_stale(self) -> bool:
+        """True when a catalog source file changed since this catalog loaded"""
+        try:
+            return self._fingerprint(self._source_stats()) != self.fingerprint
+        except OSError:
+            return True
+
+    def reload(self) -> bool:
+        """Reload the catalog if it is stale; returns True when it was reloaded"""
+        if not self.is_stale():
+            return False
+        self._load()
+        return True
+
+    def _build_indexes(self):
+        self._order = {name: i for i, name in enumerate(self.agents)}
+        self._tag_index: Dict[str, List[str]] = {}
+        self._capability_index: Dict[str, List[str]] = {}
+        self._use_cases: Dict[str, frozenset] = {}
+        agent_tags = (self.metadata or {}).get('agent_tags') or {}
+        for name in self.agents:
+            tags = agent_tags.get(name) or {}
+            for tag in tags.get('categories') or []:
+                self._tag_index.setdefault(tag, []).append(name)
+            for capability in tags.get('capabilities') or []:
+                self._capability_index.setdefault(capability, []).append(name)
+            self._use_cases[name] = frozenset(tags.get('use_cases') or [])
+
+    def _build_templates(self):
+        """Compile each ReACT agent's prompt template once per load"""
+        self._templates: Dict[str, PromptTemplate] = {
+            name: PromptTemplate.from_config(config)
+            for name, config in self.agents.items()
+            if config.get('react_config')
+        }
+
+    def prompt_template(self, name) -> Optional[PromptTemplate]:
+        """Compiled prompt template of the named agent, if it is a ReACT agent"""
+        return self._templates.get(name)
+
+    def prompt_report(self) -> Dict[str, Dict]:
+        """Estimated template tokens and remaining user-prompt budget per agent"""
+        return {name: template.to_dict() for name, template in self._templates.items()}
+
+    def get_agent_by_tag(self, tag):
+        """Retrieve agent configuration by tag"""
+        names = self._tag_index.get(tag)
+        return self.agents[names[0]] if names else None
+
+    def get_agent_by_capability(self, capability):
+        """Retrieve agent configuration by capability"""
+        names = self._capability_index.get(capability)
+        return self.agents[names[0]] if names else None
+
+    def find_agents(
+        self,
+        tags: Optional[Iterable[str]] = None,
+        capabilities: Optional[Iterable[str]] = None,
+        match: str = "all",
+        use_cases: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """
+        Find agents by tags and capabilities.
+
+        Args:
+            tags: Category tags to match
+            capabilities: Capabilities to match
+            match: "all" to require every tag and capability (AND), "any" for at least one (OR)
+            use_cases: Use cases to rank by; agents covering more of them come first
+
+        Returns:
+            Matching agent configurations, best ranked first, catalog order otherwise
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"Unsupported match mode: {match}")
+
+        postings = [set(self._tag_index.get(tag, ())) for tag in tags or ()]
+        postings += [set(self._capability_index.get(cap, ())) for cap in capabilities or ()]
+
+        if not postings:
+            names = set(self.agents)
+        elif match == "all":
+            names = set.intersection(*sorted(postings, key=len))
+        else:
+            names = set.union(*postings)
+
+        wanted = frozenset(use_cases or ())
+        ranked = sorted(
+            names,
+            key=lambda name: (-len(self._use_cases[name] & wanted), self._order[name])
+        )
+        return [self.agents[name] for name in ranked]
@@ -9,6 +9,10 @@ class ConfigLoader:
         with open(os.path.join(self.config_dir, "prompts.yaml"), "r") as f:
             return yaml.safe_load(f)
 
+    def load_analysis(self):
+        with open(os.path.join(self.config_dir, "analysis.yaml"), "r") as f:
+            return yaml.safe_load(f)
+
     def apply_defaults(self, config):
         if "templates" not in config:
             config["templates"] = {}
@@ -1,28 +1,39 @@
+import re
+from collections import deque
+
+from hello_world.events import DEFAULT_QUEUE_SIZE, DROP_OLDEST, ProgressBus
+
+from .rule_engine import RuleEngine
+
 class ReactValidator:
     def __init__(self, validation_rules):
         self.rules = validation_rules
+        # Formats, minimum lengths and required fields compiled once
+        self.engine = RuleEngine(validation_rules)
         self.current_step = 0
         self.total_steps = 0
         self.is_complete = False
-        self.stream_history = []
+        # Recent updates only; consumers that need every update subscribe to the bus
+        self.stream_history = deque(maxlen=DEFAULT_QUEUE_SIZE)
+        self.events = ProgressBus()
 
     def validate_thought(self, thought):
-        if not thought.startswith("Thought:"): 
-            return False
-        if len(thought) < self.rules["thought"]["min_length"]:
-            return False
-        return True
+        return self.engine.check("thought", thought)
 
     def validate_action(self, action):
-        if not action.startswith("Action:"): 
-            return False
-        # Check if action has both name and parameters
-        if "(" not in action or ")" not in action:
-            return False
-        return True
+        # Format "Action: {action_name}({params})" with both fields present
+        return self.engine.check("action", action)
 
     def validate_observation(self, observation):
-        return observation.startswith("Observation:")
+        return self.engine.check("observation", observation)
+
+    def validate_transcripts(self, lines):
+        """Validate stored transcript lines in bulk; returns pass/fail counts per rule"""
+        return self.engine.validate_lines(lines)
+
+    def validate_transcript_files(self, paths):
+        """Like ``validate_transcripts``, streaming each file from disk"""
+        return self.engine.validate_files(paths)
 
     def start_tracking(self, task_name):
         self.current_step = 0
@@ -37,8 +48,177 @@ class ReactValidator:
     def complete_task(self):
         self.is_complete = True
 
-    def create_stream(self):
-        return {"history": self.stream_history}
+    def create_stream(self, maxsize=DEFAULT_QUEUE_SIZE, policy=DROP_OLDEST):
+        """Subscribe to this validator's updates with a bounded queue"""
+        return self.events.subscribe(maxsize=maxsize, policy=policy)
 
     def stream_update(self, message):
         self.stream_history.append(message)
+        self.events.publish("update", message=message)
+
+
+# Section headers of the response template in HelloWorldCrew._get_agent_prompt
+SECTION_PREFIXES = {
+    "THOUGHT": "Thought:",
+    "ACTION": "Action:",
+    "OBSERVATION": "Observation:",
+    "REFLECTION": "Reflection:",
+}
+# Which section may follow which; a step can start over with a new thought
+SECTION_TRANSITIONS = {
+    None: {"THOUGHT"},
+    "THOUGHT": {"ACTION"},
+    "ACTION": {"OBSERVATION"},
+    "OBSERVATION": {"REFLECTION", "THOUGHT"},
+    "REFLECTION": {"THOUGHT"},
+}
+REQUIRED_SECTIONS = ("THOUGHT", "ACTION", "OBSERVATION")
+
+_SECTION_RE = re.compile(r"\[(THOUGHT|ACTION|OBSERVATION|REFLECTION)\]", re.IGNORECASE)
+# Longest header text that could still be completed by the next chunk
+_MAX_HEADER_CHARS = max(len(name) for name in SECTION_PREFIXES) + 2
+_MAX_SECTION_CHARS = 8192
+
+
+class ReactStreamValidator:
+    """
+    Validates a ReACT response section by section while it streams.
+
+    Feed chunks as they arrive; each section is checked with the
+    ReactValidator rules as soon as the next header closes it. Once the
+    output is clearly malformed (no header where one should be, sections
+    out of order, or too many invalid sections) ``should_abort`` turns true
+    so the caller can stop the stream instead of paying for the rest.
+    With ``early_abort`` off the problem is only reported.
+    """
+
+    def __init__(self, validation_rules, max_preamble_chars=200, max_invalid_sections=2, early_abort=True):
+        self.validator = ReactValidator(validation_rules)
+        self.early_abort = early_abort
+        self.max_preamble_chars = max_preamble_chars
+        self.max_invalid_sections = max_invalid_sections
+        self.sections = []
+        self.errors = []
+        self.abort_reason = None
+        self.finished = False
+        self._buffer = ""
+        self._current = None
+        self._body = []
+        self._body_chars = 0
+        self._preamble_chars = 0
+        self._invalid = 0
+
+    @property
+    def malformed(self):
+        return self.abort_reason is not None
+
+    @property
+    def should_abort(self):
+        return self.early_abort and self.malformed
+
+    def feed(self, chunk):
+        """
+        Consume the next chunk of streamed text.
+
+        Returns:
+            The sections closed by this chunk, each as a result dict
+        """
+        if self.malformed or self.finished:
+            return []
+        closed_before = len(self.sections)
+        self._buffer += chunk
+        while not self.malformed:
+            match = _SECTION_RE.search(self._buffer)
+            if match is None:
+                break
+            self._append(self._buffer[:match.start()])
+            self._buffer = self._buffer[match.end():]
+            self._open(match.group(1).upper())
+
+        if not self.malformed:
+            # Hold back a trailing "[..." that the next chunk may turn into a header
+            start = self._buffer.rfind("[")
+            if start != -1 and len(self._buffer) - start < _MAX_HEADER_CHARS and "]" not in self._buffer[start:]:
+                self._append(self._buffer[:start])
+                self._buffer = self._buffer[start:]
+            else:
+                self._append(self._buffer)
+                self._buffer = ""
+        return self.sections[closed_before:]
+
+    def finish(self):
+        """Close the last section and check that the required sections appeared."""
+        if not self.finished:
+            self.finished = True
+            if not self.malformed:
+                self._append(self._buffer)
+                self._buffer = ""
+                self._close()
+                seen = {section["section"] for section in self.sections}
+                for name in REQUIRED_SECTIONS:
+                    if name not in seen:
+                        self.errors.append(f"Missing [{name}] section")
+        return self.report()
+
+    def report(self):
+        return {
+            "valid": not self.errors,
+            "aborted": self.should_abort,
+            "abort_reason": self.abort_reason,
+            "sections": list(self.sections),
+            "errors": list(self.errors),
+        }
+
+    def _append(self, text):
+        if not text:
+            return
+        if self._current is None:
+            self._preamble_chars += len(text.strip())
+            if self._preamble_chars > self.max_preamble_chars:
+                self._abort(f"No ReACT section header within the first {self.max_preamble_chars} characters")
+            return
+        if self._body_chars < _MAX_SECTION_CHARS:
+            self._body.append(text[:_MAX_SECTION_CHARS - self._body_chars])
+        self._body_chars += len(text)
+
+    def _open(self, name):
+        previous = self._current
+        self._close()
+        if self.malformed:
+            return
+        if name not in SECTION_TRANSITIONS[previous]:
+            after = f"after [{previous}]" if previous else "at the start"
+            self._abort(f"[{name}] is out of order {after}")
+            return
+        self._current = name
+
+    def _close(self):
+        if self._current is None:
+            return
+        name, body = self._current, "".join(self._body).strip()
+        self._current, self._body, self._body_chars = None, [], 0
+
+        prefix = SECTION_PREFIXES[name]
+        if body.lower().startswith(prefix.lower()):
+            body = body[len(prefix):].strip()
+        text = f"{prefix} {body}"
+        if name == "THOUGHT":
+            valid = self.validator.validate_thought(text)
+        elif name == "ACTION":
+            valid = self.validator.validate_action(text)
+        elif name == "OBSERVATION":
+            valid = self.validator.validate_observation(text) and bool(body)
+        else:
+            valid = bool(body)
+
+        result = {"section": name, "valid": valid, "length": len(body)}
+        self.sections.append(result)
+        if not valid:
+            self._invalid += 1
+            self.errors.append(f"Invalid [{name}] section")
+            if self._invalid >= self.max_invalid_sections:
+                self._abort(f"{self._invalid} invalid sections")
+
+    def _abort(self, reason):
+        self.errors.append(reason)
+        self.abort_reason = reason
@@ -0,0 +1,147 @@
+import re
+
+# Formats used when prompts.yaml leaves a rule without one
+DEFAULT_FORMATS = {
+    "thought": "Thought: {reasoning}",
+    "action": "Action: {action_name}({params})",
+    "observation": "Observation: {result}",
+}
+
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+def compile_format(template):
+    """
+    Turn a format template such as ``Action: {action_name}({params})`` into a regex.
+
+    Literal text must match exactly, except that any run of spaces also
+    accepts no or more whitespace; each ``{field}`` becomes a named group.
+    """
+    parts = []
+    position = 0
+    for match in _PLACEHOLDER_RE.finditer(template):
+        parts.append(_literal(template[position:match.start()]))
+        parts.append(f"(?P<{match.group(1)}>.*?)")
+        position = match.end()
+    parts.append(_literal(template[position:]))
+    return re.compile("".join(parts) + r"\Z", re.DOTALL)
+
+
+def _literal(text):
+    return r"\s*".join(re.escape(piece) for piece in re.split(r"\s+", text))
+
+
+def format_prefix(template):
+    """The literal text before the first field, e.g. ``Thought:``."""
+    match = _PLACEHOLDER_RE.search(template)
+    return (template[:match.start()] if match else template).strip()
+
+
+class CompiledRule:
+    """One validation rule from prompts.yaml, compiled once and reused for every check."""
+
+    def __init__(self, name, rule):
+        self.name = name
+        self.format = rule.get("format") or DEFAULT_FORMATS.get(name, name.capitalize() + ": {text}")
+        self.pattern = compile_format(self.format)
+        self.prefix = format_prefix(self.format)
+        self.min_length = rule.get("min_length", 0)
+        self.required_fields = tuple(rule.get("required_fields", ()))
+
+    def failure(self, text):
+        """Why ``text`` breaks this rule, or None when it passes."""
+        text = text.strip()
+        match = self.pattern.match(text)
+        if match is None:
+            return "format"
+        if len(text) < self.min_length:
+            return "min_length"
+        for field in self.required_fields:
+            if not (match.group(field) or "").strip():
+                return "required_fields"
+        return None
+
+    def check(self, text):
+        return self.failure(text) is None
+
+
+class RuleEngine:
+    """
+    All ReACT validation rules compiled into matchers.
+
+    Lines are routed to a rule by one combined regex over the rule
+    prefixes (``Thought:``) and section headers (``[THOUGHT]``), so bulk
+    validation costs two regex matches per line.
+    """
+
+    def __init__(self, validation_rules):
+        names = list(validation_rules)
+        names += [name for name in DEFAULT_FORMATS if name not in validation_rules]
+        self.rules = {name: CompiledRule(name, validation_rules.get(name) or {}) for name in names}
+        self._groups = {}
+        alternatives = []
+        for index, rule in enumerate(self.rules.values()):
+            self._groups[f"p{index}"] = (rule, False)
+            self._groups[f"h{index}"] = (rule, True)
+            alternatives.append(f"(?P<p{index}>{re.escape(rule.prefix)})")
+            alternatives.append(fr"(?P<h{index}>(?i:\[{re.escape(rule.name)}\]))")
+        self._router = re.compile(r"\s*(?:" + "|".join(alternatives) + ")")
+
+    def check(self, name, text):
+        return self.rules[name].check(text)
+
+    def route(self, line):
+        """The rule a transcript line falls under and the text to check, or ``(None, None)``."""
+        match = self._router.match(line)
+        if match is None:
+            return None, None
+        rule, is_header = self._groups[match.lastgroup]
+        if is_header:
+            # "[THOUGHT] ..." is checked as "Thought: ..."
+            return rule, f"{rule.prefix} {line[match.end():].strip()}"
+        return rule, line
+
+    def validate_lines(self, lines, report=None):
+        """
+        Validate transcript lines, counting passes and failures per rule.
+
+        Lines that start no section are counted as unmatched, not failed.
+        Pass ``report`` to keep accumulating into an earlier result.
+        """
+        if report is None:
+            report = self.empty_report()
+        counts = report["rules"]
+        total = unmatched = 0
+        for line in lines:
+            total += 1
+            rule, text = self.route(line)
+            if rule is None:
+                unmatched += 1
+                continue
+            counts_for_rule = counts[rule.name]
+            reason = rule.failure(text)
+            if reason is None:
+                counts_for_rule["passed"] += 1
+            else:
+                counts_for_rule["failed"] += 1
+                counts_for_rule["failures"][reason] = counts_for_rule["failures"].get(reason, 0) + 1
+        report["lines"] += total
+        report["unmatched"] += unmatched
+        return report
+
+    def validate_files(self, paths):
+        """Stream each transcript file line by line through ``validate_lines``."""
+        report = self.empty_report()
+        for path in paths:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                self.validate_lines(f, report)
+            report["files"] += 1
+        return report
+
+    def empty_report(self):
+        return {
+            "lines": 0,
+            "unmatched": 0,
+            "files": 0,
+            "rules": {name: {"passed": 0, "failed": 0, "failures": {}} for name in self.rules},
+        }
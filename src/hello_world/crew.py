@@ -1,85 +1,219 @@
-from crewai import Agent, Crew, Process, Task
-from hello_world.tools.custom_tool import CustomTool
-import yaml
+from hello_world.catalog import AgentCatalog
+from hello_world.config.config_loader import ConfigLoader
+from hello_world.config.react_validation import ReactStreamValidator
+from hello_world.events import ProgressBus
+from hello_world.metrics import get_metrics
+from hello_world.prompts import PromptTemplate
+from hello_world.render import get_renderer
+from hello_world.scheduler import StageScheduler
+from hello_world.store import get_run_store
+from hello_world.llm import (
+    DEFAULT_BUFFER_SIZE, RetryPolicy, StreamStats, buffered_stream, cache_key, estimate_tokens, get_backend,
+    get_default_cache, get_rate_limiter, get_single_flight, limited_stream, replay_chunks
+)
+from contextlib import aclosing
 from dotenv import load_dotenv
-import os
-import json
 import asyncio
-import google.generativeai as genai
-from pathlib import Path
+import os
+import time
+import uuid
 
 load_dotenv()  # Load environment variables from .env file
 
-# Configure Google Gemini API
-genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-
-class AgentCatalog:
-    def __init__(self, agents_dir="src/hello_world/agents"):
-        self.agents_dir = Path(agents_dir)
-        self.metadata = self._load_metadata()
-        self.agents = {}
-        self._load_agents()
-
-    def _load_metadata(self):
-        with open(self.agents_dir / "metadata.yaml", 'r') as f:
-            return yaml.safe_load(f)
-
-    def _load_agents(self):
-        """Load all agent configurations from the catalog"""
-        for agent_type in ['research', 'execution', 'analysis']:
-            agent_dir = self.agents_dir / agent_type
-            if agent_dir.exists():
-                for config_file in agent_dir.glob("*.yaml"):
-                    with open(config_file, 'r') as f:
-                        config = yaml.safe_load(f)
-                        self.agents[config['name']] = config
-
-    def get_agent_by_tag(self, tag):
-        """Retrieve agent configuration by tag"""
-        for agent_name, config in self.agents.items():
-            if tag in self.metadata['agent_tags'].get(agent_name, {}).get('categories', []):
-                return config
-        return None
-
-    def get_agent_by_capability(self, capability):
-        """Retrieve agent configuration by capability"""
-        for agent_name, config in self.agents.items():
-            if capability in self.metadata['agent_tags'].get(agent_name, {}).get('capabilities', []):
-                return config
-        return None
-
-async def stream_gemini_response(prompt, model_name="gemini-pro", progress_callback=None):
-    """Stream responses from Gemini with progress tracking"""
-    model = genai.GenerativeModel(model_name)
-    
-    response = model.generate_content(
-        prompt,
-        generation_config=genai.types.GenerationConfig(
-            temperature=0.7,
-            candidate_count=1,
-            stop_sequences=None,
-            max_output_tokens=2048,
-            top_p=0.8,
-            top_k=40,
-        ),
-        stream=True
-    )
+# crewai, langchain and the Gemini SDK are imported on first use so that
+# importing this module (and `main.py --help`) stays fast. The Gemini client
+# is configured by hello_world.llm.get_genai() the first time a model is created.
+
+# Generation settings sent with every request; also part of the cache key
+DEFAULT_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "candidate_count": 1,
+    "stop_sequences": None,
+    "max_output_tokens": 2048,
+    "top_p": 0.8,
+    "top_k": 40,
+}
+
+async def stream_gemini_response(prompt, model_name="gemini-pro", progress_callback=None,
+                                 model=None, stats=None, buffer_size=DEFAULT_BUFFER_SIZE,
+                                 generation_config=None, cache=None, validator=None, backend=None,
+                                 stream_id=None, renderer=None, single_flight=None, retry_policy=None,
+                                 limiter=None):
+    """
+    Stream responses from Gemini with progress tracking.
+
+    Uses the SDK's async client so the event loop keeps serving other
+    streams while this one waits on the network. Chunks pass through a
+    bounded buffer; pass a ``StreamStats`` to collect time-to-first-token
+    and tokens/sec for the stream.
+
+    Identical requests (backend, prompt, model and generation config) are answered
+    from the response cache when one is configured, replaying the stored
+    chunks through the same output path as a live stream.
+
+    Pass a ``ReactStreamValidator`` to check the ReACT sections as they
+    arrive; the stream is cancelled as soon as it reports the output as
+    malformed, and the partial response is returned (and not cached).
+
+    Without an explicit ``model`` the client comes from ``backend``, or the
+    process-wide backend selected by ``LLM_BACKEND`` (Gemini by default).
+
+    Tokens are echoed through ``renderer`` (the process-wide one by
+    default) as the stream named ``stream_id``.
+
+    Identical requests that are in flight at the same time share one
+    upstream stream through ``single_flight`` (the process-wide group
+    unless ``SINGLE_FLIGHT_ENABLED`` is false): a caller that joins late
+    gets the chunks produced so far, then the live ones, and leaving early
+    does not end the stream for the others. Requests for an explicit
+    ``model`` are never shared.
+
+    Each upstream request is admitted by ``limiter`` (the process-wide rate
+    limiter by default) with the prompt plus ``max_output_tokens`` reserved
+    against the tokens-per-minute quota, and retried as ``retry_policy``
+    allows (no retries by default) when it fails before its first chunk.
+    """
+    config = {**DEFAULT_GENERATION_CONFIG, **(generation_config or {})}
+    if cache is None:
+        cache = get_default_cache()
+    if single_flight is None and model is None:
+        single_flight = get_single_flight()
+    # An explicit model bypasses the backends, so it is keyed without one
+    backend_name = getattr(backend or get_backend(), 'name', '') if model is None else ''
+    key = (cache_key(prompt, model_name, config, backend_name)
+           if cache is not None or single_flight is not None else None)
+    if stats is not None:
+        stats.start()
+
+    cached = await cache.aget(key) if cache is not None else None
+    flight = None
+    if cached is not None:
+        source = replay_chunks(cached)
+    else:
+        async def open_model_stream():
+            nonlocal model
+            if model is None:
+                model = (backend or get_backend()).create_model(model_name)
+            return await model.generate_content_async(
+                prompt,
+                generation_config={key: value for key, value in config.items() if value is not None},
+                stream=True
+            )
+
+        prompt_tokens = estimate_tokens(prompt if isinstance(prompt, str) else str(prompt))
+
+        async def open_stream():
+            return limited_stream(
+                open_model_stream, retry_policy, limiter or get_rate_limiter(),
+                reserve_tokens=prompt_tokens + (config.get("max_output_tokens") or 0),
+                prompt_tokens=prompt_tokens
+            )
+
+        if single_flight is not None:
+            source = flight = single_flight.subscribe(key, open_stream)
+        else:
+            source = await open_stream()
 
+    if renderer is None:
+        renderer = get_renderer()
     full_response = ""
-    async for chunk in response:
-        if chunk.text:
-            print(chunk.text, end='', flush=True)
-            full_response += chunk.text
-            if progress_callback:
-                await progress_callback(chunk.text)
+    chunks = []
+    try:
+        # Closed on the way out, so an abort stops the upstream read at once
+        async with aclosing(buffered_stream(source, buffer_size=buffer_size, stats=stats)) as stream:
+            async for text in stream:
+                renderer.write(text, stream_id)
+                full_response += text
+                chunks.append(text)
+                if progress_callback:
+                    await progress_callback(text)
+                if validator is not None:
+                    validator.feed(text)
+                    if validator.should_abort:
+                        break
+    finally:
+        renderer.end_stream(stream_id)
+
+    aborted = False
+    if validator is not None:
+        validator.finish()
+        aborted = validator.should_abort
+
+    # Of the callers sharing a stream, only one stores it
+    if cached is None and cache is not None and not aborted and (flight is None or flight.claim_result()):
+        await cache.aput(key, chunks)
     
     return full_response
 
+async def print_progress(subscription, renderer=None):
+    """Render one line per progress event until the run's event bus closes"""
+    renderer = renderer or get_renderer()
+    async for event in subscription:
+        renderer.message(f"➤ Step {event.data['step']}: {event.data['step_type']} - {event.message}",
+                         kind="progress", step=event.data['step'], step_type=event.data['step_type'])
+
+# Stages each task type runs, and the stages each stage has to wait for.
+# Stages without a dependency between them stream concurrently.
+TASK_STAGES = {
+    "research": ["researcher"],
+    "execute": ["processor"],
+    "analyze": ["analyzer"],
+    "both": ["researcher", "processor"],
+}
+
+STAGE_DEPENDENCIES = {
+    "researcher": [],
+    "processor": [],
+    "analyzer": ["processor"],
+}
+
+class CrewRun:
+    """Outputs and timings collected for a single prompt run through the crew"""
+
+    def __init__(self, prompt, task_type="both"):
+        self.run_id = uuid.uuid4().hex
+        self.prompt = prompt
+        self.task_type = task_type
+        self.started_at = None
+        self.outputs = {}
+        self.stream_stats = {}
+        self.validation = {}
+        self.prompts = {}
+        self.alerts = []
+        self.stage_report = None
+        # Progress for anyone watching this run: a console, a logger, a metrics sink
+        self.events = ProgressBus()
+
+    def to_dict(self):
+        report = self.stage_report
+        return {
+            "run_id": self.run_id,
+            "task_type": self.task_type,
+            "outputs": dict(self.outputs),
+            "timings": {
+                "wall_time": report.wall_time if report else 0.0,
+                "stages": {
+                    name: {"status": stage["status"], "duration": stage["duration"]}
+                    for name, stage in (report.stages.items() if report else [])
+                },
+            },
+            "streams": {stage: stats.to_dict() for stage, stats in self.stream_stats.items()},
+            "validation": {stage: validator.report() for stage, validator in self.validation.items()},
+            "prompts": dict(self.prompts),
+            "alerts": list(self.alerts),
+        }
+
 class HelloWorldCrew:
     def __init__(self):
         self.agent_catalog = AgentCatalog()
         self.validation_status = {"reasoning": [], "actions": []}
         self.progress_tracker = {"current_step": 0, "total_steps": 0, "status": ""}
+        self.stage_report = None
+        self.stream_stats = {}
+        self.validation_rules = None
+        self.events = ProgressBus()
+        self.metrics = get_metrics()
+        self.run_store = get_run_store()
 
     def validate_reasoning(self, reasoning_step):
         """Validate each reasoning step in the ReACT process"""
@@ -111,34 +245,44 @@ class HelloWorldCrew:
         self.validation_status["actions"].append(validation_result)
         return validation_result
 
-    def track_progress(self, step_type, status):
-        """Track progress of ReACT methodology execution"""
+    def track_progress(self, step_type, status, run=None):
+        """
+        Track progress of ReACT methodology execution.
+
+        Publishes a "progress" event on the run's event bus (or the crew's,
+        without a run) instead of printing; subscribers decide how to show it.
+        """
         self.progress_tracker["current_step"] += 1
         self.progress_tracker["status"] = status
-        
-        progress = f"""
-▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓
-📊 Progress Update:
-➤ Step {self.progress_tracker["current_step"]}: {step_type}
-➤ Status: {status}
-▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓▓
-"""
-        print(progress)
+        bus = run.events if run is not None else self.events
+        bus.publish(
+            "progress",
+            message=status,
+            step=self.progress_tracker["current_step"],
+            step_type=step_type,
+        )
 
-    def _create_agent_from_config(self, agent_type):
-        """Create a CrewAI agent from catalog configuration"""
+    def _agent_config(self, agent_type):
+        """Catalog configuration for a stage's agent type"""
         config = None
-        
+
         if agent_type == "researcher":
             config = self.agent_catalog.get_agent_by_tag("research")
         elif agent_type == "processor":
             config = self.agent_catalog.get_agent_by_tag("execution")
         elif agent_type == "analyzer":
             config = self.agent_catalog.get_agent_by_tag("analysis")
-            
+
         if not config:
             raise ValueError(f"No configuration found for agent type: {agent_type}")
-            
+        return config
+
+    def _create_agent_from_config(self, agent_type):
+        """Create a CrewAI agent from catalog configuration"""
+        from crewai import Agent
+        from hello_world.tools import CustomTool
+
+        config = self._agent_config(agent_type)
         return Agent(
             role=config['role'],
             goal=config['goal'],
@@ -147,35 +291,101 @@ class HelloWorldCrew:
             verbose=True,
             tools=[CustomTool()]
         )
+
+    def warm_up(self):
+        """
+        Load what a run needs before the first one arrives: the ReACT
+        validation rules and the model client (``genai.configure`` for Gemini).
+
+        Stages stream their prompts without a crewAI agent, so no agents are
+        built here.
+        """
+        self._validation_rules()
+        backend = get_backend()
+        for agent_type in STAGE_DEPENDENCIES:
+            backend.create_model(self._agent_config(agent_type)['model']['name'])
             
     async def run_with_streaming(self, prompt="Tell me about yourself", task_type="both"):
-        """Run crew with streaming responses using enhanced ReACT methodology"""
+        """
+        Run crew with streaming responses using enhanced ReACT methodology.
+
+        Returns the finished CrewRun, with each stage's full response in
+        ``outputs`` and its validation results in ``validation``.
+        """
         self.progress_tracker["total_steps"] = 4
-        
-        if task_type in ["research", "both"]:
-            await self._run_researcher(prompt)
-            
-        if task_type in ["execute", "both"]:
-            await self._run_processor(prompt)
-            
-        if task_type == "analyze":
-            await self._run_analyzer(prompt)
-            
-        return True
+
+        run = CrewRun(prompt, task_type)
+        console = asyncio.create_task(print_progress(run.events.subscribe(kinds=("progress",))))
+        try:
+            await self.execute(run)
+        finally:
+            await console
+            self.stage_report = run.stage_report
+            self.stream_stats = run.stream_stats
+            if self.stage_report is not None:
+                get_renderer().message(self.stage_report.format(), kind="stage_report")
+
+        return run
+
+    async def execute(self, run):
+        """
+        Run the stages for ``run.task_type``, recording outputs and timings on ``run``.
+
+        Keeps no per-run state on the crew, so one crew can serve many
+        concurrent runs. Errors propagate after the stage report is recorded.
+        Stage and run timings go to the metrics collector, and the
+        optimization rules it reports as triggered are kept on ``run.alerts``
+        and published as "alert" events. With a run store the finished run
+        is queued for writing to it, errors included.
+        """
+        scheduler = self._build_scheduler(run)
+        run.started_at = time.time()
+        run.events.publish("run_started", message=run.task_type)
+        error = None
+        try:
+            await scheduler.run(TASK_STAGES.get(run.task_type, []))
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            run.stage_report = scheduler.last_report
+            report = run.stage_report
+            wall_time = report.wall_time if report else 0.0
+            self.metrics.record_run(wall_time, error)
+            run.alerts = self.metrics.alerts()
+            for alert in run.alerts:
+                run.events.publish("alert", message=alert['action'], **alert)
+            run.events.publish("run_finished", message=run.task_type, wall_time=wall_time)
+            run.events.close()
+            if self.run_store is not None:
+                self.run_store.record(run, error)
+        return run
+
+    def _build_scheduler(self, run):
+        """Create a stage scheduler wired to this crew's agent stages"""
+        runners = {
+            "researcher": self._run_researcher,
+            "processor": self._run_processor,
+            "analyzer": self._run_analyzer,
+        }
+        scheduler = StageScheduler()
+        for name, depends_on in STAGE_DEPENDENCIES.items():
+            runner = runners[name]
+            scheduler.add_stage(name, lambda runner=runner: runner(run.prompt, run), depends_on)
+        return scheduler
             
-    async def _run_analyzer(self, prompt):
+    async def _run_analyzer(self, prompt, run=None):
         """Run the analyzer agent"""
-        analyzer = self._create_agent_from_config("analyzer")
         config = self.agent_catalog.get_agent_by_tag("analysis")
             
         analyzer_messages = [{
             "role": "system",
-            "content": self._get_agent_prompt(config, prompt)
+            "content": self._get_agent_prompt(config, prompt, run, "analyzer")
         }]
         
-        self.track_progress("Analysis Initialization", "Starting performance analysis")
+        self.track_progress("Analysis Initialization", "Starting performance analysis", run)
         
-        print("""
+        get_renderer().banner("""
 ╔══════════════════════════════════════════════════════════════════╗
 ║  📊 INITIALIZING PERFORMANCE ANALYZER v1.0 - GEMINI CORE        ║
 ╚══════════════════════════════════════════════════════════════════╝
@@ -188,21 +398,20 @@ class HelloWorldCrew:
 
 [SYS]: Beginning Performance Analysis...
 """)
-        await stream_gemini_response(analyzer_messages[0]["content"])
+        return await self._stream_stage("analyzer", config, analyzer_messages[0]["content"], run)
         
-    async def _run_researcher(self, prompt):
+    async def _run_researcher(self, prompt, run=None):
         """Run the researcher agent"""
-        researcher = self._create_agent_from_config("researcher")
         config = self.agent_catalog.get_agent_by_tag("research")
         
         researcher_messages = [{
             "role": "system",
-            "content": self._get_agent_prompt(config, prompt)
+            "content": self._get_agent_prompt(config, prompt, run, "researcher")
         }]
         
-        self.track_progress("Research Initialization", "Starting ReACT analysis")
+        self.track_progress("Research Initialization", "Starting ReACT analysis", run)
         
-        print("""
+        get_renderer().banner("""
 ╔══════════════════════════════════════════════════════════════════╗
 ║  🤖 INITIALIZING RESEARCH ANALYST v2.0 - GEMINI CORE LOADED     ║
 ╚══════════════════════════════════════════════════════════════════╝
@@ -215,21 +424,20 @@ class HelloWorldCrew:
 
 [SYS]: Initiating ReACT Methodology Analysis...
 """)
-        await stream_gemini_response(researcher_messages[0]["content"])
+        return await self._stream_stage("researcher", config, researcher_messages[0]["content"], run)
         
-    async def _run_processor(self, prompt):
+    async def _run_processor(self, prompt, run=None):
         """Run the processor agent"""
-        processor = self._create_agent_from_config("processor")
         config = self.agent_catalog.get_agent_by_tag("execution")
         
         processor_messages = [{
             "role": "system",
-            "content": self._get_agent_prompt(config, prompt)
+            "content": self._get_agent_prompt(config, prompt, run, "processor")
         }]
         
-        self.track_progress("Processing Phase", "Starting data processing")
+        self.track_progress("Processing Phase", "Starting data processing", run)
         
-        print("""
+        get_renderer().banner("""
 ╔══════════════════════════════════════════════════════════════════╗
 ║  ⚡ ACTIVATING DATA PROCESSOR v1.5 - GEMINI CORE INITIALIZED    ║
 ║     WITH ReACT VALIDATION PROTOCOLS                             ║
@@ -245,34 +453,80 @@ class HelloWorldCrew:
 
 [SYS]: Beginning Processing Sequence with ReACT Validation...
 """)
-        await stream_gemini_response(processor_messages[0]["content"])
+        return await self._stream_stage("processor", config, processor_messages[0]["content"], run)
 
-    def _get_agent_prompt(self, config, user_prompt):
-        """Generate agent-specific prompt based on configuration"""
-        base_prompt = f"""You are a {config['role']} with the goal: {config['goal']}.
-Use ReACT (Reasoning and Acting) methodology with the following structure:
+    async def _stream_stage(self, stage, config, content, run=None):
+        """
+        Stream a stage's prompt, recording its output and stream statistics on the run.
+
+        The agent's ``model.max_tokens`` caps the response, and its
+        ``error_handling.retry_attempts`` sets how often a failed request is retried.
+        """
+        stats = StreamStats(config['model']['name'])
+        validator = ReactStreamValidator(
+            self._validation_rules(),
+            early_abort=os.getenv("REACT_EARLY_ABORT", "true").lower() == "true"
+        )
+        bus = run.events if run is not None else self.events
+        if run is not None:
+            run.stream_stats[stage] = stats
+            run.validation[stage] = validator
+
+        async def on_chunk(text):
+            bus.publish("token", stage, text, chars=len(text))
+
+        generation_config = {}
+        if config['model'].get('max_tokens'):
+            generation_config["max_output_tokens"] = config['model']['max_tokens']
+
+        error = None
+        bus.publish("stage_started", stage, config['model']['name'])
+        started = time.perf_counter()
+        try:
+            output = await stream_gemini_response(
+                content, model_name=config['model']['name'], progress_callback=on_chunk,
+                stats=stats, validator=validator, stream_id=stage, generation_config=generation_config,
+                retry_policy=RetryPolicy.from_config(config)
+            )
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.metrics.record_stage(stage, config.get('name'), time.perf_counter() - started,
+                                      stats.time_to_first_token, error)
+            bus.publish("stage_finished", stage, "", **stats.to_dict())
+        if run is not None:
+            run.outputs[stage] = output
+        return output
 
-1. Thought: {config['react_config']['components']['thought']['structure']}
-2. Action: Specify the action to take
-3. Observation: Document results
-4. {config['react_config']['components'].get('reflection', {}).get('name', 'Reflection')}: Analyze and plan next steps
+    def _validation_rules(self):
+        """ReACT validation rules from prompts.yaml, loaded on first use"""
+        if self.validation_rules is None:
+            self.validation_rules = ConfigLoader().load_prompts()["templates"]["validation_rules"]
+        return self.validation_rules
 
-Format your response using this template:
-[THOUGHT] Your reasoning here...
-[ACTION] Your proposed action...
-[OBSERVATION] Results and findings...
-[{config['react_config']['components'].get('reflection', {}).get('name', 'REFLECTION')}] Analysis and next steps...
+    def _get_agent_prompt(self, config, user_prompt, run=None, stage=None):
+        """
+        Generate agent-specific prompt based on configuration.
 
-User Prompt: {user_prompt}
-"""
-        return base_prompt
+        Uses the template compiled when the catalog loaded, so only the user
+        prompt is filled in here; it is trimmed to fit the agent's
+        ``model.max_prompt_tokens`` budget. The size report is kept on ``run``.
+        """
+        template = self.agent_catalog.prompt_template(config.get('name'))
+        if template is None:
+            template = PromptTemplate.from_config(config)
+        prompt, report = template.render_with_report(user_prompt)
+        if run is not None and stage is not None:
+            run.prompts[stage] = report
+        return prompt
 
     def run(self, prompt="Tell me about yourself", task_type="both"):
         """Run crew synchronously"""
         try:
             return asyncio.run(self.run_with_streaming(prompt=prompt, task_type=task_type))
         except KeyboardInterrupt:
-            print("""
+            get_renderer().banner("""
 ╔══════════════════════════════════════════════════════════════════╗
 ║  🛑 EMERGENCY SHUTDOWN SEQUENCE INITIATED                        ║
 ╚══════════════════════════════════════════════════════════════════╝
@@ -282,7 +536,7 @@ User Prompt: {user_prompt}
 """)
             return None
         except Exception as e:
-            print(f"""
+            get_renderer().banner(f"""
 ╔══════════════════════════════════════════════════════════════════╗
 ║  ⚠️ SYSTEM MALFUNCTION DETECTED                                 ║
 ╚══════════════════════════════════════════════════════════════════╝
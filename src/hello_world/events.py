@@ -0,0 +1,207 @@
+"""
+Async publish/subscribe bus for run progress events
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE)
+
+DEFAULT_QUEUE_SIZE = 256
+
+
+class ProgressEvent:
+    """One thing that happened during a run: a stage starting, a token arriving, a step finishing."""
+
+    __slots__ = ('seq', 'kind', 'stage', 'message', 'data', 'timestamp')
+
+    def __init__(self, seq: int, kind: str, stage: Optional[str] = None, message: str = "",
+                 data: Optional[Dict[str, Any]] = None, timestamp: Optional[float] = None):
+        self.seq = seq
+        self.kind = kind
+        self.stage = stage
+        self.message = message
+        self.data = data or {}
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @property
+    def key(self):
+        """Events with the same key describe the same piece of state and can be coalesced."""
+        return (self.kind, self.stage)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"ProgressEvent(seq={self.seq}, kind={self.kind!r}, stage={self.stage!r})"
+
+
+class Subscription:
+    """
+    One consumer's bounded view of a bus.
+
+    Publishing never waits on the consumer. When ``maxsize`` events are
+    pending, ``drop_oldest`` discards the oldest pending event, while
+    ``coalesce`` keeps only the latest event per (kind, stage) so a slow
+    consumer always sees the current state. Iterate with ``async for``;
+    iteration ends once the bus is closed and the queue is drained.
+    """
+
+    def __init__(self, bus: "ProgressBus", maxsize: int, policy: str, kinds: Optional[Iterable[str]]):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.bus = bus
+        self.maxsize = maxsize
+        self.policy = policy
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.dropped = 0
+        self.delivered = 0
+        self.closed = False
+        self._pending = OrderedDict() if policy == COALESCE else deque()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _offer(self, event: ProgressEvent) -> None:
+        if self.closed or (self.kinds is not None and event.kind not in self.kinds):
+            return
+        if self.policy == COALESCE:
+            if event.key in self._pending:
+                # Replace the stale state in place; the consumer only needs the latest
+                del self._pending[event.key]
+                self.dropped += 1
+            elif len(self._pending) >= self.maxsize:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[event.key] = event
+        else:
+            if len(self._pending) >= self.maxsize:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append(event)
+        self._ready.set()
+
+    def get_nowait(self) -> Optional[ProgressEvent]:
+        if not self._pending:
+            return None
+        self.delivered += 1
+        if self.policy == COALESCE:
+            return self._pending.popitem(last=False)[1]
+        return self._pending.popleft()
+
+    def drain(self) -> List[ProgressEvent]:
+        """Take every pending event without waiting."""
+        events = []
+        while self._pending:
+            events.append(self.get_nowait())
+        return events
+
+    async def get(self) -> Optional[ProgressEvent]:
+        """Wait for the next event; None once the subscription is closed and drained."""
+        while not self._pending:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self.get_nowait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ProgressEvent:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def close(self) -> None:
+        """Stop receiving events; already pending events can still be read."""
+        self.closed = True
+        self._ready.set()
+        self.bus._unsubscribe(self)
+
+
+class ProgressBus:
+    """
+    Fan-out of progress events to any number of subscribers.
+
+    ``publish`` is cheap and never blocks: each subscriber has its own
+    bounded queue with its own overflow policy, so a slow UI or logger
+    cannot hold up the token stream or grow memory. Events published from
+    other threads are handed to the bus's event loop.
+    """
+
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+        self._seq = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self.published = 0
+        self.closed = False
+
+    def subscribe(
+        self,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        policy: str = DROP_OLDEST,
+        kinds: Optional[Iterable[str]] = None
+    ) -> Subscription:
+        """Add a consumer; ``kinds`` limits it to those event kinds."""
+        subscription = Subscription(self, maxsize, policy, kinds)
+        if self.closed:
+            subscription.closed = True
+            return subscription
+        self._bind_loop()
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def publish(self, kind: str, stage: Optional[str] = None, message: str = "", **data: Any) -> ProgressEvent:
+        event = ProgressEvent(next(self._seq), kind, stage, message, data)
+        if self.closed:
+            return event
+        self.published += 1
+        if self._loop is not None and threading.get_ident() != self._thread_id:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+        else:
+            self._deliver(event)
+        return event
+
+    def close(self) -> None:
+        """End every subscription once its pending events are consumed."""
+        if self.closed:
+            return
+        if self._loop is not None and threading.get_ident() != self._thread_id:
+            self._loop.call_soon_threadsafe(self.close)
+            return
+        self.closed = True
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def _deliver(self, event: ProgressEvent) -> None:
+        for subscription in self._subscriptions:
+            subscription._offer(event)
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def _bind_loop(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._loop is None:
+            self._loop = loop
+            self._thread_id = threading.get_ident()
@@ -0,0 +1,52 @@
+"""
+Model client helpers: backends, streaming, response caching, single-flight, rate limiting, token accounting
+"""
+
+from .backends import (
+    BACKENDS, FakeBackend, GeminiBackend, InjectedError, LLMBackend, get_backend, register_backend,
+    set_backend
+)
+from .cache import ResponseCache, cache_key, get_default_cache, replay_chunks
+from .gemini import create_model, get_genai
+from .ratelimit import (
+    RateLimiter, RateLimitError, RetryPolicy, TokenBucket, get_rate_limiter, is_rate_limit_error,
+    is_retryable_error, limited_stream, set_rate_limiter
+)
+from .singleflight import FlightSubscription, SingleFlight, get_single_flight
+from .streaming import DEFAULT_BUFFER_SIZE, StreamStats, buffered_stream
+from .tokens import TRIM_MARKER, estimate_tokens, trim_to_tokens
+
+__all__ = [
+    'BACKENDS',
+    'DEFAULT_BUFFER_SIZE',
+    'FakeBackend',
+    'FlightSubscription',
+    'GeminiBackend',
+    'InjectedError',
+    'LLMBackend',
+    'RateLimiter',
+    'RateLimitError',
+    'ResponseCache',
+    'RetryPolicy',
+    'SingleFlight',
+    'StreamStats',
+    'TRIM_MARKER',
+    'TokenBucket',
+    'buffered_stream',
+    'cache_key',
+    'create_model',
+    'estimate_tokens',
+    'get_backend',
+    'get_default_cache',
+    'get_genai',
+    'get_rate_limiter',
+    'get_single_flight',
+    'is_rate_limit_error',
+    'is_retryable_error',
+    'limited_stream',
+    'register_backend',
+    'replay_chunks',
+    'set_backend',
+    'set_rate_limiter',
+    'trim_to_tokens',
+]
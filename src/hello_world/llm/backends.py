@@ -0,0 +1,251 @@
+"""
+Pluggable model backends: the Gemini API, or a local fake for offline runs
+"""
+
+import abc
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional
+
+from .gemini import create_model
+from .ratelimit import RateLimitError
+
+DEFAULT_BACKEND = "gemini"
+
+_WORD_RE = re.compile(r"\S+\s*")
+
+
+class LLMBackend(abc.ABC):
+    """
+    Source of streaming model clients.
+
+    ``create_model(model_name)`` returns an object with the Gemini SDK's
+    ``generate_content_async(prompt, generation_config=None, stream=True)``
+    coroutine, which resolves to an async iterable of chunks (objects with
+    ``.text``, or plain strings).
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def create_model(self, model_name: str):
+        """Return a streaming client for ``model_name``"""
+
+
+class GeminiBackend(LLMBackend):
+    """The Google Gemini API through the ``google.generativeai`` SDK"""
+
+    name = "gemini"
+
+    def create_model(self, model_name: str):
+        return create_model(model_name)
+
+
+class InjectedError(ConnectionError):
+    """Failure raised on purpose by the fake backend"""
+
+
+class FakeChunk:
+    __slots__ = ('text',)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+# Steps the fake model cycles through; every one passes the ReACT validation rules
+_REACT_STEPS = (
+    ("[THOUGHT] I need to gather reliable sources on {topic} before drawing any conclusion.\n"
+     "[ACTION] search_web(query=\"{topic}\")\n"
+     "[OBSERVATION] Found {n} relevant articles, {m} of them from peer reviewed sources.\n"),
+    ("[REFLECTION] The sources broadly agree, but the figures need checking.\n"
+     "[THOUGHT] The key claims should be verified against independent sources.\n"
+     "[ACTION] fact_check(claim=\"{topic} grew {n} percent\")\n"
+     "[OBSERVATION] The claim is supported by {m} independent sources.\n"),
+    ("[REFLECTION] The evidence is consistent enough to summarize.\n"
+     "[THOUGHT] I should extract the structured data the user asked for.\n"
+     "[ACTION] extract_data(source=\"summary\", fields=\"trend,growth\")\n"
+     "[OBSERVATION] Extracted {n} data points across {m} regions.\n"),
+)
+
+
+def synthetic_react_response(prompt: Any, tokens: int, rng: random.Random) -> List[str]:
+    """Words of a well-formed ReACT response of about ``tokens`` tokens, whitespace kept"""
+    topic = " ".join(str(prompt).split()[-4:])[:60] or "the topic"
+    words: List[str] = []
+    step = 0
+    # Only whole steps are added, so the response never ends mid-section
+    while len(words) < tokens:
+        text = _REACT_STEPS[step % len(_REACT_STEPS)].format(
+            topic=topic, n=rng.randint(3, 40), m=rng.randint(1, 9)
+        )
+        words.extend(_WORD_RE.findall(text))
+        step += 1
+    return words
+
+
+class FakeModel:
+    """Streams a synthetic ReACT response with the owning backend's timing and failures"""
+
+    def __init__(self, backend: "FakeBackend", model_name: str):
+        self.backend = backend
+        self.model_name = model_name
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        backend = self.backend
+        backend._check_quota()
+        fail, fail_after, words = backend._plan(prompt)
+        if fail and fail_after == 0:
+            backend.errors += 1
+            raise InjectedError("Injected error before the first token")
+        stream_iter = self._stream(words, fail_after if fail else None)
+        if stream:
+            return stream_iter
+        return FakeChunk("".join([chunk.text async for chunk in stream_iter]))
+
+    async def _stream(self, words: List[str], fail_after: Optional[int]) -> AsyncIterator[FakeChunk]:
+        backend = self.backend
+        await asyncio.sleep(backend.latency)
+        step = backend.chunk_tokens
+        delay = step / backend.tokens_per_sec if backend.tokens_per_sec else 0.0
+        for i in range(0, len(words), step):
+            if fail_after is not None and i >= fail_after:
+                backend.errors += 1
+                raise InjectedError("Injected error mid-stream")
+            if i:
+                await asyncio.sleep(delay)
+            yield FakeChunk("".join(words[i:i + step]))
+
+
+class FakeBackend(LLMBackend):
+    """
+    Local stand-in for Gemini that streams synthetic ReACT output.
+
+    Each response waits ``latency`` seconds before its first chunk, then
+    streams ``response_tokens`` tokens (words) in chunks of
+    ``chunk_tokens`` at ``tokens_per_sec``. A fraction ``error_rate`` of
+    requests fail with ``InjectedError``, half of them before the first
+    token and half part way through the stream. Responses and failures are
+    deterministic for a given ``seed`` and request order.
+
+    With ``rpm_quota`` set, a request beyond that many in the last
+    ``quota_period`` seconds is rejected with ``RateLimitError``, the way
+    the Gemini API answers 429 once a quota is used up.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        tokens_per_sec: float = 200.0,
+        response_tokens: int = 120,
+        chunk_tokens: int = 4,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        rpm_quota: int = 0,
+        quota_period: float = 60.0
+    ):
+        if chunk_tokens < 1:
+            raise ValueError("chunk_tokens must be at least 1")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.response_tokens = response_tokens
+        self.chunk_tokens = chunk_tokens
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.rpm_quota = rpm_quota
+        self.quota_period = quota_period
+        self._admitted: Deque[float] = deque()
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+
+    @classmethod
+    def from_env(cls) -> "FakeBackend":
+        """Configured from FAKE_LLM_LATENCY, FAKE_LLM_TOKENS_PER_SEC, FAKE_LLM_RESPONSE_TOKENS and FAKE_LLM_ERROR_RATE"""
+        return cls(
+            latency=float(os.getenv("FAKE_LLM_LATENCY", 0.2)),
+            tokens_per_sec=float(os.getenv("FAKE_LLM_TOKENS_PER_SEC", 200)),
+            response_tokens=int(os.getenv("FAKE_LLM_RESPONSE_TOKENS", 120)),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", 0)),
+        )
+
+    def create_model(self, model_name: str) -> FakeModel:
+        return FakeModel(self, model_name)
+
+    def _check_quota(self) -> None:
+        """Count a request against the quota, or reject it when the quota is used up"""
+        if not self.rpm_quota:
+            return
+        now = time.monotonic()
+        with self._lock:
+            while self._admitted and now - self._admitted[0] >= self.quota_period:
+                self._admitted.popleft()
+            if len(self._admitted) >= self.rpm_quota:
+                self.rate_limited += 1
+                raise RateLimitError("429 Resource has been exhausted (e.g. check quota)")
+            self._admitted.append(now)
+
+    def _plan(self, prompt):
+        """Decide the response text and whether (and after how many words) it fails"""
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.error_rate
+            mid_stream = self._rng.random() < 0.5
+            words = synthetic_react_response(prompt, self.response_tokens, self._rng)
+        fail_after = len(words) // 2 if mid_stream else 0
+        return fail, fail_after, words
+
+    def stats(self) -> Dict[str, int]:
+        stats = {'calls': self.calls, 'errors': self.errors}
+        if self.rpm_quota:
+            stats['rate_limited'] = self.rate_limited
+        return stats
+
+
+BACKENDS: Dict[str, Callable[[], LLMBackend]] = {
+    "gemini": GeminiBackend,
+    "fake": FakeBackend.from_env,
+}
+
+_backend: Optional[LLMBackend] = None
+_backend_lock = threading.Lock()
+
+
+def register_backend(name: str, factory: Callable[[], LLMBackend]) -> None:
+    """Make a backend selectable through LLM_BACKEND"""
+    BACKENDS[name] = factory
+
+
+def get_backend() -> LLMBackend:
+    """
+    Return the process-wide model backend.
+
+    Chosen by ``LLM_BACKEND`` (``gemini`` or ``fake``) the first time it is
+    needed, unless one was installed with ``set_backend``.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = os.getenv("LLM_BACKEND", DEFAULT_BACKEND).strip().lower()
+                if name not in BACKENDS:
+                    raise ValueError(f"Unknown LLM backend: {name}")
+                _backend = BACKENDS[name]()
+    return _backend
+
+
+def set_backend(backend: Optional[LLMBackend]) -> Optional[LLMBackend]:
+    """Install ``backend`` for the process (None goes back to LLM_BACKEND); returns the previous one"""
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+    return previous
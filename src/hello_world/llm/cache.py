@@ -0,0 +1,279 @@
+"""
+Two-tier (memory LRU + disk) cache for streamed model responses
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+
+def cache_key(prompt: Any, model_name: str, generation_config: Dict[str, Any], backend: str = '') -> str:
+    """
+    Canonical hash of everything that determines a model response.
+
+    ``backend`` names the model backend, since backends can serve the same
+    model name with different responses (the fake one answers for
+    ``gemini-pro`` too). Keys are order-independent for the generation
+    config, so two configs with the same values always hit the same entry.
+    """
+    payload = json.dumps(
+        {'backend': backend, 'model': model_name, 'prompt': prompt, 'generation_config': generation_config},
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+async def replay_chunks(chunks: Sequence[str]) -> AsyncIterator[str]:
+    """Yield cached chunks as an async stream, the way the model delivered them."""
+    for chunk in chunks:
+        yield chunk
+        # Give other streams a turn, as a network read would
+        await asyncio.sleep(0)
+
+
+class _Entry:
+    __slots__ = ('chunks', 'created_at', 'size')
+
+    def __init__(self, chunks: List[str], created_at: float):
+        self.chunks = chunks
+        self.created_at = created_at
+        self.size = sum(len(chunk.encode('utf-8')) for chunk in chunks)
+
+
+class ResponseCache:
+    """
+    Response cache with an in-memory LRU tier in front of an on-disk tier.
+
+    Both tiers evict by total size (least recently used first) and expire
+    entries older than ``ttl`` seconds. Disk entries are one JSON file per
+    key, written atomically, so several processes can share a directory.
+    The disk total is tracked as entries are written, seeded by one scan of
+    the directory; it is only scanned again when the total goes over
+    ``max_disk_bytes`` (which also resyncs it with other processes' writes).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl: float = 24 * 3600,
+        max_memory_bytes: int = 16 * 1024 * 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.ttl = ttl
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {
+            'hits': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'write_errors': 0
+        }
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._sweep_disk()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Return the cached chunks for ``key`` or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry.created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.counters['hits'] += 1
+                    self.counters['memory_hits'] += 1
+                    return list(entry.chunks)
+                self._drop_memory(key)
+                self.counters['expirations'] += 1
+
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+            self.counters['hits'] += 1
+            self.counters['disk_hits'] += 1
+            self._store_memory(key, entry)
+        return list(entry.chunks)
+
+    def put(self, key: str, chunks: Sequence[str]) -> None:
+        """Store a completed response in both tiers."""
+        entry = _Entry(list(chunks), time.time())
+        with self._lock:
+            self._store_memory(key, entry)
+            self.counters['stores'] += 1
+        self._write_disk(key, entry)
+
+    async def aget(self, key: str) -> Optional[List[str]]:
+        """Async lookup; only a memory miss touches the disk, off the event loop."""
+        with self._lock:
+            entry = self._memory.get(key)
+            fresh = entry is not None and time.time() - entry.created_at <= self.ttl
+        if fresh or self.cache_dir is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, chunks: Sequence[str]) -> None:
+        if self.cache_dir is None:
+            self.put(key, chunks)
+        else:
+            await asyncio.to_thread(self.put, key, chunks)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.cache_dir:
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_entries'] = len(self._memory)
+            stats['memory_bytes'] = self._memory_bytes
+            stats['disk_bytes'] = self._disk_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _store_memory(self, key: str, entry: _Entry) -> None:
+        if entry.size > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._drop_memory(key)
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+        while self._memory_bytes > self.max_memory_bytes:
+            oldest = next(iter(self._memory))
+            self._drop_memory(oldest)
+            self.counters['evictions'] += 1
+
+    def _drop_memory(self, key: str) -> None:
+        entry = self._memory.pop(key)
+        self._memory_bytes -= entry.size
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_disk(self, key: str, now: float) -> Optional[_Entry]:
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if now - data.get('created_at', 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.counters['expirations'] += 1
+            return None
+        # Bump the mtime so size eviction drops least recently used files first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return _Entry(data['chunks'], data['created_at'])
+
+    def _write_disk(self, key: str, entry: _Entry) -> None:
+        if self.cache_dir is None or entry.size > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'created_at': entry.created_at, 'chunks': entry.chunks}, f, ensure_ascii=False)
+                written = f.tell()
+            os.replace(tmp_path, path)
+        except OSError:
+            # A full or read-only disk only loses the disk copy; the memory tier keeps the entry
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            with self._lock:
+                self.counters['write_errors'] += 1
+            return
+        with self._lock:
+            self._disk_bytes += written - replaced
+            over = self._disk_bytes > self.max_disk_bytes
+        if over:
+            self._sweep_disk()
+
+    def _sweep_disk(self) -> None:
+        """Drop expired files, then the least recently used ones until the total fits"""
+        now = time.time()
+        files = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl:
+                # Untouched for longer than the TTL, so it is expired too
+                path.unlink(missing_ok=True)
+                with self._lock:
+                    self.counters['expirations'] += 1
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self.counters['evictions'] += 1
+        with self._lock:
+            self._disk_bytes = total
+
+
+_default_cache: Optional[ResponseCache] = None
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """
+    Return the process-wide response cache, or None when caching is off.
+
+    Configured from the environment: ``CACHE_ENABLED``, ``CACHE_DIR``,
+    ``CACHE_TTL`` (seconds), ``CACHE_MAX_MEMORY_MB`` and ``CACHE_MAX_DISK_MB``.
+    """
+    global _default_cache
+    if os.getenv('CACHE_ENABLED', 'false').strip().lower() not in ('1', 'true', 'yes'):
+        return None
+    if _default_cache is None:
+        _default_cache = ResponseCache(
+            cache_dir=os.getenv('CACHE_DIR', '.cache/llm_responses'),
+            ttl=float(os.getenv('CACHE_TTL', 24 * 3600)),
+            max_memory_bytes=int(float(os.getenv('CACHE_MAX_MEMORY_MB', 16)) * 1024 * 1024),
+            max_disk_bytes=int(float(os.getenv('CACHE_MAX_DISK_MB', 256)) * 1024 * 1024)
+        )
+    return _default_cache
@@ -0,0 +1,32 @@
+"""
+Deferred Gemini SDK setup
+"""
+
+import os
+import threading
+
+_configure_lock = threading.Lock()
+_configured = False
+
+
+def get_genai():
+    """
+    Import ``google.generativeai`` and configure it on first use.
+
+    The SDK pulls in grpc and protobuf, so it is only imported once a
+    request actually has to go to the model.
+    """
+    global _configured
+    import google.generativeai as genai
+
+    if not _configured:
+        with _configure_lock:
+            if not _configured:
+                genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+                _configured = True
+    return genai
+
+
+def create_model(model_name: str):
+    """Create a Gemini model client, configuring the SDK if needed."""
+    return get_genai().GenerativeModel(model_name)
@@ -0,0 +1,385 @@
+"""
+Quota-aware rate limiting and retries for model calls
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from hello_world.backoff import full_jitter_backoff
+
+from .streaming import _chunk_text
+from .tokens import CHARS_PER_TOKEN
+
+DEFAULT_PERIOD = 60.0
+
+# Exception class names the Gemini SDK (google.api_core) raises for quota
+# and transient server errors; matched by name so the SDK is not imported
+_RATE_LIMIT_ERRORS = {"ResourceExhausted", "TooManyRequests"}
+_TRANSIENT_ERRORS = {"ServiceUnavailable", "DeadlineExceeded", "InternalServerError", "GatewayTimeout",
+                     "BadGateway"}
+
+
+class RateLimitError(Exception):
+    """The model rejected a request for exceeding a quota"""
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True for quota errors: RateLimitError, the SDK's ResourceExhausted, or an HTTP 429"""
+    if isinstance(error, RateLimitError) or type(error).__name__ in _RATE_LIMIT_ERRORS:
+        return True
+    for attr in ('code', 'status_code', 'status'):
+        if getattr(error, attr, None) == 429:
+            return True
+    return False
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """True for errors a retry can fix: quota errors, connection errors, timeouts and 5xx responses"""
+    return (
+        is_rate_limit_error(error)
+        or isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError))
+        or type(error).__name__ in _TRANSIENT_ERRORS
+    )
+
+
+class TokenBucket:
+    """``rate`` units per ``period`` seconds, with bursts of up to ``rate``"""
+
+    def __init__(self, rate: float, period: float = DEFAULT_PERIOD):
+        if rate <= 0 or period <= 0:
+            raise ValueError("rate and period must be positive")
+        self.capacity = float(rate)
+        self.fill_rate = rate / period
+        self.available = float(rate)
+        self._updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.fill_rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` (capped at the capacity) is available"""
+        self.refill(now)
+        missing = min(amount, self.capacity) - self.available
+        return max(0.0, missing / self.fill_rate)
+
+    def take(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+    def give(self, amount: float) -> None:
+        self.available = min(self.capacity, self.available + amount)
+
+
+class RateLimiter:
+    """
+    Admission control for model requests, shared by every stream in the process.
+
+    A request needs one unit from the requests-per-minute bucket, its
+    reserved tokens from the tokens-per-minute bucket (each only when
+    ``rpm`` / ``tpm`` is set), and a free slot under the concurrency limit.
+    Requests queue in arrival order until all three are available.
+
+    The concurrency limit adapts AIMD style: every success raises it by
+    ``1 / limit`` (about one per round of requests), and every rate-limit
+    error cuts it to ``decrease`` times the requests in flight and empties
+    the request bucket, so the process backs off as soon as the quota
+    pushes back and climbs back towards ``max_concurrency`` (unbounded when
+    0) while requests succeed.
+
+    Meant to be used from one event loop at a time.
+    """
+
+    def __init__(
+        self,
+        rpm: float = 0,
+        tpm: float = 0,
+        max_concurrency: int = 0,
+        min_concurrency: int = 1,
+        period: float = DEFAULT_PERIOD,
+        decrease: float = 0.5
+    ):
+        if min_concurrency < 1:
+            raise ValueError("min_concurrency must be at least 1")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.rpm = rpm
+        self.tpm = tpm
+        self.period = period
+        self.requests = TokenBucket(rpm, period) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm, period) if tpm > 0 else None
+        self.max_concurrency = max_concurrency if max_concurrency > 0 else math.inf
+        self.min_concurrency = min_concurrency
+        self.decrease = decrease
+        self.concurrency_limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[asyncio.Future, float]] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.counters = {
+            'granted': 0,
+            'succeeded': 0,
+            'rate_limited': 0,
+            'failed': 0,
+            'retries': 0,
+            'queued': 0,
+            'wait_time': 0.0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """Configured from ``LLM_RPM``, ``LLM_TPM`` and ``LLM_MAX_CONCURRENCY`` (0 = unlimited)"""
+        return cls(
+            rpm=float(os.getenv("LLM_RPM", 0)),
+            tpm=float(os.getenv("LLM_TPM", 0)),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 0)),
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for future, _ in self._waiters if not future.done())
+
+    async def acquire(self, tokens: float = 0) -> None:
+        """Wait for admission of a request that may use ``tokens`` tokens"""
+        if not self._waiters and self._admissible(tokens, time.monotonic()) == 0.0:
+            self._grant(tokens)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((future, tokens))
+        self.counters['queued'] += 1
+        self._dispatch()
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller gave up: hand the slot back
+                self.release(tokens, 0, completed=False)
+            else:
+                self._dispatch()
+            raise
+        finally:
+            self.counters['wait_time'] += time.monotonic() - started
+
+    def release(self, reserved: float = 0, used: Optional[float] = None,
+                error: Optional[BaseException] = None, completed: bool = True) -> None:
+        """
+        Return a request's slot once its stream has ended.
+
+        Tokens reserved but not ``used`` go back to the token bucket. A
+        rate-limit ``error`` shrinks the concurrency limit, and a stream
+        that ``completed`` without one grows it; a stream its caller
+        abandoned does neither.
+        """
+        self.in_flight -= 1
+        if self.tokens is not None and used is not None and used < reserved:
+            self.tokens.give(reserved - used)
+        if error is not None and is_rate_limit_error(error):
+            self.counters['rate_limited'] += 1
+            in_flight_at_error = min(self.concurrency_limit, self.in_flight + 1)
+            self.concurrency_limit = max(float(self.min_concurrency), in_flight_at_error * self.decrease)
+            if self.requests is not None:
+                # Nothing more goes out until the bucket has refilled
+                self.requests.refill(time.monotonic())
+                self.requests.available = min(self.requests.available, 0.0)
+        elif error is not None:
+            self.counters['failed'] += 1
+        elif completed:
+            self.counters['succeeded'] += 1
+            if self.concurrency_limit < self.max_concurrency:
+                self.concurrency_limit = min(self.max_concurrency,
+                                             self.concurrency_limit + 1 / self.concurrency_limit)
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.refill(now)
+        return {
+            'rpm': self.rpm or None,
+            'tpm': self.tpm or None,
+            'requests_available': self.requests.available if self.requests is not None else None,
+            'tokens_available': self.tokens.available if self.tokens is not None else None,
+            'concurrency_limit': None if math.isinf(self.concurrency_limit) else self.concurrency_limit,
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth,
+            **self.counters,
+        }
+
+    def to_prometheus(self, prefix: str = "hello_world_llm_limiter") -> str:
+        """Limiter state and counters in the Prometheus text format"""
+        lines = []
+        for key, value in self.stats().items():
+            if value is None:
+                continue
+            if key in self.counters:
+                name = f"{prefix}_wait_seconds_total" if key == 'wait_time' else f"{prefix}_{key}_total"
+                kind = "counter"
+            else:
+                name, kind = f"{prefix}_{key}", "gauge"
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def _admissible(self, tokens: float, now: float) -> Optional[float]:
+        """0.0 when a request can go now, seconds to wait for the buckets, or None while at the concurrency limit"""
+        limit = self.concurrency_limit
+        if not math.isinf(limit) and self.in_flight >= max(1, math.floor(limit)):
+            return None
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    def _grant(self, tokens: float) -> None:
+        self.in_flight += 1
+        self.counters['granted'] += 1
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None and tokens:
+            self.tokens.take(tokens)
+
+    def _dispatch(self) -> None:
+        """Admit queued requests in order for as long as the head of the queue fits"""
+        while self._waiters:
+            future, tokens = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            wait = self._admissible(tokens, time.monotonic())
+            if wait is None:
+                # A release will dispatch again
+                return
+            if wait > 0:
+                self._schedule(future.get_loop(), wait)
+                return
+            self._waiters.popleft()
+            self._grant(tokens)
+            future.set_result(None)
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        if self._timer is not None and not self._timer.cancelled() and not loop.is_closed():
+            self._timer.cancel()
+        self._timer = loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+
+class RetryPolicy:
+    """
+    How a model call is retried, from an agent's ``error_handling`` settings.
+
+    ``retry_attempts`` retries (so ``retry_attempts + 1`` attempts in all)
+    are made for retryable errors that happen before the first chunk
+    arrives; once text has been streamed to the caller an error is final.
+    Waits use exponential backoff with full jitter. ``fallback_strategy``
+    is kept for callers that have an alternative to offer.
+    """
+
+    def __init__(self, retry_attempts: int = 0, fallback_strategy: Optional[str] = None,
+                 backoff_base: float = 0.25, backoff_max: float = 8.0):
+        if retry_attempts < 0:
+            raise ValueError("retry_attempts must not be negative")
+        self.retry_attempts = retry_attempts
+        self.fallback_strategy = fallback_strategy
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RetryPolicy":
+        """
+        Policy for an agent configuration.
+
+        Backoff timing comes from ``LLM_RETRY_BACKOFF_BASE`` and
+        ``LLM_RETRY_BACKOFF_MAX`` (seconds).
+        """
+        error_handling = config.get('error_handling') or {}
+        return cls(
+            retry_attempts=int(error_handling.get('retry_attempts', 0)),
+            fallback_strategy=error_handling.get('fallback_strategy'),
+            backoff_base=float(os.getenv("LLM_RETRY_BACKOFF_BASE", 0.25)),
+            backoff_max=float(os.getenv("LLM_RETRY_BACKOFF_MAX", 8.0)),
+        )
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        return attempt <= self.retry_attempts and is_retryable_error(error)
+
+    def backoff(self, attempt: int) -> float:
+        return full_jitter_backoff(attempt, self.backoff_base, self.backoff_max)
+
+
+async def limited_stream(
+    open_stream: Callable[[], Awaitable[AsyncIterable]],
+    policy: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+    reserve_tokens: float = 0,
+    prompt_tokens: float = 0
+) -> AsyncIterator[Any]:
+    """
+    Stream the chunks of ``open_stream()`` under ``limiter`` and ``policy``.
+
+    Each attempt waits for admission with ``reserve_tokens`` tokens (the
+    prompt plus the most the model may answer) and holds its slot until
+    the stream ends; the tokens it did not use (estimated from
+    ``prompt_tokens`` and the response text) are handed back. Errors before
+    the first chunk are retried as ``policy`` allows.
+    """
+    policy = policy or RetryPolicy()
+    attempt = 0
+    while True:
+        attempt += 1
+        if limiter is not None:
+            await limiter.acquire(reserve_tokens)
+        chars = 0
+        completed = False
+        error: Optional[BaseException] = None
+        try:
+            source = await open_stream()
+            async for chunk in source:
+                chars += len(_chunk_text(chunk))
+                yield chunk
+            completed = True
+            return
+        except Exception as e:
+            error = e
+            if chars or not policy.should_retry(e, attempt):
+                raise
+        finally:
+            if limiter is not None:
+                used = prompt_tokens + -(-chars // CHARS_PER_TOKEN)
+                limiter.release(reserve_tokens, used, error, completed=completed or error is not None)
+        if limiter is not None:
+            limiter.counters['retries'] += 1
+        await asyncio.sleep(policy.backoff(attempt))
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Return the process-wide rate limiter.
+
+    Configured from ``LLM_RPM``, ``LLM_TPM`` and ``LLM_MAX_CONCURRENCY``
+    the first time it is needed, unless one was installed with
+    ``set_rate_limiter``. With none of them set it admits everything, but
+    still backs off its concurrency on rate-limit errors.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter.from_env()
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> Optional[RateLimiter]:
+    """Install ``limiter`` for the process (None goes back to the environment); returns the previous one"""
+    global _rate_limiter
+    previous, _rate_limiter = _rate_limiter, limiter
+    return previous
@@ -0,0 +1,197 @@
+"""
+Single-flight sharing of identical in-flight model streams
+"""
+
+import asyncio
+import os
+from typing import AsyncIterable, Awaitable, Callable, Dict, List, Optional
+
+from .streaming import _chunk_text
+
+StreamOpener = Callable[[], Awaitable[AsyncIterable]]
+
+
+class _Flight:
+    """One upstream stream and the chunks it has produced so far"""
+
+    __slots__ = ('key', 'chunks', 'done', 'error', 'subscribers', 'task', 'stored', '_changed')
+
+    def __init__(self, key: str):
+        self.key = key
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self.stored = False
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+
+class FlightSubscription:
+    """
+    One caller's view of a shared stream.
+
+    Iterate with ``async for`` to get every chunk from the start: chunks
+    the stream produced before this caller joined are replayed first, then
+    live ones follow. An upstream error is raised to every subscriber
+    after the chunks that preceded it. Closing the iterator early (or
+    cancelling the task reading it) only detaches this subscriber.
+    """
+
+    def __init__(self, flights: "SingleFlight", flight: _Flight, joined: bool):
+        self.flights = flights
+        self.flight = flight
+        # True when another caller's stream was already in flight
+        self.joined = joined
+        self._iterator = self._iterate()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        return await self._iterator.__anext__()
+
+    async def aclose(self) -> None:
+        await self._iterator.aclose()
+
+    def claim_result(self) -> bool:
+        """
+        True for the first subscriber to claim the complete response.
+
+        Lets exactly one of the callers sharing a stream store it in the
+        response cache.
+        """
+        flight = self.flight
+        if not flight.done or flight.error is not None or flight.stored:
+            return False
+        flight.stored = True
+        return True
+
+    async def _iterate(self):
+        flight = self.flight
+        index = 0
+        try:
+            while True:
+                if index < len(flight.chunks):
+                    chunk = flight.chunks[index]
+                    index += 1
+                    yield chunk
+                    continue
+                if flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                await flight._changed.wait()
+        finally:
+            self.flights._leave(flight)
+
+
+class SingleFlight:
+    """
+    Deduplicates identical model streams that are in flight at the same time.
+
+    The first caller for a key opens the upstream stream, which is read by
+    a task of its own; every caller with the same key while it is running
+    subscribes to it instead of opening another. Chunks are kept for the
+    lifetime of the stream so late joiners can catch up, and the stream is
+    only cancelled once its last subscriber has left. Finished streams are
+    forgotten right away; repeating a finished request is the response
+    cache's job.
+
+    Keys must cover everything that determines the response (model,
+    prompt and generation config), e.g. ``cache_key``.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.counters = {'leaders': 0, 'joins': 0, 'abandoned': 0}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def subscribe(self, key: str, open_stream: StreamOpener) -> FlightSubscription:
+        """
+        Join the stream in flight for ``key``, or start one with ``open_stream``.
+
+        Args:
+            key: Identity of the request
+            open_stream: Coroutine function returning the upstream async
+                iterable of chunks; only called when no stream is in flight
+
+        Returns:
+            A subscription yielding the response text chunk by chunk
+        """
+        flight = self._flights.get(key)
+        if flight is not None and flight.task.get_loop() is not asyncio.get_running_loop():
+            # A stream can only be shared within its own event loop
+            flight = None
+        joined = flight is not None
+        if flight is None:
+            flight = _Flight(key)
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._pump(flight, open_stream))
+            self.counters['leaders'] += 1
+        else:
+            self.counters['joins'] += 1
+        flight.subscribers += 1
+        return FlightSubscription(self, flight, joined)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, 'in_flight': self.in_flight}
+
+    async def _pump(self, flight: _Flight, open_stream: StreamOpener) -> None:
+        source = None
+        try:
+            source = await open_stream()
+            async for chunk in source:
+                text = _chunk_text(chunk)
+                if text:
+                    flight.chunks.append(text)
+                    flight.notify()
+        except asyncio.CancelledError:
+            flight.error = asyncio.CancelledError("Shared stream was abandoned")
+            # Release the upstream response (e.g. its HTTP connection) right away
+            aclose = getattr(source, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            self._forget(flight)
+            flight.notify()
+
+    def _leave(self, flight: _Flight) -> None:
+        flight.subscribers -= 1
+        if flight.subscribers == 0 and not flight.done:
+            # Nobody is reading any more
+            self._forget(flight)
+            self.counters['abandoned'] += 1
+            flight.task.cancel()
+
+    def _forget(self, flight: _Flight) -> None:
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """
+    Return the process-wide single-flight group, or None when it is off.
+
+    Enabled unless ``SINGLE_FLIGHT_ENABLED`` is false.
+    """
+    global _single_flight
+    if os.getenv('SINGLE_FLIGHT_ENABLED', 'true').strip().lower() not in ('1', 'true', 'yes'):
+        return None
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
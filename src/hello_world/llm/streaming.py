@@ -0,0 +1,151 @@
+"""
+Non-blocking, bounded streaming of model responses
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional
+
+from .tokens import estimate_tokens
+
+DEFAULT_BUFFER_SIZE = 32
+
+_END_OF_STREAM = object()
+
+
+class StreamStats:
+    """Timing and throughput figures for a single model stream."""
+
+    def __init__(self, model_name: str = ""):
+        self.model_name = model_name
+        self.started_at: Optional[float] = None
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.chunks = 0
+        self.chars = 0
+        self.tokens = 0
+        self.error: Optional[str] = None
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def record_chunk(self, text: str) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.chunks += 1
+        self.chars += len(text)
+        self.tokens += estimate_tokens(text)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.finished_at = time.perf_counter()
+        if error is not None:
+            self.error = str(error) or type(error).__name__
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        if self.started_at is None or self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def tokens_per_sec(self) -> float:
+        """Generation rate measured from the first token to the end of the stream."""
+        if self.first_token_at is None or self.finished_at is None:
+            return 0.0
+        elapsed = self.finished_at - self.first_token_at
+        if elapsed <= 0:
+            return float(self.tokens)
+        return self.tokens / elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'model': self.model_name,
+            'chunks': self.chunks,
+            'chars': self.chars,
+            'tokens': self.tokens,
+            'time_to_first_token': self.time_to_first_token,
+            'duration': self.duration,
+            'tokens_per_sec': self.tokens_per_sec,
+            'error': self.error
+        }
+
+
+def _chunk_text(chunk: Any) -> str:
+    if isinstance(chunk, str):
+        return chunk
+    return chunk.text or ""
+
+
+async def buffered_stream(
+    source: AsyncIterable,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    stats: Optional[StreamStats] = None
+) -> AsyncIterator[str]:
+    """
+    Yield the text of each chunk from ``source`` through a bounded buffer.
+
+    The upstream iterator is drained by a background task into a queue of
+    at most ``buffer_size`` chunks. When the consumer falls behind the queue
+    fills up and the reader stops pulling from upstream, so a slow consumer
+    applies backpressure instead of growing memory. Closing the generator
+    early cancels the reader.
+
+    Args:
+        source: Async iterable of model chunks (objects with ``.text``) or strings
+        buffer_size: Maximum number of chunks held between reader and consumer
+        stats: Optional stats object updated as chunks are consumed
+    """
+    if buffer_size < 1:
+        raise ValueError("buffer_size must be at least 1")
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+
+    async def reader():
+        try:
+            async for chunk in source:
+                text = _chunk_text(chunk)
+                if text:
+                    await queue.put(text)
+            await queue.put(_END_OF_STREAM)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            await queue.put(e)
+
+    if stats is not None and stats.started_at is None:
+        stats.start()
+    task = asyncio.create_task(reader())
+    error = None
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END_OF_STREAM:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            if stats is not None:
+                stats.record_chunk(item)
+            yield item
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            # Release the upstream response (e.g. its HTTP connection) right away
+            aclose = getattr(source, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+        if stats is not None:
+            # Closing the generator early is not an error of the stream itself
+            stats.finish(None if isinstance(error, GeneratorExit) else error)
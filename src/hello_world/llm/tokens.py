@@ -0,0 +1,45 @@
+"""
+Offline token estimation helpers
+"""
+
+# Gemini and most BPE tokenizers average roughly four characters of English
+# text per token; good enough for throughput and budget accounting.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in ``text`` without a tokenizer."""
+    if not text:
+        return 0
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+# Inserted where trim_to_tokens removes the middle of a text
+TRIM_MARKER = "\n[...]\n"
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Deterministically cut ``text`` down to an estimated ``max_tokens``.
+
+    Keeps the first two thirds of the allowance from the start of the text
+    and the rest from its end, where instructions and questions usually
+    sit, joined by ``TRIM_MARKER``. Cuts snap to nearby whitespace so words
+    stay whole. Text already within budget is returned unchanged.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    allowance = max_tokens * CHARS_PER_TOKEN - len(TRIM_MARKER)
+    if allowance <= 0:
+        return ""
+    head_chars = allowance * 2 // 3
+    tail_chars = allowance - head_chars
+
+    head = text[:head_chars]
+    cut = head.rfind(" ", max(0, head_chars - 32))
+    if cut > 0:
+        head = head[:cut]
+    tail = text[len(text) - tail_chars:] if tail_chars else ""
+    cut = tail.find(" ", 0, 32)
+    if cut >= 0:
+        tail = tail[cut + 1:]
+    return head.rstrip() + TRIM_MARKER + tail.lstrip()
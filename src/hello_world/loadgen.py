@@ -0,0 +1,81 @@
+"""
+Closed-loop load generation and latency summaries for benchmarks
+"""
+
+import asyncio
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (``q`` in 0..100) of ``values``; None when empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    """Mean, p50, p95, p99 and max of a list of durations"""
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values) if values else None,
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': max(values) if values else None,
+    }
+
+
+async def run_load(
+    request: Callable[[int], Awaitable[Dict[str, Any]]],
+    total: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """
+    Issue ``total`` requests with at most ``concurrency`` in flight.
+
+    ``request(i)`` performs request ``i`` and may return a dict with a
+    ``ttft`` (seconds to its first token). Latency is measured around each
+    call; an exception counts the request as failed.
+
+    Returns:
+        Throughput, error count and latency / TTFT summaries
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    latencies: List[float] = []
+    ttfts: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                result = await request(i) or {}
+            except Exception as e:
+                name = type(e).__name__
+                errors[name] = errors.get(name, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            if result.get('ttft') is not None:
+                ttfts.append(result['ttft'])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total) or 1)))
+    elapsed = time.perf_counter() - start
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'succeeded': len(latencies),
+        'failed': sum(errors.values()),
+        'errors': errors,
+        'elapsed': elapsed,
+        'requests_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'latency': summarize(latencies),
+        'ttft': summarize(ttfts),
+    }
@@ -2,7 +2,7 @@ import warnings
 warnings.filterwarnings('ignore', category=UserWarning)
 
 import argparse
-from hello_world.crew import HelloWorldCrew
+import sys
 
 # ANSI color codes
 MAGENTA = '\033[0;35m'
@@ -10,7 +10,8 @@ RED = '\033[0;31m'
 NC = '\033[0m'  # No Color
 
 def display_banner():
-    print("""
+    from hello_world.render import get_renderer
+    get_renderer().banner("""
 ╔══════════════════════════════════════════════════════════════════╗
 ║              NEURAL NETWORK ORCHESTRATION SYSTEM                 ║
 ║                     [ CODENAME: CREWAI ]                        ║
@@ -22,15 +23,99 @@ def parse_args():
     parser.add_argument('--prompt', type=str, help='Prompt for the AI system', default="Tell me about yourself")
     parser.add_argument('--task', type=str, choices=['research', 'execute', 'analyze', 'both'], 
                        help='Task to perform: research, execute, analyze, or both', default='both')
+    parser.add_argument('--batch', type=str, metavar='PATH',
+                       help='Run prompts from a JSONL file ("-" for stdin) and write JSONL results')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='Maximum prompts in flight in batch mode')
+    parser.add_argument('--output', type=str, metavar='PATH', default='-',
+                       help='Where batch results are written ("-" for stdout)')
+    parser.add_argument('--render', type=str, choices=['console', 'jsonl', 'silent'],
+                       help='Output mode for tokens and status (default: console, silent in batch mode)')
+    parser.add_argument('--serve', action='store_true',
+                       help='Keep the crew loaded and serve runs over HTTP until interrupted')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Address the server listens on')
+    parser.add_argument('--port', type=int, default=8080, help='Port the server listens on')
+    parser.add_argument('--metrics', type=str, metavar='PATH',
+                       help='Write runtime metrics when done: Prometheus text for *.prom, JSON otherwise')
     return parser.parse_args()
 
+def write_metrics(path):
+    """Write the process metrics snapshot and optimization rule results"""
+    import json
+    from hello_world.metrics import get_metrics
+    metrics = get_metrics()
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.endswith('.prom'):
+            f.write(metrics.to_prometheus())
+        else:
+            json.dump(metrics.snapshot(), f, indent=2)
+
+def run_batch_mode(args):
+    """Stream JSONL results for every prompt in the batch input"""
+    import asyncio
+    from contextlib import redirect_stdout
+    from hello_world.batch import run_batch
+    from hello_world.crew import HelloWorldCrew
+    from hello_world.render import Renderer, set_renderer
+
+    # Token echo and banners are off unless asked for, and never go to stdout,
+    # which carries only results
+    set_renderer(Renderer(mode=args.render or 'silent', file=sys.stderr))
+    source = sys.stdin if args.batch == '-' else open(args.batch, 'r', encoding='utf-8')
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        crew = HelloWorldCrew()
+        with redirect_stdout(sys.stderr):
+            # Load the validation rules and model client up front instead of in the first stages
+            crew.warm_up()
+            summary = asyncio.run(run_batch(
+                crew, source, out, concurrency=args.concurrency, default_task=args.task
+            ))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(
+        f"[SYS]: Batch complete - {summary['succeeded']}/{summary['total']} succeeded "
+        f"in {summary['elapsed']:.2f}s ({summary['prompts_per_sec']:.2f} prompts/sec)",
+        file=sys.stderr
+    )
+    return summary
+
+def run_server_mode(args):
+    """Serve runs over HTTP; token output is silent unless --render is given"""
+    from hello_world.render import Renderer, set_renderer
+    from hello_world.server import run_server
+
+    set_renderer(Renderer(mode=args.render or 'silent', file=sys.stderr))
+    run_server(host=args.host, port=args.port)
+
 def run():
     args = parse_args()
+    if args.serve:
+        run_server_mode(args)
+        if args.metrics:
+            write_metrics(args.metrics)
+        return
+    if args.batch:
+        summary = run_batch_mode(args)
+        if args.metrics:
+            write_metrics(args.metrics)
+        sys.exit(1 if summary['failed'] else 0)
+    from hello_world.render import Renderer, get_renderer, set_renderer
+    if args.render:
+        set_renderer(Renderer(mode=args.render))
     display_banner()
+    # Imported after argument parsing so `--help` does not load the crew
+    from hello_world.crew import HelloWorldCrew
     crew = HelloWorldCrew()
     result = crew.run(prompt=args.prompt, task_type=args.task)
+    if args.metrics:
+        write_metrics(args.metrics)
+    renderer = get_renderer()
     if result:
-        print("""
+        renderer.banner("""
 ╔══════════════════════════════════════════════════════════════════╗
 ║             🌟 NEURAL PROCESSING COMPLETE 🌟                     ║
 ╚══════════════════════════════════════════════════════════════════╝
@@ -42,7 +127,7 @@ def run():
 ▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀""" + NC + """
         """)
     else:
-        print("""
+        renderer.banner("""
 ╔══════════════════════════════════════════════════════════════════╗
 ║             ⚠️ NEURAL PROCESSING INTERRUPTED ⚠️                 ║
 ╚══════════════════════════════════════════════════════════════════╝
@@ -53,6 +138,7 @@ def run():
         🔄 READY FOR REACTIVATION
 ▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀""" + NC + """
         """)
+    renderer.close()
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1,311 @@
+"""
+In-process runtime metrics, checked against the thresholds in analysis.yaml
+"""
+
+import bisect
+import operator
+import os
+import re
+import resource
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from hello_world.loadgen import percentile
+
+# Seconds; covers a cached replay up to a long generation
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_WINDOW = 1024
+# Shortest wall time CPU utilization is measured over; shorter gaps are too noisy
+CPU_SAMPLE_INTERVAL = 1.0
+METRIC_PREFIX = "hello_world"
+
+# Live values the optimization_rules conditions can refer to
+RESPONSE_TIME = "response_time"
+MEMORY_USAGE = "memory_usage"
+CPU_UTILIZATION = "cpu_utilization"
+ERROR_RATE = "error_rate"
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+_CONDITION_RE = re.compile(r"^\s*(\w+)\s*(>=|<=|==|!=|>|<)\s*([\w.]+)\s*$")
+
+
+class Histogram:
+    """Cumulative bucket counts plus sum and count, in the Prometheus layout"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(upper bound, observations at or below it) pairs, ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else _format_number(bound), total))
+        return pairs
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'count': self.count, 'sum': self.sum, 'buckets': dict(self.cumulative())}
+
+
+class Rule:
+    """One optimization rule: ``<value> <op> <number | metrics.<Name>.threshold>``"""
+
+    def __init__(self, config: Dict[str, Any], thresholds: Dict[str, float]):
+        self.name = config.get('rule', '')
+        self.condition = config.get('condition', '')
+        self.action = config.get('action', '')
+        self.priority = config.get('priority', '')
+        match = _CONDITION_RE.match(self.condition)
+        if match is None:
+            raise ValueError(f"Unsupported rule condition: {self.condition}")
+        self.value_name, op, target = match.groups()
+        self.op = op
+        self._compare = _OPERATORS[op]
+        self.threshold = self._resolve(target, thresholds)
+
+    def _resolve(self, target: str, thresholds: Dict[str, float]) -> float:
+        parts = target.split(".")
+        if len(parts) == 3 and parts[0] == "metrics" and parts[2] == "threshold":
+            name = parts[1].replace("_", " ")
+            if name not in thresholds:
+                raise ValueError(f"Unknown metric in rule condition: {parts[1]}")
+            return thresholds[name]
+        try:
+            return float(target)
+        except ValueError:
+            raise ValueError(f"Unsupported rule condition: {self.condition}") from None
+
+    def evaluate(self, values: Dict[str, Optional[float]]) -> Dict[str, Any]:
+        value = values.get(self.value_name)
+        return {
+            'rule': self.name,
+            'condition': self.condition,
+            'action': self.action,
+            'priority': self.priority,
+            'value': value,
+            'threshold': self.threshold,
+            'triggered': value is not None and self._compare(value, self.threshold),
+        }
+
+
+class MetricsCollector:
+    """
+    Stage and run timings, errors and process resource use, evaluated
+    against the ``optimization_rules`` of analysis.yaml.
+
+    Recording is a lock, a bucket increment and a deque append. Rule values
+    come from the most recent ``window`` stages: response_time is the p95 of
+    their time to first token in milliseconds (what a user waits before the
+    answer starts, and what a cached response cuts; whole-stage durations
+    grow with the length of the answer) and error_rate the percentage that
+    failed. memory_usage
+    (MB of resident memory) and cpu_utilization (process CPU time over wall
+    time, in percent, measured over at least ``CPU_SAMPLE_INTERVAL``
+    seconds) are sampled when values are read.
+    """
+
+    def __init__(self, analysis: Optional[Dict[str, Any]] = None, window: int = DEFAULT_WINDOW):
+        analysis = analysis or {}
+        self.thresholds = {
+            metric['name']: float(metric['threshold'])
+            for metric in (analysis.get('performance_analysis') or {}).get('metrics') or []
+        }
+        self.rules = [Rule(rule, self.thresholds) for rule in analysis.get('optimization_rules') or []]
+        self._lock = threading.Lock()
+        self._stage_durations: Dict[Tuple[str, str], Histogram] = {}
+        self._first_token: Dict[Tuple[str, str], Histogram] = {}
+        self._stage_errors: Dict[Tuple[str, str], int] = {}
+        self._run_durations = Histogram()
+        self._runs = {'ok': 0, 'error': 0}
+        self._recent = deque(maxlen=window)  # (time to first token, failed) per stage
+        self._cpu_mark = (time.perf_counter(), time.process_time())
+        self._cpu_utilization: Optional[float] = None
+        self.started_at = time.time()
+
+    def record_stage(self, stage: str, agent: str, duration: Optional[float],
+                     time_to_first_token: Optional[float] = None, error: Optional[BaseException] = None) -> None:
+        key = (stage, agent or "")
+        with self._lock:
+            if duration is not None:
+                histogram = self._stage_durations.get(key)
+                if histogram is None:
+                    histogram = self._stage_durations[key] = Histogram()
+                histogram.observe(duration)
+            if time_to_first_token is not None:
+                histogram = self._first_token.get(key)
+                if histogram is None:
+                    histogram = self._first_token[key] = Histogram()
+                histogram.observe(time_to_first_token)
+            if error is not None:
+                self._stage_errors[key] = self._stage_errors.get(key, 0) + 1
+            self._recent.append((time_to_first_token, error is not None))
+
+    def record_run(self, duration: float, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._run_durations.observe(duration)
+            self._runs['error' if error is not None else 'ok'] += 1
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """Current value of every quantity a rule condition can name"""
+        with self._lock:
+            recent = list(self._recent)
+            now, cpu = time.perf_counter(), time.process_time()
+            wall_start, cpu_start = self._cpu_mark
+            if now - wall_start >= CPU_SAMPLE_INTERVAL:
+                self._cpu_utilization = (cpu - cpu_start) / (now - wall_start) * 100
+                self._cpu_mark = (now, cpu)
+            cpu_utilization = self._cpu_utilization
+        first_tokens = [first_token for first_token, _ in recent if first_token is not None]
+        p95 = percentile(first_tokens, 95)
+        return {
+            RESPONSE_TIME: p95 * 1000 if p95 is not None else None,
+            MEMORY_USAGE: memory_usage_mb(),
+            CPU_UTILIZATION: cpu_utilization,
+            ERROR_RATE: sum(failed for _, failed in recent) / len(recent) * 100 if recent else None,
+        }
+
+    def evaluate(self, values: Optional[Dict[str, Optional[float]]] = None) -> List[Dict[str, Any]]:
+        """Every optimization rule with the live value it was checked against"""
+        values = self.values() if values is None else values
+        return [rule.evaluate(values) for rule in self.rules]
+
+    def alerts(self, values: Optional[Dict[str, Optional[float]]] = None) -> List[Dict[str, Any]]:
+        return [result for result in self.evaluate(values) if result['triggered']]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable view of every metric and rule"""
+        values = self.values()
+        with self._lock:
+            stages = {
+                f"{stage}/{agent}" if agent else stage: {
+                    'duration': histogram.to_dict(),
+                    'time_to_first_token': self._first_token[(stage, agent)].to_dict()
+                    if (stage, agent) in self._first_token else None,
+                    'errors': self._stage_errors.get((stage, agent), 0),
+                }
+                for (stage, agent), histogram in self._stage_durations.items()
+            }
+            runs = {'duration': self._run_durations.to_dict(), **self._runs}
+        return {
+            'uptime': time.time() - self.started_at,
+            'values': values,
+            'thresholds': dict(self.thresholds),
+            'rules': self.evaluate(values),
+            'stages': stages,
+            'runs': runs,
+        }
+
+    def to_prometheus(self) -> str:
+        """Snapshot in the Prometheus text exposition format"""
+        values = self.values()
+        lines: List[str] = []
+        with self._lock:
+            _histogram_lines(lines, f"{METRIC_PREFIX}_stage_duration_seconds",
+                             "Time to stream one stage", self._stage_durations)
+            _histogram_lines(lines, f"{METRIC_PREFIX}_stage_time_to_first_token_seconds",
+                             "Time from stage start to its first token", self._first_token)
+            _header(lines, f"{METRIC_PREFIX}_stage_errors_total", "Stages that failed", "counter")
+            for (stage, agent), count in sorted(self._stage_errors.items()):
+                lines.append(f"{METRIC_PREFIX}_stage_errors_total{_labels(stage=stage, agent=agent)} {count}")
+            _histogram_lines(lines, f"{METRIC_PREFIX}_run_duration_seconds",
+                             "Wall time of one run", {(): self._run_durations})
+            _header(lines, f"{METRIC_PREFIX}_runs_total", "Finished runs", "counter")
+            for status, count in self._runs.items():
+                lines.append(f"{METRIC_PREFIX}_runs_total{_labels(status=status)} {count}")
+
+        gauges = (
+            (RESPONSE_TIME, "response_time_p95_milliseconds", "p95 stage time to first token over the window"),
+            (MEMORY_USAGE, "memory_usage_megabytes", "Resident memory of the process"),
+            (CPU_UTILIZATION, "cpu_utilization_percent", "Process CPU time over wall time"),
+            (ERROR_RATE, "error_rate_percent", "Failed stages over the window"),
+        )
+        for key, name, help_text in gauges:
+            if values[key] is not None:
+                _header(lines, f"{METRIC_PREFIX}_{name}", help_text, "gauge")
+                lines.append(f"{METRIC_PREFIX}_{name} {_format_number(values[key])}")
+
+        _header(lines, f"{METRIC_PREFIX}_rule_triggered", "1 while an optimization rule's condition holds", "gauge")
+        for result in self.evaluate(values):
+            labels = _labels(rule=result['rule'], priority=result['priority'])
+            lines.append(f"{METRIC_PREFIX}_rule_triggered{labels} {int(result['triggered'])}")
+        return "\n".join(lines) + "\n"
+
+
+def memory_usage_mb() -> float:
+    """Resident set size in MB; peak RSS where /proc is not available"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if rss > 1 << 32 else rss / 1024
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    """Prometheus label set; empty values are left out"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in labels.items() if value]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _header(lines: List[str], name: str, help_text: str, kind: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram_lines(lines: List[str], name: str, help_text: str,
+                     histograms: Dict[Tuple, Histogram]) -> None:
+    _header(lines, name, help_text, "histogram")
+    for key, histogram in sorted(histograms.items()):
+        base = dict(zip(("stage", "agent"), key))
+        for bound, count in histogram.cumulative():
+            lines.append(f"{name}_bucket{_labels(**base, le=bound)} {count}")
+        lines.append(f"{name}_sum{_labels(**base)} {_format_number(histogram.sum)}")
+        lines.append(f"{name}_count{_labels(**base)} {histogram.count}")
+
+
+_collector: Optional[MetricsCollector] = None
+_collector_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsCollector:
+    """Process-wide collector, configured from config/analysis.yaml on first use"""
+    global _collector
+    if _collector is None:
+        with _collector_lock:
+            if _collector is None:
+                from hello_world.config.config_loader import ConfigLoader
+                _collector = MetricsCollector(
+                    ConfigLoader().load_analysis(),
+                    window=int(os.getenv("METRICS_WINDOW", DEFAULT_WINDOW))
+                )
+    return _collector
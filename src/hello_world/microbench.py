@@ -0,0 +1,270 @@
+"""
+Micro-benchmarks of the hot paths, with baseline comparison and budgets
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import yaml
+
+ANALYSIS_CONFIG = "src/hello_world/config/analysis.yaml"
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_BUDGET_MS = 200.0
+
+OK = "ok"
+REGRESSED = "regressed"
+IMPROVED = "improved"
+NEW = "new"
+OVER_BUDGET = "over_budget"
+
+# name -> setup function returning the zero-argument callable to time
+CASES: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def case(name: str):
+    """Register a benchmark case; the decorated function does its setup and returns the operation"""
+    def decorator(setup):
+        CASES[name] = setup
+        return setup
+    return decorator
+
+
+def response_time_budget_ms(path: str = ANALYSIS_CONFIG) -> float:
+    """The "Response Time" threshold from analysis.yaml, in milliseconds"""
+    try:
+        with open(path, "r") as f:
+            config = yaml.safe_load(f) or {}
+    except OSError:
+        return DEFAULT_BUDGET_MS
+    for metric in (config.get("performance_analysis") or {}).get("metrics") or []:
+        if metric.get("name") == "Response Time":
+            return float(metric["threshold"])
+    return DEFAULT_BUDGET_MS
+
+
+def measure(operation: Callable[[], Any], rounds: int = 5, min_time: float = 0.05) -> Dict[str, Any]:
+    """
+    Time ``operation`` and report the median cost per call.
+
+    The number of calls per round grows until a round takes at least
+    ``min_time`` seconds, so fast and slow operations are both measured
+    above timer resolution. The median over ``rounds`` rounds damps noise.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = [elapsed / number]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        samples.append((time.perf_counter() - start) / number)
+    per_op = statistics.median(samples)
+    return {
+        'ms_per_op': per_op * 1000,
+        'ops_per_sec': 1 / per_op if per_op else 0.0,
+        'number': number,
+        'rounds': rounds,
+    }
+
+
+def run_cases(names: Optional[Iterable[str]] = None, rounds: int = 5, min_time: float = 0.05) -> Dict[str, Dict]:
+    """Run the selected (default: all) cases; model output echoed while streaming is discarded"""
+    names = list(names) if names is not None else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark case: {', '.join(unknown)}")
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name in names:
+            results[name] = measure(CASES[name](), rounds=rounds, min_time=min_time)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    tolerance: float = DEFAULT_TOLERANCE,
+    budget_ms: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compare results with a baseline, case by case.
+
+    A case regresses when it is more than ``tolerance`` (a fraction) slower
+    than its baseline, and is over budget when a single call takes longer
+    than ``budget_ms``. Cases without a baseline are reported as new.
+    """
+    report = []
+    for name, result in results.items():
+        current = result['ms_per_op']
+        previous = (baseline.get(name) or {}).get('ms_per_op')
+        entry = {'case': name, 'ms_per_op': current, 'baseline_ms': previous, 'change': None}
+        if budget_ms is not None and current > budget_ms:
+            entry['status'] = OVER_BUDGET
+        elif previous is None:
+            entry['status'] = NEW
+        else:
+            entry['change'] = current / previous - 1 if previous else 0.0
+            if entry['change'] > tolerance:
+                entry['status'] = REGRESSED
+            elif entry['change'] < -tolerance:
+                entry['status'] = IMPROVED
+            else:
+                entry['status'] = OK
+        report.append(entry)
+    return report
+
+
+def failures(report: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [entry for entry in report if entry['status'] in (REGRESSED, OVER_BUDGET)]
+
+
+def load_baseline(path) -> Dict[str, Dict]:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f).get('cases', {})
+
+
+def save_baseline(path, results: Dict[str, Dict]) -> None:
+    with open(path, "w") as f:
+        json.dump({'cases': results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+# Cases; setup runs once, outside the timed operation
+
+SAMPLE_TRANSCRIPT = [
+    "Thought: I should compare the sources before drawing any conclusion",
+    "Thought: too short",
+    "[THOUGHT] The question needs recent market data from several regions",
+    "Action: search_web(query=\"solid state battery market\")",
+    "Action: search_web",
+    "Observation: Found 12 relevant articles, 3 peer reviewed",
+    "Plain narrative text that belongs to no section",
+] * 150
+
+
+def _validation_rules():
+    from hello_world.config.config_loader import ConfigLoader
+    return ConfigLoader().load_prompts()["templates"]["validation_rules"]
+
+
+@case("catalog_load")
+def _catalog_load():
+    from hello_world.catalog import AgentCatalog
+    AgentCatalog()  # make sure the snapshot exists
+    return AgentCatalog
+
+
+@case("catalog_lookup")
+def _catalog_lookup():
+    from hello_world.catalog import AgentCatalog
+    catalog = AgentCatalog()
+
+    def lookup():
+        catalog.get_agent_by_tag("research")
+        catalog.find_agents(tags=["research"], capabilities=["fact-validation"])
+        catalog.find_agents(use_cases=["market research", "trend analysis"])
+    return lookup
+
+
+@case("config_load_prompts")
+def _config_load_prompts():
+    from hello_world.config.config_loader import ConfigLoader
+    return ConfigLoader().load_prompts
+
+
+@case("tool_dispatch")
+def _tool_dispatch():
+    from hello_world.tools import CustomTool
+    tool = CustomTool()
+    tool.actions.register("echo", lambda tool, params: params)
+    request = {"action": "echo", "params": {"query": "solid state batteries"}}
+    return lambda: tool._run(request)
+
+
+@case("tool_fact_check")
+def _tool_fact_check():
+    from hello_world.tools import CustomTool
+    tool = CustomTool()
+    request = {"action": "fact_check", "params": {"claim": "Solid state batteries charge faster"}}
+    return lambda: tool._run(request)
+
+
+def _source_urls(pages=600, domains=40):
+    return [f"https://www.site{i % domains}.com/articles/{i}" for i in range(pages)]
+
+
+@case("source_validate_one_by_one")
+def _source_validate_one_by_one():
+    from hello_world.tools.credibility import DomainCredibilityCache
+    from hello_world.tools.custom_tool import SourceValidatorTool
+    tool = SourceValidatorTool(domain_cache=DomainCredibilityCache(ttl=0))
+    urls = _source_urls()
+
+    def validate():
+        for url in urls:
+            tool._run(url)
+    return validate
+
+
+@case("source_validate_batch")
+def _source_validate_batch():
+    from hello_world.tools.credibility import DomainCredibilityCache
+    from hello_world.tools.custom_tool import SourceValidatorTool
+    tool = SourceValidatorTool(domain_cache=DomainCredibilityCache())
+    urls = _source_urls()
+    return lambda: tool.validate_many(urls)
+
+
+@case("react_validate_lines")
+def _react_validate_lines():
+    from hello_world.config.react_validation import ReactValidator
+    validator = ReactValidator(_validation_rules())
+    return lambda: validator.validate_transcripts(SAMPLE_TRANSCRIPT)
+
+
+@case("prompt_build")
+def _prompt_build():
+    from hello_world.catalog import AgentCatalog
+    catalog = AgentCatalog()
+    templates = [catalog.prompt_template(name) for name in catalog.agents]
+    templates = [template for template in templates if template is not None]
+    user_prompt = "Compare solid state battery suppliers across Europe and Asia"
+
+    def build():
+        for template in templates:
+            template.render_with_report(user_prompt)
+    return build
+
+
+@case("stream_loop")
+def _stream_loop():
+    from hello_world.config.react_validation import ReactStreamValidator
+    from hello_world.crew import stream_gemini_response
+    from hello_world.llm import FakeBackend
+
+    backend = FakeBackend(latency=0.0, tokens_per_sec=0, response_tokens=500, chunk_tokens=2)
+    rules = _validation_rules()
+
+    def stream():
+        asyncio.run(stream_gemini_response(
+            "Compare solid state battery suppliers", backend=backend,
+            validator=ReactStreamValidator(rules)
+        ))
+    return stream
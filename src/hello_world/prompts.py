@@ -0,0 +1,86 @@
+"""
+Per-agent ReACT prompt templates, compiled once, with token budgeting
+"""
+
+from typing import Any, Dict, Tuple
+
+from hello_world.llm.tokens import estimate_tokens, trim_to_tokens
+
+# Prompt budget for agents whose config has no model.max_prompt_tokens
+DEFAULT_MAX_PROMPT_TOKENS = 2048
+
+USER_PROMPT_LABEL = "User Prompt: "
+
+
+class PromptTemplate:
+    """
+    An agent's ReACT prompt with everything but the user prompt filled in.
+
+    The agent-specific part is formatted (and its tokens estimated) once;
+    rendering only joins it with the user prompt. The whole prompt is kept
+    within ``budget`` estimated tokens by trimming the user prompt.
+    """
+
+    __slots__ = ('agent', 'prefix', 'suffix', 'budget', 'template_tokens')
+
+    def __init__(self, agent: str, prefix: str, suffix: str = "\n", budget: int = DEFAULT_MAX_PROMPT_TOKENS):
+        self.agent = agent
+        self.prefix = prefix
+        self.suffix = suffix
+        self.budget = budget
+        self.template_tokens = estimate_tokens(prefix + suffix)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PromptTemplate":
+        components = config['react_config']['components']
+        reflection = components.get('reflection', {})
+        prefix = f"""You are a {config['role']} with the goal: {config['goal']}.
+Use ReACT (Reasoning and Acting) methodology with the following structure:
+
+1. Thought: {components['thought']['structure']}
+2. Action: Specify the action to take
+3. Observation: Document results
+4. {reflection.get('name', 'Reflection')}: Analyze and plan next steps
+
+Format your response using this template:
+[THOUGHT] Your reasoning here...
+[ACTION] Your proposed action...
+[OBSERVATION] Results and findings...
+[{reflection.get('name', 'REFLECTION')}] Analysis and next steps...
+
+{USER_PROMPT_LABEL}"""
+        budget = (config.get('model') or {}).get('max_prompt_tokens') or DEFAULT_MAX_PROMPT_TOKENS
+        return cls(config.get('name', config['role']), prefix, budget=budget)
+
+    @property
+    def user_budget(self) -> int:
+        """Estimated tokens left for the user prompt"""
+        return max(0, self.budget - self.template_tokens)
+
+    def render(self, user_prompt: Any) -> str:
+        return self.render_with_report(user_prompt)[0]
+
+    def render_with_report(self, user_prompt: Any) -> Tuple[str, Dict[str, Any]]:
+        """Render the prompt and report its estimated size against the budget."""
+        user_prompt = str(user_prompt)
+        user_tokens = estimate_tokens(user_prompt)
+        trimmed = user_tokens > self.user_budget
+        if trimmed:
+            user_prompt = trim_to_tokens(user_prompt, self.user_budget)
+        prompt = self.prefix + user_prompt + self.suffix
+        return prompt, {
+            'agent': self.agent,
+            'template_tokens': self.template_tokens,
+            'user_tokens': user_tokens,
+            'prompt_tokens': estimate_tokens(prompt),
+            'budget': self.budget,
+            'trimmed': trimmed,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'agent': self.agent,
+            'template_tokens': self.template_tokens,
+            'user_budget': self.user_budget,
+            'budget': self.budget,
+        }
@@ -0,0 +1,194 @@
+"""
+Console output for streamed tokens, progress and banners
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO
+
+CONSOLE = "console"
+JSONL = "jsonl"
+SILENT = "silent"
+RENDER_MODES = (CONSOLE, JSONL, SILENT)
+
+DEFAULT_FPS = 20.0
+
+
+class Renderer:
+    """
+    Buffered output for model streams and status messages.
+
+    Tokens written with ``write`` are held per stream and flushed at most
+    ``fps`` times a second (and when the stream ends), so output costs one
+    write per frame instead of one flushed print per token. Each stream is
+    kept separate: in console mode only whole lines are written, prefixed
+    with the stream's name when it has one, so concurrent streams never
+    interleave mid-line. ``message`` writes a status line or banner right
+    away, after any pending tokens.
+
+    ``jsonl`` mode writes one JSON object per flushed chunk or message, and
+    ``silent`` mode writes nothing. Output goes to ``file``, or to whatever
+    ``sys.stdout`` is at the time of the write.
+    """
+
+    def __init__(self, mode: str = CONSOLE, fps: float = DEFAULT_FPS, file: Optional[TextIO] = None):
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode: {mode}")
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.mode = mode
+        self.interval = 1.0 / fps
+        self.file = file
+        self._pending: Dict[Optional[str], List[str]] = {}
+        self._partial: Dict[Optional[str], str] = {}
+        self._lock = threading.RLock()
+        self._last_flush = 0.0
+        # Loop with a flush timer pending, if any
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.frames = 0
+        self.tokens = 0
+
+    @property
+    def out(self) -> TextIO:
+        return self.file if self.file is not None else sys.stdout
+
+    def write(self, text: str, stream: Optional[str] = None) -> None:
+        """Queue streamed text; it is written with the next frame"""
+        self.tokens += 1
+        if self.mode == SILENT:
+            return
+        with self._lock:
+            self._pending.setdefault(stream, []).append(text)
+            if time.perf_counter() - self._last_flush >= self.interval:
+                self._flush_locked()
+            else:
+                self._schedule()
+
+    def end_stream(self, stream: Optional[str] = None) -> None:
+        """Write everything left of ``stream``, including an unfinished last line"""
+        if self.mode == SILENT:
+            return
+        with self._lock:
+            self._flush_locked()
+            self._write_stream(stream, "", final=True)
+            self._partial.pop(stream, None)
+            self.out.flush()
+
+    def message(self, text: str, kind: str = "message", **data: Any) -> None:
+        """Write a status line or banner now, after pending tokens"""
+        if self.mode == SILENT:
+            return
+        with self._lock:
+            self._flush_locked()
+            if self.mode == JSONL:
+                self._json({'type': kind, 'text': text, **data})
+            else:
+                self.out.write(text + "\n")
+            self.out.flush()
+
+    def banner(self, text: str, **data: Any) -> None:
+        self.message(text, kind="banner", **data)
+
+    def flush(self) -> None:
+        """Write pending tokens; unfinished lines stay buffered until their stream ends"""
+        if self.mode == SILENT:
+            return
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Write everything, including unfinished lines of every stream"""
+        if self.mode == SILENT:
+            return
+        with self._lock:
+            self._flush_locked()
+            for stream in list(self._partial):
+                self._write_stream(stream, "", final=True)
+            self._partial.clear()
+            self.out.flush()
+
+    def _schedule(self) -> None:
+        """Flush the rest of this frame from the event loop, unless a timer is already pending"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._timer_loop is loop:
+            return
+        self._timer_loop = loop
+        delay = max(0.0, self.interval - (time.perf_counter() - self._last_flush))
+        loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer_loop = None
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._last_flush = time.perf_counter()
+        if not pending:
+            return
+        for stream, parts in pending.items():
+            self._write_stream(stream, "".join(parts), final=False)
+        self.out.flush()
+        self.frames += 1
+
+    def _write_stream(self, stream: Optional[str], text: str, final: bool) -> None:
+        if self.mode == JSONL:
+            if text:
+                self._json({'type': 'tokens', 'stream': stream, 'text': text})
+            if final:
+                self._json({'type': 'stream_end', 'stream': stream})
+            return
+        text = self._partial.pop(stream, "") + text
+        if not final:
+            cut = text.rfind("\n") + 1
+            text, self._partial[stream] = text[:cut], text[cut:]
+        if not text:
+            return
+        if stream is not None:
+            prefix = f"[{stream}] "
+            lines = text.splitlines(keepends=True)
+            text = "".join(prefix + line for line in lines)
+        if final and not text.endswith("\n"):
+            text += "\n"
+        self.out.write(text)
+
+    def _json(self, record: Dict[str, Any]) -> None:
+        self.out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+_renderer: Optional[Renderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer() -> Renderer:
+    """
+    Return the process-wide renderer.
+
+    Configured from ``RENDER_MODE`` (console, jsonl or silent) and
+    ``RENDER_FPS`` the first time it is needed, unless one was installed
+    with ``set_renderer``.
+    """
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = Renderer(
+                    mode=os.getenv("RENDER_MODE", CONSOLE).strip().lower(),
+                    fps=float(os.getenv("RENDER_FPS", DEFAULT_FPS))
+                )
+    return _renderer
+
+
+def set_renderer(renderer: Optional[Renderer]) -> Optional[Renderer]:
+    """Install ``renderer`` for the process (None goes back to RENDER_MODE); returns the previous one"""
+    global _renderer
+    with _renderer_lock:
+        previous, _renderer = _renderer, renderer
+    return previous
@@ -0,0 +1,187 @@
+"""
+Dependency-aware stage scheduler for running agent stages concurrently
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+
+class StageSkipped(Exception):
+    """Raised for a stage that did not run because a dependency failed."""
+
+
+class Stage:
+    """A named unit of async work and the stages it has to wait for."""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable], depends_on: Optional[Iterable[str]] = None):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on or [])
+
+
+class StageTimingReport:
+    """Per-stage timings for a single scheduler run."""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict] = {}
+        self.started_at = 0.0
+        self.finished_at = 0.0
+
+    @property
+    def wall_time(self) -> float:
+        return max(self.finished_at - self.started_at, 0.0)
+
+    @property
+    def total_stage_time(self) -> float:
+        return sum(stage['duration'] for stage in self.stages.values())
+
+    @property
+    def overlap_ratio(self) -> float:
+        """Fraction of summed stage time saved by running stages concurrently."""
+        total = self.total_stage_time
+        if total <= 0:
+            return 0.0
+        return max(0.0, 1 - self.wall_time / total)
+
+    def to_dict(self) -> Dict:
+        return {
+            'stages': {name: dict(stage) for name, stage in self.stages.items()},
+            'wall_time': self.wall_time,
+            'total_stage_time': self.total_stage_time,
+            'overlap_ratio': self.overlap_ratio
+        }
+
+    def format(self) -> str:
+        lines = ["⏱️ Stage Timing Report:"]
+        for name, stage in self.stages.items():
+            deps = ", ".join(stage['depends_on']) or "-"
+            lines.append(
+                f"➤ {name:<12} {stage['status']:<9} "
+                f"start +{stage['start']:.3f}s  duration {stage['duration']:.3f}s  after: {deps}"
+            )
+        lines.append(
+            f"➤ Wall time: {self.wall_time:.3f}s | Sum of stages: {self.total_stage_time:.3f}s | "
+            f"Overlap: {self.overlap_ratio * 100:.1f}%"
+        )
+        return "\n".join(lines)
+
+
+class StageScheduler:
+    """
+    Runs stages as soon as their dependencies have finished.
+
+    Stages without a dependency path between them run concurrently on the
+    current event loop. Dependencies on stages that are not part of a run
+    are treated as already satisfied, so a single stage can still be run on
+    its own.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+        self.last_report: Optional[StageTimingReport] = None
+
+    def add_stage(self, name: str, func: Callable[[], Awaitable], depends_on: Optional[Iterable[str]] = None) -> Stage:
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        stage = Stage(name, func, depends_on)
+        self.stages[name] = stage
+        return stage
+
+    def execution_order(self, selected: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Return a topological ordering of the selected stages.
+
+        Raises:
+            ValueError: If a stage is unknown or the dependencies form a cycle
+        """
+        names = self._select(selected)
+        order = []
+        state = {}  # name -> "visiting" | "done"
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Dependency cycle detected: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in self.stages[name].depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+                if dep in names:
+                    visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in names:
+            visit(name, [])
+        return order
+
+    async def run(self, selected: Optional[Iterable[str]] = None) -> StageTimingReport:
+        """
+        Run the selected stages (all stages by default) and return their timings.
+
+        If a stage fails, stages depending on it are skipped, independent
+        stages are allowed to finish and the first error is re-raised once
+        everything has settled. The report is kept on ``last_report`` either way.
+        """
+        order = self.execution_order(selected)
+        names = set(order)
+        report = StageTimingReport()
+        self.last_report = report
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage):
+            deps = [dep for dep in stage.depends_on if dep in names]
+            record = {
+                'depends_on': deps,
+                'status': 'pending',
+                'start': 0.0,
+                'end': 0.0,
+                'duration': 0.0
+            }
+            report.stages[stage.name] = record
+
+            dep_results = await asyncio.gather(*(tasks[dep] for dep in deps), return_exceptions=True)
+            if any(isinstance(result, BaseException) for result in dep_results):
+                record['status'] = 'skipped'
+                raise StageSkipped(stage.name)
+
+            start = time.perf_counter()
+            record['start'] = start - report.started_at
+            record['status'] = 'running'
+            try:
+                result = await stage.func()
+                record['status'] = 'completed'
+                return result
+            except BaseException:
+                record['status'] = 'failed'
+                raise
+            finally:
+                end = time.perf_counter()
+                record['end'] = end - report.started_at
+                record['duration'] = end - start
+
+        report.started_at = time.perf_counter()
+        # Dependencies always precede their dependents in `order`, so the
+        # tasks they await already exist when each stage starts.
+        for name in order:
+            tasks[name] = asyncio.create_task(run_stage(self.stages[name]))
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        report.finished_at = time.perf_counter()
+
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, StageSkipped):
+                raise result
+        return report
+
+    def _select(self, selected: Optional[Iterable[str]]) -> List[str]:
+        if selected is None:
+            return list(self.stages)
+        names = []
+        for name in selected:
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            if name not in names:
+                names.append(name)
+        return names
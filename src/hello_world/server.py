@@ -0,0 +1,285 @@
+"""
+Long-lived HTTP server that keeps one warm crew for many requests
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Set
+
+from aiohttp import web
+
+from hello_world.batch import VALID_TASK_TYPES, parse_request, run_record
+from hello_world.crew import CrewRun
+from hello_world.llm import get_rate_limiter
+from hello_world.metrics import get_metrics
+
+DEFAULT_MAX_RUNS = 64
+DEFAULT_DRAIN_TIMEOUT = 30.0
+DEFAULT_EVENT_QUEUE_SIZE = 4096
+
+# Run events forwarded to server-sent event streams
+SSE_EVENT_KINDS = ("run_started", "stage_started", "token", "stage_finished", "progress", "alert")
+
+
+def sse_frame(event: str, data: Any) -> bytes:
+    """Encode one server-sent event; ``data`` is sent as JSON"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode("utf-8")
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class CrewServer:
+    """
+    Serves crew runs over local HTTP from one event loop.
+
+    The crew (agent catalog, validation rules and model client) is loaded
+    once when the app starts, and every request runs as a task on the same
+    loop, with at most ``max_runs`` executing at a time and the rest
+    waiting their turn.
+
+    Routes:
+        POST /runs                  ``{"prompt": ..., "task_type": ..., "id": ...}``
+        POST /research, /execute, /analyze, /both
+                                    Same, with the task type taken from the path
+        GET  /health                Status, runs in flight, counters and limiter state
+        GET  /metrics               Runtime metrics in Prometheus text format
+
+    A run request answers with the JSON result record (the same shape as a
+    batch result line), or, when the client sends ``Accept:
+    text/event-stream`` or ``?stream=true``, with server-sent events: one
+    per token, stage start/finish, progress step and alert, then a final
+    ``result`` event carrying the record. A client that disconnects from
+    its stream cancels its run.
+
+    On shutdown the server stops taking runs (new ones get 503), waits up
+    to ``drain_timeout`` seconds for those in flight and cancels the rest.
+    """
+
+    def __init__(
+        self,
+        crew=None,
+        max_runs: int = DEFAULT_MAX_RUNS,
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+        event_queue_size: int = DEFAULT_EVENT_QUEUE_SIZE
+    ):
+        if max_runs < 1:
+            raise ValueError("max_runs must be at least 1")
+        self.crew = crew
+        self.max_runs = max_runs
+        self.drain_timeout = drain_timeout
+        self.event_queue_size = event_queue_size
+        self.draining = False
+        self.started_at: Optional[float] = None
+        self.counters = {"accepted": 0, "succeeded": 0, "failed": 0, "cancelled": 0, "rejected": 0}
+        self._runs: Set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_env(cls, crew=None) -> "CrewServer":
+        """Server configured from ``SERVER_MAX_RUNS`` and ``SERVER_DRAIN_TIMEOUT``"""
+        return cls(
+            crew,
+            max_runs=int(os.getenv("SERVER_MAX_RUNS", DEFAULT_MAX_RUNS)),
+            drain_timeout=float(os.getenv("SERVER_DRAIN_TIMEOUT", DEFAULT_DRAIN_TIMEOUT)),
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._runs)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.on_startup.append(self._on_startup)
+        app.on_shutdown.append(self._on_shutdown)
+        app.router.add_post("/runs", self.handle_run)
+        app.router.add_post("/{task_type:" + "|".join(VALID_TASK_TYPES) + "}", self.handle_run)
+        app.router.add_get("/health", self.handle_health)
+        app.router.add_get("/metrics", self.handle_metrics)
+        return app
+
+    def warm_up(self) -> None:
+        """Load the crew and build what the first requests would otherwise pay for"""
+        if self.crew is None:
+            from hello_world.crew import HelloWorldCrew
+            self.crew = HelloWorldCrew()
+        self.crew.warm_up()
+
+    async def drain(self, timeout: Optional[float] = None) -> int:
+        """
+        Stop accepting runs and wait for the ones in flight.
+
+        Runs still going after ``timeout`` seconds (``drain_timeout`` by
+        default) are cancelled. Returns the number that were cancelled.
+        """
+        self.draining = True
+        timeout = self.drain_timeout if timeout is None else timeout
+        if not self._runs:
+            return 0
+        _, pending = await asyncio.wait(set(self._runs), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return len(pending)
+
+    async def handle_run(self, request: web.Request) -> web.StreamResponse:
+        if self.draining:
+            self.counters["rejected"] += 1
+            return web.json_response({"error": "Server is shutting down"}, status=503,
+                                     headers={"Retry-After": "1"}, dumps=_dumps)
+        try:
+            data = await request.json()
+            if isinstance(data, str):
+                data = {"prompt": data}
+            if not isinstance(data, dict):
+                raise ValueError("Request body must be a JSON object or string")
+            if "task_type" in request.match_info:
+                data = {**data, "task_type": request.match_info["task_type"]}
+            parsed = parse_request(data)
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError too
+            return web.json_response({"error": str(e)}, status=400, dumps=_dumps)
+
+        run = CrewRun(parsed["prompt"], parsed["task_type"])
+        if self._wants_stream(request, data):
+            return await self._stream_run(request, run, parsed["id"])
+        started = time.perf_counter()
+        error = await self._wait_run(self._start(run))
+        record = run_record(run, error, started, id=parsed["id"])
+        return web.json_response(record, status=200 if error is None else 502, dumps=_dumps)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "status": "draining" if self.draining else "ok",
+            "in_flight": self.in_flight,
+            "max_runs": self.max_runs,
+            "uptime": time.monotonic() - self.started_at if self.started_at is not None else 0.0,
+            **self.counters,
+            "limiter": get_rate_limiter().stats(),
+            "run_store": self.crew.run_store.stats() if self.crew is not None and self.crew.run_store else None,
+        })
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        metrics = self.crew.metrics if self.crew is not None else get_metrics()
+        text = metrics.to_prometheus() + get_rate_limiter().to_prometheus()
+        return web.Response(text=text, content_type="text/plain", charset="utf-8")
+
+    @staticmethod
+    def _wants_stream(request: web.Request, data: Dict[str, Any]) -> bool:
+        if "text/event-stream" in request.headers.get("Accept", ""):
+            return True
+        flag = request.query.get("stream", data.get("stream", False))
+        return flag is True or str(flag).lower() in ("1", "true", "yes")
+
+    async def _stream_run(self, request: web.Request, run: CrewRun, request_id) -> web.StreamResponse:
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        })
+        await response.prepare(request)
+        # Subscribed before the run starts so no event is missed
+        subscription = run.events.subscribe(maxsize=self.event_queue_size, kinds=SSE_EVENT_KINDS)
+        started = time.perf_counter()
+        task = self._start(run)
+        try:
+            while True:
+                event = await subscription.get()
+                if event is None:
+                    break
+                # Everything already queued goes out in one write
+                frames = [self._event_frame(event)]
+                frames.extend(self._event_frame(e) for e in subscription.drain())
+                await response.write(b"".join(frames))
+            error = await self._wait_run(task)
+            await response.write(sse_frame("result", run_record(run, error, started, id=request_id)))
+            await response.write_eof()
+        except (ConnectionResetError, asyncio.CancelledError):
+            # The client went away; nobody is left to read the run's output
+            self._abandon(task)
+            raise
+        finally:
+            subscription.close()
+        return response
+
+    @staticmethod
+    def _event_frame(event) -> bytes:
+        if event.kind == "token":
+            return sse_frame("token", {"stage": event.stage, "text": event.message})
+        return sse_frame(event.kind, {"stage": event.stage, "message": event.message, **event.data})
+
+    def _start(self, run: CrewRun) -> asyncio.Task:
+        self.counters["accepted"] += 1
+        task = asyncio.create_task(self._execute(run))
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+        return task
+
+    async def _execute(self, run: CrewRun) -> None:
+        try:
+            async with self._slots:
+                await self.crew.execute(run)
+        finally:
+            # A run cancelled while waiting for a slot never ran, so its stream must still end
+            run.events.close()
+
+    async def _wait_run(self, task: asyncio.Task) -> Optional[BaseException]:
+        """Wait for a run task; returns its error, if any, and counts the outcome"""
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                # The waiting handler was cancelled (its client went away), not the run
+                self._abandon(task)
+                raise
+            self.counters["cancelled"] += 1
+            return asyncio.CancelledError("Run cancelled")
+        except Exception as e:
+            self.counters["failed"] += 1
+            return e
+        self.counters["succeeded"] += 1
+        return None
+
+    def _abandon(self, task: asyncio.Task) -> None:
+        """Cancel a run whose client went away and count its outcome once it ends"""
+        if task.done():
+            return
+        task.cancel()
+        task.add_done_callback(self._count_abandoned)
+
+    def _count_abandoned(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self.counters["cancelled"] += 1
+        elif task.exception() is not None:
+            self.counters["failed"] += 1
+        else:
+            self.counters["succeeded"] += 1
+
+    async def _on_startup(self, app: web.Application) -> None:
+        self._slots = asyncio.Semaphore(self.max_runs)
+        self.draining = False
+        self.warm_up()
+        self.started_at = time.monotonic()
+
+    async def _on_shutdown(self, app: web.Application) -> None:
+        await self.drain()
+        store = self.crew.run_store if self.crew is not None else None
+        if store is not None:
+            # Drained runs are queued for the store; get them to disk before exiting
+            await asyncio.to_thread(store.flush, self.drain_timeout)
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8080, server: Optional[CrewServer] = None) -> None:
+    """Serve until SIGINT/SIGTERM, then drain the runs in flight"""
+    server = server or CrewServer.from_env()
+    web.run_app(
+        server.app(), host=host, port=port,
+        # Handlers get a little longer than the drain so their final events go out
+        shutdown_timeout=server.drain_timeout + 5.0,
+        # Cancel a request's handler when its client disconnects, so the run is cancelled too
+        handler_cancellation=True,
+        print=lambda message: print(f"[SYS]: {message}")
+    )
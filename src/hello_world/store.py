@@ -0,0 +1,487 @@
+"""
+Persistent run store: outputs, validations and timings of past runs in SQLite
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DB_PATH = "research_data.db"
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_PENDING = 10000
+# Seconds the process-wide store gets at exit to write what is still queued
+CLOSE_TIMEOUT = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    prompt TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    started_at REAL NOT NULL,
+    wall_time REAL NOT NULL,
+    alerts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_prompt_hash ON runs (prompt_hash, started_at);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS stages (
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    stage TEXT NOT NULL,
+    agent TEXT,
+    model TEXT,
+    status TEXT NOT NULL,
+    error TEXT,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    time_to_first_token REAL,
+    prompt_tokens INTEGER,
+    tokens INTEGER,
+    chars INTEGER,
+    tokens_per_sec REAL,
+    PRIMARY KEY (run_id, stage)
+);
+CREATE INDEX IF NOT EXISTS stages_agent ON stages (agent, started_at);
+CREATE INDEX IF NOT EXISTS stages_stage ON stages (stage, started_at);
+
+CREATE TABLE IF NOT EXISTS outputs (
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    stage TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (run_id, stage)
+);
+
+CREATE TABLE IF NOT EXISTS validations (
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    stage TEXT NOT NULL,
+    valid INTEGER NOT NULL,
+    aborted INTEGER NOT NULL,
+    abort_reason TEXT,
+    sections TEXT NOT NULL,
+    errors TEXT NOT NULL,
+    PRIMARY KEY (run_id, stage)
+);
+"""
+
+# Each run is written as these rows, in this order, inside one transaction
+_INSERTS = (
+    ("runs", "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"),
+    ("stages", "INSERT OR REPLACE INTO stages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"),
+    ("outputs", "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?)"),
+    ("validations", "INSERT OR REPLACE INTO validations VALUES (?, ?, ?, ?, ?, ?, ?)"),
+)
+
+_STOP = object()
+
+
+def prompt_hash(prompt: str) -> str:
+    """Stable identity of a user prompt, for finding every run of it"""
+    return hashlib.sha256(str(prompt).encode("utf-8")).hexdigest()
+
+
+def run_rows(run: Any, error: Optional[BaseException] = None) -> Dict[str, List[Tuple]]:
+    """
+    Flatten a finished ``CrewRun`` into rows for each table.
+
+    Args:
+        run: The run, after ``HelloWorldCrew.execute`` returned or raised
+        error: The exception the run ended with, if any
+
+    Returns:
+        Table name to the list of rows to insert
+    """
+    report = run.stage_report
+    started_at = run.started_at if run.started_at is not None else time.time()
+    if error is not None:
+        status = "error"
+    elif report and all(stage['status'] == 'completed' for stage in report.stages.values()):
+        status = "ok"
+    else:
+        # Cancelled part way, e.g. by a client disconnecting
+        status = "cancelled"
+    run_row = (
+        run.run_id, run.prompt, prompt_hash(run.prompt), run.task_type, status,
+        f"{type(error).__name__}: {error}" if error is not None else None,
+        started_at, report.wall_time if report else 0.0, json.dumps(run.alerts, default=str),
+    )
+    stages = []
+    for name, record in (report.stages.items() if report else []):
+        stats = run.stream_stats.get(name)
+        stats = stats.to_dict() if stats is not None else {}
+        prompt = run.prompts.get(name, {})
+        stages.append((
+            run.run_id, name, prompt.get('agent'), stats.get('model'), record['status'], stats.get('error'),
+            started_at + record['start'], record['duration'], stats.get('time_to_first_token'),
+            prompt.get('prompt_tokens'), stats.get('tokens'), stats.get('chars'), stats.get('tokens_per_sec'),
+        ))
+    outputs = [(run.run_id, name, text) for name, text in run.outputs.items()]
+    validations = []
+    for name, validator in run.validation.items():
+        result = validator.report()
+        validations.append((
+            run.run_id, name, int(result['valid']), int(bool(result['aborted'])), result['abort_reason'],
+            json.dumps(result['sections']), json.dumps(result['errors']),
+        ))
+    return {"runs": [run_row], "stages": stages, "outputs": outputs, "validations": validations}
+
+
+class RunStore:
+    """
+    Every finished run, kept in a SQLite database in WAL mode.
+
+    ``record`` only queues the run; a background thread turns queued runs
+    into rows and writes up to ``batch_size`` of them per transaction, at
+    least every ``flush_interval`` seconds. When more than ``max_pending``
+    runs are waiting, new ones are dropped (and counted) rather than
+    slowing the runs down. Queries read through their own connection, so
+    they never wait for the writer.
+
+    Tables: ``runs`` (indexed by prompt hash and start time), ``stages``
+    (indexed by agent and by stage name, each with start time),
+    ``outputs`` and ``validations``, all keyed by ``run_id``.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_DB_PATH,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.counters = {'recorded': 0, 'written': 0, 'batches': 0, 'dropped': 0, 'errors': 0}
+        self.last_error: Optional[str] = None
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        self._reader = self._connect(check_same_thread=False)
+        self._read_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="run-store-writer", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def from_env(cls) -> "RunStore":
+        """Stored at ``DB_PATH`` (a file path or ``sqlite:///`` URL)"""
+        path = os.getenv("DB_PATH", DEFAULT_DB_PATH)
+        if path.startswith("sqlite:///"):
+            path = path[len("sqlite:///"):]
+        return cls(
+            path,
+            batch_size=int(os.getenv("RUN_STORE_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+            flush_interval=float(os.getenv("RUN_STORE_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)),
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def record(self, run: Any, error: Optional[BaseException] = None) -> bool:
+        """Queue a finished run for writing; False if it was dropped"""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((run, error))
+        except queue.Full:
+            self.counters['dropped'] += 1
+            return False
+        self.counters['recorded'] += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every run recorded so far is written; False on timeout"""
+        if self._closed:
+            return not self._writer.is_alive()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        done = threading.Event()
+        try:
+            # The queue can be full of runs, so even getting in line is bounded
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(_remaining(deadline))
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write what is queued, stop the writer and close the database.
+
+        Gives up after ``timeout`` seconds, leaving the rest of the queue to
+        the daemon writer thread; False if the writer did not finish in time.
+        """
+        if self._closed:
+            return not self._writer.is_alive()
+        self._closed = True
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        else:
+            self._writer.join(_remaining(deadline))
+        with self._read_lock:
+            self._reader.close()
+        return not self._writer.is_alive()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, 'pending': self.pending, 'last_error': self.last_error}
+
+    def runs(
+        self,
+        prompt: Optional[str] = None,
+        task_type: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Stored runs, newest first.
+
+        Args:
+            prompt: Only runs of this user prompt (looked up by its hash)
+            task_type: Only runs of this task type
+            status: "ok", "error" or "cancelled"
+            since: Only runs started at or after this epoch time
+            until: Only runs started before this epoch time
+            limit: Maximum number of runs; None for all
+
+        Returns:
+            One dict per run, without its outputs; see ``get_run``
+        """
+        where, params = _filters(
+            prompt_hash=prompt_hash(prompt) if prompt is not None else None,
+            task_type=task_type, status=status,
+        )
+        where, params = _time_window(where, params, "started_at", since, until)
+        sql = f"SELECT * FROM runs{_where(where)} ORDER BY started_at DESC" + _limit(limit, params)
+        return [_run_dict(row) for row in self._query(sql, params)]
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """A run with its stages, outputs and validation results, or None"""
+        rows = self._query("SELECT * FROM runs WHERE run_id = ?", [run_id])
+        if not rows:
+            return None
+        run = _run_dict(rows[0])
+        run['stages'] = {row['stage']: dict(row) for row in self._query(
+            "SELECT * FROM stages WHERE run_id = ? ORDER BY started_at", [run_id])}
+        run['outputs'] = {row['stage']: row['text'] for row in self._query(
+            "SELECT stage, text FROM outputs WHERE run_id = ?", [run_id])}
+        run['validation'] = {row['stage']: _validation_dict(row) for row in self._query(
+            "SELECT * FROM validations WHERE run_id = ?", [run_id])}
+        return run
+
+    def latest_outputs(self, prompt: str, task_type: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """Stage outputs of the newest successful run of ``prompt``, or None if there is none"""
+        where, params = _filters(prompt_hash=prompt_hash(prompt), task_type=task_type, status="ok")
+        rows = self._query(f"SELECT run_id FROM runs{_where(where)} ORDER BY started_at DESC LIMIT 1", params)
+        if not rows:
+            return None
+        return {row['stage']: row['text'] for row in self._query(
+            "SELECT stage, text FROM outputs WHERE run_id = ?", [rows[0]['run_id']])}
+
+    def stages(
+        self,
+        agent: Optional[str] = None,
+        stage: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = 100
+    ) -> List[Dict[str, Any]]:
+        """Stored stage timings, newest first, filtered like ``runs``"""
+        where, params = _filters(agent=agent, stage=stage, status=status)
+        where, params = _time_window(where, params, "started_at", since, until)
+        sql = f"SELECT * FROM stages{_where(where)} ORDER BY started_at DESC" + _limit(limit, params)
+        return [dict(row) for row in self._query(sql, params)]
+
+    def stage_summary(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregates per stage and agent over a time window.
+
+        Returns:
+            One dict per (stage, agent) with ``runs``, ``failed``,
+            ``invalid`` (ReACT validation failures), mean and max
+            ``duration``, mean ``time_to_first_token`` and ``tokens`` and
+            ``tokens_per_sec``
+        """
+        where, params = _time_window([], [], "s.started_at", since, until)
+        sql = f"""
+            SELECT s.stage, s.agent,
+                   COUNT(*) AS runs,
+                   SUM(s.status = 'failed') AS failed,
+                   SUM(v.valid = 0) AS invalid,
+                   AVG(s.duration) AS mean_duration,
+                   MAX(s.duration) AS max_duration,
+                   AVG(s.time_to_first_token) AS mean_time_to_first_token,
+                   AVG(s.tokens) AS mean_tokens,
+                   AVG(s.tokens_per_sec) AS mean_tokens_per_sec
+            FROM stages s
+            LEFT JOIN validations v ON v.run_id = s.run_id AND v.stage = s.stage
+            {_where(where)}
+            GROUP BY s.stage, s.agent
+            ORDER BY s.stage, s.agent
+        """
+        return [{**dict(row), 'invalid': row['invalid'] or 0} for row in self._query(sql, params)]
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) AS n FROM runs", [])[0]['n']
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=check_same_thread)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Durable at each checkpoint rather than each commit; WAL keeps the database consistent either way
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _query(self, sql: str, params: Iterable) -> List[sqlite3.Row]:
+        with self._read_lock:
+            return self._reader.execute(sql, list(params)).fetchall()
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            stop = False
+            while not stop:
+                batch, waiters = [], []
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    # A close that timed out before queueing _STOP still ends the writer
+                    stop = self._closed
+                    continue
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+                    # A flush or a full batch is written now; otherwise wait a little for more
+                    if stop or waiters or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                self._write_batch(conn, batch)
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple[Any, Optional[BaseException]]]) -> None:
+        if not batch:
+            return
+        rows: Dict[str, List[Tuple]] = {table: [] for table, _ in _INSERTS}
+        for run, error in batch:
+            try:
+                for table, table_rows in run_rows(run, error).items():
+                    rows[table].extend(table_rows)
+            except Exception as e:
+                self.counters['errors'] += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+        try:
+            with conn:
+                for table, sql in _INSERTS:
+                    if rows[table]:
+                        conn.executemany(sql, rows[table])
+        except sqlite3.Error as e:
+            self.counters['errors'] += len(batch)
+            self.last_error = f"{type(e).__name__}: {e}"
+            return
+        self.counters['written'] += len(rows['runs'])
+        self.counters['batches'] += 1
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return max(0.0, deadline - time.monotonic()) if deadline is not None else None
+
+
+def _filters(**columns: Any) -> Tuple[List[str], List[Any]]:
+    where, params = [], []
+    for column, value in columns.items():
+        if value is not None:
+            where.append(f"{column} = ?")
+            params.append(value)
+    return where, params
+
+
+def _time_window(where: List[str], params: List[Any], column: str,
+                 since: Optional[float], until: Optional[float]) -> Tuple[List[str], List[Any]]:
+    if since is not None:
+        where.append(f"{column} >= ?")
+        params.append(since)
+    if until is not None:
+        where.append(f"{column} < ?")
+        params.append(until)
+    return where, params
+
+
+def _where(where: List[str]) -> str:
+    return " WHERE " + " AND ".join(where) if where else ""
+
+
+def _limit(limit: Optional[int], params: List[Any]) -> str:
+    if limit is None:
+        return ""
+    params.append(int(limit))
+    return " LIMIT ?"
+
+
+def _run_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    run = dict(row)
+    run['alerts'] = json.loads(run['alerts'])
+    return run
+
+
+def _validation_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        'valid': bool(row['valid']),
+        'aborted': bool(row['aborted']),
+        'abort_reason': row['abort_reason'],
+        'sections': json.loads(row['sections']),
+        'errors': json.loads(row['errors']),
+    }
+
+
+_run_store: Optional[RunStore] = None
+_run_store_lock = threading.Lock()
+
+
+def get_run_store() -> Optional[RunStore]:
+    """
+    Return the process-wide run store, or None when it is off.
+
+    Enabled by ``RUN_STORE_ENABLED``; the store is opened at ``DB_PATH``
+    on first use and flushed when the process exits.
+    """
+    global _run_store
+    if os.getenv('RUN_STORE_ENABLED', 'false').strip().lower() not in ('1', 'true', 'yes'):
+        return None
+    if _run_store is None:
+        with _run_store_lock:
+            if _run_store is None:
+                _run_store = RunStore.from_env()
+                atexit.register(_run_store.close, CLOSE_TIMEOUT)
+    return _run_store
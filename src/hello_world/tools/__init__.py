@@ -1,7 +1,32 @@
 """
 Custom tools for the CrewAI Multi-Model Demo
+
+Tool classes are imported on first access, since defining them pulls in
+langchain.
 """
 
-from .custom_tool import CustomTool
+import importlib
+
+_LAZY_EXPORTS = {
+    'CustomTool': '.custom_tool',
+    'WebSearchTool': '.custom_tool',
+    'FactCheckerTool': '.custom_tool',
+    'SourceValidatorTool': '.custom_tool',
+    'DataExtractorTool': '.custom_tool',
+    'BaseUserPrompt': '.user_prompt',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['CustomTool']
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
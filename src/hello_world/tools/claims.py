@@ -0,0 +1,229 @@
+"""
+Claim normalization and near-duplicate grouping for batch fact checking
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, TextIO, Tuple
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.85
+SHINGLE_SIZE = 4
+DEFAULT_MEMO_SIZE = 10_000
+
+# Words that flip or qualify a claim; near-duplicates must agree on all of them
+NEGATIONS = frozenset({'not', 'no', 'never', 'none', 'nobody', 'nothing', 'neither', 'nor', 'without'})
+FILLER_WORDS = frozenset({'a', 'an', 'the'})
+
+_MERSENNE = (1 << 61) - 1
+_NOT_RE = re.compile(r"n['’]t\b")
+_PUNCT_RE = re.compile(r"[^\w\s.]|(?<!\d)\.|\.(?!\d)")
+_NUMBER_RE = re.compile(r'^\d+(?:\.\d+)?$')
+
+
+def normalize_claim(claim: str) -> str:
+    """
+    Canonical form of a claim: case, punctuation, spacing and articles ignored.
+
+    Contractions are expanded ("isn't" -> "is not") so negations survive as
+    words; decimal points inside numbers are kept.
+    """
+    text = unicodedata.normalize('NFKC', claim).lower()
+    text = _NOT_RE.sub(' not', text)
+    text = _PUNCT_RE.sub(' ', text)
+    return ' '.join(word for word in text.split() if word not in FILLER_WORDS)
+
+
+def claim_hash(normalized: str) -> str:
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def shingles(normalized: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """Character shingles of a normalized claim, robust to small wording changes."""
+    if len(normalized) <= size:
+        return frozenset({normalized}) if normalized else frozenset()
+    return frozenset(normalized[i:i + size] for i in range(len(normalized) - size + 1))
+
+
+def key_terms(normalized: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Negations and numbers in a claim; claims that differ in these are never merged."""
+    words = normalized.split()
+    return (
+        frozenset(word for word in words if word in NEGATIONS),
+        frozenset(word for word in words if _NUMBER_RE.match(word))
+    )
+
+
+class MinHasher:
+    """MinHash signatures from universal hashing over one 64-bit digest per shingle."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)]
+
+    def signature(self, items: FrozenSet[str]) -> Tuple[int, ...]:
+        if not items:
+            return (_MERSENNE,) * self.num_perm
+        hashes = [int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big') for item in items]
+        return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in self._params)
+
+
+def estimated_similarity(left: Sequence[int], right: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: the share of signature positions that agree."""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+def group_near_duplicates(
+    normalized: Sequence[str],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int = DEFAULT_BANDS
+) -> List[int]:
+    """
+    Group near-duplicate claims with MinHash and locality-sensitive hashing.
+
+    Signatures are split into ``bands``; claims sharing any band become
+    candidates, and candidates whose estimated similarity reaches
+    ``threshold`` (and whose negations and numbers match) are merged.
+
+    Returns:
+        For each claim, the index of its group's representative (the first
+        member in input order)
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands")
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm)
+    signatures = [hasher.signature(shingles(text)) for text in normalized]
+    terms = [key_terms(text) for text in normalized]
+
+    parent = list(range(len(normalized)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+    for index, signature in enumerate(signatures):
+        for band in range(bands):
+            key = (band, signature[band * rows:(band + 1) * rows])
+            buckets.setdefault(key, []).append(index)
+
+    for members in buckets.values():
+        first = members[0]
+        for other in members[1:]:
+            root_first, root_other = find(first), find(other)
+            if root_first == root_other or terms[first] != terms[other]:
+                continue
+            if estimated_similarity(signatures[first], signatures[other]) >= threshold:
+                # The lower index stays the representative
+                parent[max(root_first, root_other)] = min(root_first, root_other)
+
+    return [find(i) for i in range(len(normalized))]
+
+
+class VerdictMemo:
+    """
+    Verdicts keyed by normalized-claim hash, kept across runs.
+
+    An in-memory LRU of ``maxlen`` entries; with ``path`` set, verdicts are
+    also appended to a JSON-lines file and loaded back on start, so later
+    processes reuse earlier results.
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_MEMO_SIZE, path: Optional[str] = None):
+        if maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self.maxlen = maxlen
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._file: Optional[TextIO] = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                self._load()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return verdict
+
+    def put(self, key: str, verdict: Dict[str, Any]) -> None:
+        line = None
+        if self.path is not None:
+            line = json.dumps({'key': key, 'verdict': verdict}, default=str) + "\n"
+        with self._lock:
+            self._remember(key, verdict)
+            if line is not None:
+                if self._file is None:
+                    # Line-buffered so each verdict reaches the file whole
+                    self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+                self._file.write(line)
+
+    def close(self) -> None:
+        """Close the memo file; the next verdict reopens it."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, verdict: Dict[str, Any]) -> None:
+        self._entries[key] = verdict
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxlen:
+            self._entries.popitem(last=False)
+
+    def _load(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted run
+                    continue
+                self._remember(entry['key'], entry['verdict'])
+
+
+_shared_memo: Optional[VerdictMemo] = None
+
+
+def get_verdict_memo() -> VerdictMemo:
+    """
+    Return the process-wide fact-check memo.
+
+    ``FACT_CHECK_MEMO_SIZE`` bounds it; ``FACT_CHECK_MEMO_PATH`` persists it
+    to a JSON-lines file.
+    """
+    global _shared_memo
+    if _shared_memo is None:
+        _shared_memo = VerdictMemo(
+            maxlen=int(os.getenv('FACT_CHECK_MEMO_SIZE', DEFAULT_MEMO_SIZE)),
+            path=os.getenv('FACT_CHECK_MEMO_PATH')
+        )
+    return _shared_memo
@@ -0,0 +1,218 @@
+"""
+Batch source credibility scoring with a shared domain-level cache
+"""
+
+import hashlib
+import ipaddress
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_TTL = 3600
+DEFAULT_MAX_DOMAINS = 10_000
+
+# Which of the weighted credibility metrics belong to the domain and which to the page
+DOMAIN_METRICS = ('domain_authority', 'peer_review_status')
+PAGE_METRICS = ('citation_count', 'last_updated', 'author_credentials')
+
+DEFAULT_TRUSTED_DOMAINS = ('wikipedia.org', 'reuters.com', 'apnews.com', 'nature.com', 'science.org')
+HIGH_AUTHORITY_SUFFIXES = ('.gov', '.edu')
+PEER_REVIEWED_DOMAINS = frozenset({
+    'nature.com', 'science.org', 'cell.com', 'thelancet.com', 'nejm.org', 'bmj.com',
+    'plos.org', 'springer.com', 'sciencedirect.com', 'wiley.com', 'acm.org', 'ieee.org',
+    'ncbi.nlm.nih.gov'
+})
+
+# Page signals that need the page itself score as neutral when unknown
+NEUTRAL = 0.5
+# Age in years at which the recency signal reaches zero
+RECENCY_HORIZON_YEARS = 5
+
+_PATH_DATE_RE = re.compile(r'/((?:19|20)\d{2})[/-](\d{1,2})(?:[/-](\d{1,2}))?(?=/|$|-|\.)')
+
+
+def normalize_domain(netloc: str) -> str:
+    """Lower-case a netloc and drop credentials, port and a leading ``www.``."""
+    host = netloc.rsplit('@', 1)[-1].lower()
+    if host.startswith('['):
+        host = host[1:].split(']', 1)[0]
+    elif host.count(':') == 1:
+        host = host.split(':', 1)[0]
+    if host.startswith('www.'):
+        host = host[4:]
+    return host.rstrip('.')
+
+
+def trusted_domains_from_env() -> Tuple[str, ...]:
+    """Trusted domains from ``TRUSTED_DOMAINS`` (comma separated), with a built-in default."""
+    value = os.getenv('TRUSTED_DOMAINS')
+    if not value:
+        return DEFAULT_TRUSTED_DOMAINS
+    return tuple(d.strip().lower() for d in value.split(',') if d.strip())
+
+
+def trusted_domains_key(trusted_domains: Sequence[str]) -> str:
+    """Short hash of a trusted-domain list, for keying signals scored against it."""
+    return hashlib.sha1('\n'.join(trusted_domains).encode('utf-8')).hexdigest()[:12]
+
+
+def _matches(domain: str, candidates) -> bool:
+    return any(domain == c or domain.endswith('.' + c) for c in candidates)
+
+
+def domain_signals(domain: str, trusted_domains: Sequence[str] = DEFAULT_TRUSTED_DOMAINS) -> Dict[str, float]:
+    """
+    Score the domain-level credibility metrics, each in ``[0, 1]``.
+
+    This is the part of a source's credibility shared by every page on the
+    domain, so it only needs computing once per domain.
+    """
+    if not domain or ('.' not in domain and ':' not in domain):
+        authority = 0.1
+    elif _is_ip(domain):
+        authority = 0.2
+    elif _matches(domain, trusted_domains):
+        authority = 0.9
+    elif domain.endswith(HIGH_AUTHORITY_SUFFIXES):
+        authority = 0.85
+    else:
+        authority = NEUTRAL
+    return {
+        'domain_authority': authority,
+        'peer_review_status': 1.0 if _matches(domain, PEER_REVIEWED_DOMAINS) else 0.0
+    }
+
+
+def page_signals(url: str, today: Optional[date] = None) -> Dict[str, float]:
+    """
+    Score the page-level credibility metrics, each in ``[0, 1]``.
+
+    Recency comes from a date in the URL path; citation and author signals
+    need the page content and are neutral until it is available.
+    """
+    return {
+        'citation_count': NEUTRAL,
+        'last_updated': _recency(urlparse(url).path, today or date.today()),
+        'author_credentials': NEUTRAL
+    }
+
+
+def _recency(path: str, today: date) -> float:
+    match = _PATH_DATE_RE.search(path)
+    if not match:
+        return NEUTRAL
+    year, month = int(match.group(1)), int(match.group(2))
+    if not 1 <= month <= 12 or year > today.year:
+        return NEUTRAL
+    age_years = (today.year - year) + (today.month - month) / 12
+    return round(max(0.0, min(1.0, 1 - age_years / RECENCY_HORIZON_YEARS)), 4)
+
+
+def _is_ip(domain: str) -> bool:
+    try:
+        ipaddress.ip_address(domain)
+    except ValueError:
+        return False
+    return True
+
+
+def score_batch(
+    domain_parts: Sequence[float],
+    page_rows: Sequence[Dict[str, float]],
+    weights: Dict[str, float]
+) -> List[float]:
+    """
+    Combine per-URL domain partial scores with weighted page signals.
+
+    Works column by column: each page metric is one pass over the batch,
+    instead of a weighted sum per URL.
+    """
+    scores = list(domain_parts)
+    for metric in PAGE_METRICS:
+        weight = weights.get(metric, 0.0)
+        if weight:
+            column = [row[metric] for row in page_rows]
+            scores = [score + weight * value for score, value in zip(scores, column)]
+    return [round(score, 4) for score in scores]
+
+
+def domain_part(signals: Dict[str, float], weights: Dict[str, float]) -> float:
+    """The domain-level share of the weighted credibility score."""
+    return sum(weights.get(metric, 0.0) * signals[metric] for metric in DOMAIN_METRICS)
+
+
+class DomainCredibilityCache:
+    """
+    LRU cache of domain signals with a time-to-live.
+
+    Signals depend on the trusted-domain list, so callers key entries by the
+    domain together with ``trusted_domains_key`` of that list. Thread safe, so one instance can be shared by every validator in the
+    process and across calls.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_domains: int = DEFAULT_MAX_DOMAINS):
+        if max_domains < 1:
+            raise ValueError("max_domains must be at least 1")
+        self.ttl = ttl
+        self.max_domains = max_domains
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expirations': 0, 'evictions': 0}
+
+    def get(self, domain: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            stored_at, signals = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[domain]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(domain)
+            self._stats['hits'] += 1
+            return signals
+
+    def put(self, domain: str, signals: Dict[str, float]) -> None:
+        with self._lock:
+            self._entries[domain] = (time.monotonic(), signals)
+            self._entries.move_to_end(domain)
+            while len(self._entries) > self.max_domains:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats, domains=len(self._entries))
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+_shared_cache: Optional[DomainCredibilityCache] = None
+
+
+def get_domain_cache() -> DomainCredibilityCache:
+    """
+    Return the process-wide domain credibility cache.
+
+    ``CREDIBILITY_CACHE_TTL`` sets the time-to-live in seconds.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = DomainCredibilityCache(ttl=float(os.getenv('CREDIBILITY_CACHE_TTL', DEFAULT_TTL)))
+    return _shared_cache
@@ -1,12 +1,24 @@
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Tuple
 from langchain.tools import BaseTool
-import requests
-from bs4 import BeautifulSoup
-import json
-import re
+from langchain.pydantic_v1 import Field
 from urllib.parse import urlparse
 import asyncio
+import copy
+import time
 from datetime import datetime
+from .claims import DEFAULT_THRESHOLD, VerdictMemo, claim_hash, get_verdict_memo, group_near_duplicates, normalize_claim
+from .credibility import (
+    DomainCredibilityCache, domain_part, domain_signals, get_domain_cache, normalize_domain,
+    page_signals, score_batch, trusted_domains_from_env, trusted_domains_key
+)
+from .dispatch import Action, ActionRegistry, error_result, run_in_tool_executor
+from .extraction import StreamingHTMLExtractor, quality_score, select_extraction
+from .history import ToolHistory, create_history
+from .http_client import DEFAULT_HEADERS, HttpClient, get_http_client
+from .loop_thread import run_sync
+
+# Cap on page bytes read by the data extractor
+MAX_PAGE_BYTES = 5 * 1024 * 1024
 
 class WebSearchTool(BaseTool):
     """Tool for performing web searches and retrieving relevant information."""
@@ -14,12 +26,9 @@ class WebSearchTool(BaseTool):
     name = "web_search"
     description = "Search the web for information on a specific topic"
 
-    def __init__(self):
-        super().__init__()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        self.search_history = []
+    headers: Dict[str, str] = Field(default_factory=lambda: dict(DEFAULT_HEADERS))
+    search_history: ToolHistory = Field(default_factory=lambda: create_history('web_search'))
+    http: HttpClient = Field(default_factory=get_http_client, exclude=True)
 
     def _run(self, query: str) -> Dict:
         """
@@ -31,19 +40,14 @@ class WebSearchTool(BaseTool):
         Returns:
             Dict containing search results and metadata
         """
+        started = time.perf_counter()
+        timestamp = datetime.now().isoformat()
         try:
-            # Log search attempt
-            search_record = {
-                'timestamp': datetime.now().isoformat(),
-                'query': query,
-                'status': 'pending'
-            }
-            
             # Here you would integrate with a search API
             # For now, returning structured mock data
             results = {
                 'query': query,
-                'timestamp': search_record['timestamp'],
+                'timestamp': timestamp,
                 'results': [
                     {
                         'title': 'Sample Result 1',
@@ -59,21 +63,26 @@ class WebSearchTool(BaseTool):
                 }
             }
             
-            search_record['status'] = 'completed'
-            search_record['results'] = results
-            self.search_history.append(search_record)
+            self.search_history.record(
+                query, 'completed',
+                duration=time.perf_counter() - started,
+                summary={'total_results': results['metadata']['total_results']}
+            )
             
             return results
             
         except Exception as e:
-            search_record['status'] = 'failed'
-            search_record['error'] = str(e)
-            self.search_history.append(search_record)
+            self.search_history.record(query, 'failed', duration=time.perf_counter() - started, error=str(e))
             raise
 
     async def _arun(self, query: str) -> Dict:
-        """Async version of the web search tool."""
-        return await asyncio.to_thread(self._run, query)
+        """
+        Async version of the web search tool.
+
+        Results are canned until a search API is integrated, so nothing is
+        fetched; real result URLs can be checked with ``self.http.probe``.
+        """
+        return self._run(query)
 
 class FactCheckerTool(BaseTool):
     """Tool for validating facts and claims found during research."""
@@ -81,18 +90,19 @@ class FactCheckerTool(BaseTool):
     name = "fact_checker"
     description = "Verify facts and claims against reliable sources"
 
-    def __init__(self):
-        super().__init__()
-        self.verification_history = []
-        self.trusted_domains = [
-            'wikipedia.org',
-            'reuters.com',
-            'apnews.com',
-            'nature.com',
-            'science.org',
-            'edu',
-            'gov'
-        ]
+    verification_history: ToolHistory = Field(default_factory=lambda: create_history('fact_checker'))
+    trusted_domains: List[str] = Field(default_factory=lambda: [
+        'wikipedia.org',
+        'reuters.com',
+        'apnews.com',
+        'nature.com',
+        'science.org',
+        'edu',
+        'gov'
+    ])
+
+    memo: VerdictMemo = Field(default_factory=get_verdict_memo, exclude=True)
+    similarity_threshold: float = DEFAULT_THRESHOLD
 
     def _run(self, claim: str) -> Dict:
         """
@@ -104,45 +114,119 @@ class FactCheckerTool(BaseTool):
         Returns:
             Dict containing verification results and confidence score
         """
-        verification_record = {
-            'timestamp': datetime.now().isoformat(),
-            'claim': claim,
-            'status': 'pending'
-        }
-        
-        try:
-            # Here you would implement actual fact checking logic
-            # For now, returning structured mock data
-            results = {
-                'claim': claim,
-                'verification_status': 'verified',
-                'confidence_score': 0.85,
-                'supporting_sources': [
-                    {
-                        'url': 'https://example.edu/verification',
-                        'trust_score': 0.9,
-                        'last_updated': '2025-01-27'
-                    }
-                ],
-                'context': 'Additional context about the verification...',
-                'timestamp': verification_record['timestamp']
-            }
-            
-            verification_record['status'] = 'completed'
-            verification_record['results'] = results
-            self.verification_history.append(verification_record)
-            
-            return results
+        return self.check_many([claim])['results'][0]
+
+    def check_many(self, claims: List[str]) -> Dict:
+        """
+        Verify a batch of claims, checking each distinct claim only once.
+
+        Claims are normalized and exact duplicates collapse by hash.
+        Remaining claims are grouped with MinHash when their wording is
+        nearly identical (negations and numbers must match). Each group is
+        verified once and the verdict fanned out to every member. Verdicts
+        are memoized across calls.
+
+        Args:
+            claims: The statements to verify
             
+        Returns:
+            Dict with one result per claim, in input order, and batch stats
+            including the dedup ratio
+        """
+        started = time.perf_counter()
+        timestamp = datetime.now().isoformat()
+        normalized = [normalize_claim(claim) for claim in claims]
+        keys = [claim_hash(text) for text in normalized]
+
+        try:
+            first_seen: Dict[str, int] = {}
+            for index, key in enumerate(keys):
+                first_seen.setdefault(key, index)
+
+            verdicts: Dict[str, Dict] = {}
+            pending = []
+            memo_hits = 0
+            for key, index in first_seen.items():
+                verdict = self.memo.get(key)
+                if verdict is None:
+                    pending.append(index)
+                else:
+                    verdicts[key] = verdict
+                    memo_hits += 1
+
+            representatives = group_near_duplicates([normalized[i] for i in pending], self.similarity_threshold)
+            verified = 0
+            for position, index in enumerate(pending):
+                representative = pending[representatives[position]]
+                if keys[representative] not in verdicts:
+                    verdict = dict(self._verify(claims[representative]), canonical_claim=claims[representative])
+                    verdicts[keys[representative]] = verdict
+                    self.memo.put(keys[representative], verdict)
+                    verified += 1
+                if index != representative:
+                    verdicts[keys[index]] = verdicts[keys[representative]]
+                    self.memo.put(keys[index], verdicts[keys[representative]])
         except Exception as e:
-            verification_record['status'] = 'failed'
-            verification_record['error'] = str(e)
-            self.verification_history.append(verification_record)
+            duration = (time.perf_counter() - started) / max(1, len(claims))
+            for claim in claims:
+                self.verification_history.record(claim, 'failed', duration=duration, error=str(e))
             raise
 
+        duration = (time.perf_counter() - started) / max(1, len(claims))
+        results = []
+        for claim, key in zip(claims, keys):
+            results.append(dict(copy.deepcopy(verdicts[key]), claim=claim, timestamp=timestamp))
+            self.verification_history.record(
+                claim, 'completed',
+                duration=duration,
+                summary={
+                    'verification_status': verdicts[key]['verification_status'],
+                    'confidence_score': verdicts[key]['confidence_score']
+                }
+            )
+
+        total = len(claims)
+        return {
+            'results': results,
+            'stats': {
+                'total_claims': total,
+                'unique_claims': len(first_seen),
+                'verified': verified,
+                'memo_hits': memo_hits,
+                'dedup_ratio': round(1 - verified / total, 4) if total else 0.0,
+                'elapsed': time.perf_counter() - started
+            }
+        }
+
+    def _verify(self, claim: str) -> Dict:
+        """Verify a single claim; the expensive step batching avoids repeating."""
+        # Here you would implement actual fact checking logic
+        # For now, returning structured mock data
+        return {
+            'verification_status': 'verified',
+            'confidence_score': 0.85,
+            'supporting_sources': [
+                {
+                    'url': 'https://example.edu/verification',
+                    'trust_score': 0.9,
+                    'last_updated': '2025-01-27'
+                }
+            ],
+            'context': 'Additional context about the verification...'
+        }
+
     async def _arun(self, claim: str) -> Dict:
         """Async version of the fact checker tool."""
-        return await asyncio.to_thread(self._run, claim)
+        return (await self.acheck_many([claim]))['results'][0]
+
+    async def acheck_many(self, claims: List[str]) -> Dict:
+        """
+        Async version of ``check_many``, run on the tool worker pool.
+
+        Supporting sources are canned until real verification is
+        integrated, so they are not fetched.
+        """
+        return await run_in_tool_executor(self.check_many, claims)
 
 class SourceValidatorTool(BaseTool):
     """Tool for validating the credibility and reliability of sources."""
@@ -150,16 +234,16 @@ class SourceValidatorTool(BaseTool):
     name = "source_validator"
     description = "Evaluate the credibility and reliability of information sources"
 
-    def __init__(self):
-        super().__init__()
-        self.validation_history = []
-        self.credibility_metrics = {
-            'domain_authority': 0.3,
-            'citation_count': 0.2,
-            'last_updated': 0.15,
-            'author_credentials': 0.2,
-            'peer_review_status': 0.15
-        }
+    validation_history: ToolHistory = Field(default_factory=lambda: create_history('source_validator'))
+    credibility_metrics: Dict[str, float] = Field(default_factory=lambda: {
+        'domain_authority': 0.3,
+        'citation_count': 0.2,
+        'last_updated': 0.15,
+        'author_credentials': 0.2,
+        'peer_review_status': 0.15
+    })
+    http: HttpClient = Field(default_factory=get_http_client, exclude=True)
+    domain_cache: DomainCredibilityCache = Field(default_factory=get_domain_cache, exclude=True)
 
     def _run(self, source_url: str) -> Dict:
         """
@@ -171,51 +255,106 @@ class SourceValidatorTool(BaseTool):
         Returns:
             Dict containing validation results and credibility metrics
         """
-        validation_record = {
-            'timestamp': datetime.now().isoformat(),
-            'source_url': source_url,
-            'status': 'pending'
-        }
+        return self.validate_many([source_url])[0]
+
+    def validate_many(self, source_urls: List[str]) -> List[Dict]:
+        """
+        Validate many sources at once.
+
+        URLs are grouped by domain: the domain-level metrics are looked up in
+        the shared cache, or computed once per domain, and the weighted
+        scores are computed for the whole batch together.
+
+        Args:
+            source_urls: URLs of the sources to validate
+            
+        Returns:
+            One validation result per URL, in input order
+        """
+        started = time.perf_counter()
+        timestamp = datetime.now().isoformat()
+        weights = self.credibility_metrics
         
         try:
-            domain = urlparse(source_url).netloc
-            
-            # Here you would implement actual source validation logic
-            # For now, returning structured mock data
-            results = {
-                'source_url': source_url,
-                'domain': domain,
-                'credibility_score': 0.88,
-                'metrics': {
-                    'domain_authority': 0.85,
-                    'citation_count': 150,
-                    'last_updated': '2025-01-20',
-                    'author_credentials': 'verified',
-                    'peer_review_status': 'peer_reviewed'
-                },
-                'recommendations': [
-                    'Source is highly credible',
-                    'Recent updates indicate active maintenance',
-                    'Author credentials verified'
-                ],
-                'timestamp': validation_record['timestamp']
-            }
-            
-            validation_record['status'] = 'completed'
-            validation_record['results'] = results
-            self.validation_history.append(validation_record)
-            
-            return results
-            
+            domains = [normalize_domain(urlparse(url).netloc) for url in source_urls]
+            trusted = trusted_domains_from_env()
+            trusted_key = trusted_domains_key(trusted)
+            signals = {}
+            parts = {}
+            for domain in set(domains):
+                # A changed TRUSTED_DOMAINS must not reuse signals scored against the old list
+                key = f'{domain}@{trusted_key}'
+                cached = self.domain_cache.get(key)
+                if cached is None:
+                    cached = domain_signals(domain, trusted)
+                    self.domain_cache.put(key, cached)
+                signals[domain] = cached
+                parts[domain] = domain_part(cached, weights)
+
+            page_rows = [page_signals(url) for url in source_urls]
+            scores = score_batch([parts[domain] for domain in domains], page_rows, weights)
         except Exception as e:
-            validation_record['status'] = 'failed'
-            validation_record['error'] = str(e)
-            self.validation_history.append(validation_record)
+            duration = (time.perf_counter() - started) / max(1, len(source_urls))
+            for url in source_urls:
+                self.validation_history.record(url, 'failed', duration=duration, error=str(e))
             raise
 
+        duration = (time.perf_counter() - started) / max(1, len(source_urls))
+        results = []
+        for url, domain, page, score in zip(source_urls, domains, page_rows, scores):
+            metrics = dict(signals[domain], **page)
+            results.append({
+                'source_url': url,
+                'domain': domain,
+                'credibility_score': score,
+                'metrics': metrics,
+                'recommendations': _recommendations(score, metrics),
+                'timestamp': timestamp
+            })
+            self.validation_history.record(
+                url, 'completed',
+                duration=duration,
+                summary={'domain': domain, 'credibility_score': score}
+            )
+        return results
+
     async def _arun(self, source_url: str) -> Dict:
-        """Async version of the source validator tool."""
-        return await asyncio.to_thread(self._run, source_url)
+        """Async version of the source validator tool; also checks the source over HTTP."""
+        return (await self.avalidate_many([source_url]))[0]
+
+    async def avalidate_many(self, source_urls: List[str]) -> List[Dict]:
+        """
+        Async version of ``validate_many``; also checks every source over HTTP concurrently.
+
+        Scoring runs on the tool worker pool while the probes are in flight.
+        """
+        results, *probes = await asyncio.gather(
+            run_in_tool_executor(self.validate_many, source_urls),
+            *(self.http.probe(url) for url in source_urls)
+        )
+        for result, probe in zip(results, probes):
+            result['availability'] = {
+                'reachable': probe['reachable'],
+                'status': probe['status'],
+                'https': urlparse(result['source_url']).scheme == 'https',
+                'last_modified': probe.get('last_modified')
+            }
+        return results
+
+def _recommendations(score: float, metrics: Dict[str, float]) -> List[str]:
+    if score >= 0.75:
+        recommendations = ['Source is highly credible']
+    elif score >= 0.5:
+        recommendations = ['Source is moderately credible; corroborate key claims']
+    else:
+        recommendations = ['Source has low credibility; prefer a trusted alternative']
+    if metrics['peer_review_status']:
+        recommendations.append('Published by a peer-reviewed outlet')
+    if metrics['last_updated'] > 0.8:
+        recommendations.append('Recent publication date')
+    elif metrics['last_updated'] < 0.2:
+        recommendations.append('Content may be outdated')
+    return recommendations
 
 class DataExtractorTool(BaseTool):
     """Tool for extracting and structuring data from web sources."""
@@ -223,15 +362,20 @@ class DataExtractorTool(BaseTool):
     name = "data_extractor"
     description = "Extract and structure data from web pages and documents"
 
-    def __init__(self):
-        super().__init__()
-        self.extraction_history = []
-        self.supported_formats = ['text', 'table', 'list', 'metadata']
+    extraction_history: ToolHistory = Field(default_factory=lambda: create_history('data_extractor'))
+    supported_formats: List[str] = Field(default_factory=lambda: ['text', 'table', 'list', 'metadata'])
+    http: HttpClient = Field(default_factory=get_http_client, exclude=True)
+
+    max_page_bytes: int = MAX_PAGE_BYTES
 
     def _run(self, url: str, extraction_type: str = 'text') -> Dict:
         """
         Extract structured data from a web source.
         
+        Runs the streaming extractor on the shared tool loop, so it also
+        works when called from a thread with a running event loop; async
+        callers should use ``_arun``.
+        
         Args:
             url: URL to extract data from
             extraction_type: Type of data to extract (text, table, list, metadata)
@@ -239,54 +383,91 @@ class DataExtractorTool(BaseTool):
         Returns:
             Dict containing extracted data and metadata
         """
-        extraction_record = {
-            'timestamp': datetime.now().isoformat(),
-            'url': url,
-            'extraction_type': extraction_type,
-            'status': 'pending'
-        }
+        return run_sync(self._arun(url, extraction_type))
+
+    async def _arun(self, url: str, extraction_type: str = 'text') -> Dict:
+        """
+        Async version of the data extractor tool.
+        
+        The page is parsed while its bytes stream in through the shared HTTP
+        client, and reading stops at ``max_page_bytes``.
+        """
+        started = time.perf_counter()
+        timestamp = datetime.now().isoformat()
         
         try:
             if extraction_type not in self.supported_formats:
                 raise ValueError(f"Unsupported extraction type: {extraction_type}")
             
-            # Here you would implement actual data extraction logic
-            # For now, returning structured mock data
+            async with self.http.open(url) as response:
+                status = response.status
+                extractor = StreamingHTMLExtractor(max_bytes=self.max_page_bytes, encoding=response.charset)
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    if not extractor.feed_bytes(chunk):
+                        break
+            extracted = extractor.finish()
+            
             results = {
                 'url': url,
                 'extraction_type': extraction_type,
-                'data': {
-                    'title': 'Sample Page Title',
-                    'main_content': 'Extracted main content...',
-                    'metadata': {
-                        'author': 'John Doe',
-                        'publish_date': '2025-01-27',
-                        'last_modified': '2025-01-27'
-                    }
-                },
+                'data': select_extraction(extracted, extraction_type),
                 'stats': {
-                    'extraction_time': 0.5,
-                    'content_length': 1500,
-                    'quality_score': 0.9
+                    'extraction_time': time.perf_counter() - started,
+                    'content_length': extracted['bytes_processed'],
+                    'truncated': extracted['truncated'],
+                    'http_status': status,
+                    'quality_score': quality_score(extracted)
                 },
-                'timestamp': extraction_record['timestamp']
+                'timestamp': timestamp
             }
             
-            extraction_record['status'] = 'completed'
-            extraction_record['results'] = results
-            self.extraction_history.append(extraction_record)
+            self.extraction_history.record(
+                url, 'completed',
+                duration=time.perf_counter() - started,
+                summary={'extraction_type': extraction_type, 'content_length': results['stats']['content_length']}
+            )
             
             return results
             
         except Exception as e:
-            extraction_record['status'] = 'failed'
-            extraction_record['error'] = str(e)
-            self.extraction_history.append(extraction_record)
+            self.extraction_history.record(
+                url, 'failed',
+                duration=time.perf_counter() - started,
+                error=str(e),
+                summary={'extraction_type': extraction_type}
+            )
             raise
 
-    async def _arun(self, url: str, extraction_type: str = 'text') -> Dict:
-        """Async version of the data extractor tool."""
-        return await asyncio.to_thread(self._run, url, extraction_type)
+DEFAULT_ACTIONS = ActionRegistry([
+    Action(
+        'search',
+        lambda tool, params: tool.web_search._run(params.get('query', '')),
+        lambda tool, params: tool.web_search._arun(params.get('query', '')),
+        max_concurrency=4
+    ),
+    Action(
+        'fact_check',
+        lambda tool, params: tool.fact_checker._run(params.get('claim', '')),
+        lambda tool, params: tool.fact_checker._arun(params.get('claim', '')),
+        max_concurrency=8
+    ),
+    Action(
+        'validate_source',
+        lambda tool, params: tool.source_validator._run(params.get('url', '')),
+        lambda tool, params: tool.source_validator._arun(params.get('url', '')),
+        max_concurrency=8
+    ),
+    Action(
+        'extract_data',
+        lambda tool, params: tool.data_extractor._run(params.get('url', ''), params.get('extraction_type', 'text')),
+        lambda tool, params: tool.data_extractor._arun(params.get('url', ''), params.get('extraction_type', 'text')),
+        max_concurrency=4
+    )
+])
+
+def register_action(name: str, handler=None, async_handler=None, max_concurrency=None) -> Action:
+    """Add an action to every CustomTool created from now on; handlers take ``(tool, params)``."""
+    return DEFAULT_ACTIONS.register(name, handler, async_handler, max_concurrency)
 
 class CustomTool(BaseTool):
     """Main custom tool that provides access to all research tools."""
@@ -294,16 +475,15 @@ class CustomTool(BaseTool):
     name = "custom_tool"
     description = "A suite of tools for web research, fact checking, and data extraction"
 
-    def __init__(self):
-        super().__init__()
-        self.web_search = WebSearchTool()
-        self.fact_checker = FactCheckerTool()
-        self.source_validator = SourceValidatorTool()
-        self.data_extractor = DataExtractorTool()
+    web_search: WebSearchTool = Field(default_factory=WebSearchTool)
+    fact_checker: FactCheckerTool = Field(default_factory=FactCheckerTool)
+    source_validator: SourceValidatorTool = Field(default_factory=SourceValidatorTool)
+    data_extractor: DataExtractorTool = Field(default_factory=DataExtractorTool)
+    actions: ActionRegistry = Field(default_factory=DEFAULT_ACTIONS.copy, exclude=True)
 
     def _run(self, input_data: Dict) -> Dict:
         """
-        Route the request to the appropriate tool based on the action specified.
+        Route the request to the action registered under its name.
         
         Args:
             input_data: Dict containing action and parameters
@@ -312,29 +492,38 @@ class CustomTool(BaseTool):
             Results from the specified tool
         """
         try:
-            action = input_data.get('action')
-            params = input_data.get('params', {})
-            
-            if action == 'search':
-                return self.web_search._run(params.get('query', ''))
-            elif action == 'fact_check':
-                return self.fact_checker._run(params.get('claim', ''))
-            elif action == 'validate_source':
-                return self.source_validator._run(params.get('url', ''))
-            elif action == 'extract_data':
-                return self.data_extractor._run(
-                    params.get('url', ''),
-                    params.get('extraction_type', 'text')
-                )
-            else:
-                raise ValueError(f"Unknown action: {action}")
-                
+            return self.actions.run(self, input_data)
         except Exception as e:
-            return {
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
+            return error_result(e)
 
     async def _arun(self, input_data: Dict) -> Dict:
         """Async version of the custom tool."""
-        return await asyncio.to_thread(self._run, input_data)
+        try:
+            return await self.actions.arun(self, input_data)
+        except Exception as e:
+            return error_result(e)
+
+    def run_many(self, items: List[Dict]) -> List[Dict]:
+        """Synchronous wrapper around ``arun_many``, run on the shared tool loop."""
+        return run_sync(self.arun_many(items))
+
+    async def arun_many(self, items: List[Dict]) -> List[Dict]:
+        """
+        Run several ``{action, params}`` items concurrently.
+
+        Each action respects its own concurrency limit; sync-only actions
+        run on the dedicated tool worker pool. A failing item yields an
+        error dict in its slot rather than failing the batch.
+
+        Args:
+            items: Dicts containing action and parameters
+            
+        Returns:
+            One result per item, in input order
+        """
+        return await self.actions.arun_many(self, items)
+
+    async def as_completed(self, items: List[Dict]) -> AsyncIterator[Tuple[int, Dict]]:
+        """Like ``arun_many``, but yield ``(index, result)`` pairs as each item finishes."""
+        async for index, result in self.actions.as_completed(self, items):
+            yield index, result
@@ -0,0 +1,191 @@
+"""
+Pluggable action registry and concurrent multi-action dispatch for CustomTool
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .loop_thread import run_sync
+
+DEFAULT_TOOL_WORKERS = 8
+
+SyncHandler = Callable[[Any, Dict[str, Any]], Any]
+AsyncHandler = Callable[[Any, Dict[str, Any]], Awaitable[Any]]
+
+
+class Action:
+    """
+    One named tool action.
+
+    ``handler(tool, params)`` serves synchronous calls and runs on the tool
+    worker pool in async dispatch; ``async_handler(tool, params)``, when
+    given, is awaited on the event loop instead, and serves synchronous
+    calls on the shared tool loop when there is no ``handler``. Async
+    handlers should hand CPU-bound work to ``run_in_tool_executor``.
+    ``max_concurrency`` caps how many calls of this action run at once per
+    event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Optional[SyncHandler] = None,
+        async_handler: Optional[AsyncHandler] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        if handler is None and async_handler is None:
+            raise ValueError(f"Action {name!r} needs a handler")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.name = name
+        self.handler = handler
+        self.async_handler = async_handler
+        self.max_concurrency = max_concurrency
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def limit(self):
+        """Context manager holding one of this action's concurrency slots."""
+        if self.max_concurrency is None:
+            return nullcontext()
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def __repr__(self) -> str:
+        return f"Action({self.name!r}, max_concurrency={self.max_concurrency})"
+
+
+class ActionRegistry:
+    """
+    Name -> Action mapping with sync, async and batch dispatch.
+
+    Copies share their Action objects, so a copy can add or replace
+    actions without affecting the original while built-in concurrency
+    limits still apply across every tool using them.
+    """
+
+    def __init__(self, actions: Optional[Iterable[Action]] = None):
+        self._actions: Dict[str, Action] = {}
+        for action in actions or ():
+            self._actions[action.name] = action
+
+    def register(
+        self,
+        name: str,
+        handler: Optional[SyncHandler] = None,
+        async_handler: Optional[AsyncHandler] = None,
+        max_concurrency: Optional[int] = None
+    ) -> Action:
+        action = Action(name, handler, async_handler, max_concurrency)
+        self._actions[name] = action
+        return action
+
+    def unregister(self, name: str) -> None:
+        self._actions.pop(name, None)
+
+    def get(self, name: Optional[str]) -> Action:
+        action = self._actions.get(name)
+        if action is None:
+            raise ValueError(f"Unknown action: {name}")
+        return action
+
+    def names(self) -> List[str]:
+        return sorted(self._actions)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._actions
+
+    def copy(self) -> "ActionRegistry":
+        return ActionRegistry(self._actions.values())
+
+    def run(self, target: Any, item: Dict[str, Any]) -> Any:
+        """Run one ``{action, params}`` item synchronously; async-only actions run on the tool loop."""
+        action = self.get(item.get('action'))
+        params = item.get('params', {})
+        if action.handler is None:
+            return run_sync(action.async_handler(target, params))
+        return action.handler(target, params)
+
+    async def arun(self, target: Any, item: Dict[str, Any], executor: Optional[ThreadPoolExecutor] = None) -> Any:
+        """Run one item on the event loop, or on the worker pool for sync-only actions."""
+        action = self.get(item.get('action'))
+        params = item.get('params', {})
+        async with action.limit():
+            if action.async_handler is not None:
+                return await action.async_handler(target, params)
+            return await run_in_tool_executor(action.handler, target, params, executor=executor)
+
+    async def arun_many(
+        self,
+        target: Any,
+        items: List[Dict[str, Any]],
+        executor: Optional[ThreadPoolExecutor] = None
+    ) -> List[Any]:
+        """Run items concurrently; results (or error dicts) come back in input order."""
+        return await asyncio.gather(*(self._guarded(target, item, executor) for item in items))
+
+    async def as_completed(
+        self,
+        target: Any,
+        items: List[Dict[str, Any]],
+        executor: Optional[ThreadPoolExecutor] = None
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Run items concurrently and yield ``(index, result)`` pairs as each finishes."""
+        async def indexed(index: int, item: Dict[str, Any]) -> Tuple[int, Any]:
+            return index, await self._guarded(target, item, executor)
+
+        tasks = [asyncio.ensure_future(indexed(i, item)) for i, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _guarded(self, target: Any, item: Dict[str, Any], executor: Optional[ThreadPoolExecutor]) -> Any:
+        try:
+            return await self.arun(target, item, executor)
+        except Exception as e:
+            return error_result(e, item.get('action') if isinstance(item, dict) else None)
+
+
+async def run_in_tool_executor(func: Callable[..., Any], *args: Any,
+                               executor: Optional[ThreadPoolExecutor] = None) -> Any:
+    """Run CPU-bound or blocking tool work on the tool worker pool instead of the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or get_tool_executor(), functools.partial(func, *args))
+
+
+def error_result(error: Exception, action: Optional[str] = None) -> Dict[str, Any]:
+    result = {'error': str(error), 'timestamp': datetime.now().isoformat()}
+    if action is not None:
+        result['action'] = action
+    return result
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """
+    Return the worker pool for synchronous tool actions.
+
+    Kept apart from the loop's default executor so tool work cannot starve
+    other ``to_thread`` users; ``TOOL_WORKERS`` sets its size.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv('TOOL_WORKERS', DEFAULT_TOOL_WORKERS))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tool-worker')
+        return _executor
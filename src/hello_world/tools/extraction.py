@@ -0,0 +1,356 @@
+"""
+Single-pass streaming HTML extraction with bounded memory
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_MAX_TEXT_CHARS = 100_000
+DEFAULT_MAX_ITEMS = 200
+MAX_ITEM_CHARS = 1000
+
+# Containers whose text is never part of the main content
+SKIP_TAGS = frozenset({
+    'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe',
+    'nav', 'header', 'footer', 'aside', 'form', 'button', 'select'
+})
+# Elements that end a paragraph of text
+BLOCK_TAGS = frozenset({
+    'p', 'div', 'section', 'article', 'main', 'br', 'li', 'blockquote', 'pre',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'table', 'ul', 'ol', 'dl', 'dt', 'dd',
+    'figcaption'
+})
+MAIN_TAGS = frozenset({'article', 'main'})
+VOID_TAGS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'source', 'track', 'wbr'
+})
+
+# <meta name|property|http-equiv> values mapped to metadata keys
+META_KEYS = {
+    'description': 'description',
+    'og:description': 'description',
+    'author': 'author',
+    'article:author': 'author',
+    'keywords': 'keywords',
+    'og:title': 'og_title',
+    'article:published_time': 'publish_date',
+    'date': 'publish_date',
+    'dc.date': 'publish_date',
+    'pubdate': 'publish_date',
+    'article:modified_time': 'last_modified',
+    'last-modified': 'last_modified',
+    'og:site_name': 'site_name'
+}
+
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_\-]+)', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class StreamingHTMLExtractor(HTMLParser):
+    """
+    Extracts main content, metadata, lists and tables in one streaming pass.
+
+    Feed raw bytes as they arrive with ``feed_bytes``; no document tree is
+    built. Only the extracted results are kept, each with a hard size cap,
+    and input beyond ``max_bytes`` is ignored, so memory stays bounded no
+    matter how large the page is.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_text_chars: int = DEFAULT_MAX_TEXT_CHARS,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        encoding: Optional[str] = None
+    ):
+        super().__init__(convert_charrefs=True)
+        self.max_bytes = max_bytes
+        self.max_text_chars = max_text_chars
+        self.max_items = max_items
+        self.encoding = encoding
+        self._decoder = None
+        self._sniff_buffer = b''
+        self.bytes_processed = 0
+        self.truncated = False
+
+        self.title = ''
+        self.metadata: Dict[str, str] = {}
+        self.lists: List[List[str]] = []
+        self.tables: List[List[List[str]]] = []
+
+        self._in_title = False
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._paragraph: List[str] = []
+        self._paragraph_chars = 0
+        self._all_text: List[str] = []
+        self._main_text: List[str] = []
+        self._all_chars = 0
+        self._main_chars = 0
+        self._list_stack: List[Optional[List[str]]] = []
+        self._item: Optional[List[str]] = None
+        self._item_chars = 0
+        self._table_stack: List[Optional[List[List[str]]]] = []
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._cell_chars = 0
+
+    def feed_bytes(self, data: bytes) -> bool:
+        """
+        Feed the next chunk of raw page bytes.
+
+        Returns:
+            False once the byte cap has been reached and further input is ignored
+        """
+        if self.truncated:
+            return False
+        remaining = self.max_bytes - self.bytes_processed
+        if len(data) > remaining:
+            data = data[:remaining]
+            self.truncated = True
+        self.bytes_processed += len(data)
+
+        if self._decoder is None:
+            # Hold back the first bytes until the charset can be sniffed
+            self._sniff_buffer += data
+            if len(self._sniff_buffer) < 1024 and not self.truncated:
+                return True
+            data, self._sniff_buffer = self._sniff_buffer, b''
+            self._decoder = codecs.getincrementaldecoder(self._detect_encoding(data))(errors='replace')
+
+        self.feed(self._decoder.decode(data))
+        return not self.truncated
+
+    def finish(self) -> Dict[str, Any]:
+        """Flush buffered input and return the extracted data."""
+        if self._decoder is None:
+            self._decoder = codecs.getincrementaldecoder(self._detect_encoding(self._sniff_buffer))(errors='replace')
+            self.feed(self._decoder.decode(self._sniff_buffer))
+            self._sniff_buffer = b''
+        self.feed(self._decoder.decode(b'', final=True))
+        self.close()
+        self._end_paragraph()
+
+        main_text = self._main_text if self._main_chars >= 200 else self._all_text
+        return {
+            'title': self.title.strip(),
+            'main_content': "\n".join(main_text),
+            'metadata': dict(self.metadata),
+            'lists': self.lists,
+            'tables': self.tables,
+            'bytes_processed': self.bytes_processed,
+            'truncated': self.truncated
+        }
+
+    def _detect_encoding(self, head: bytes) -> str:
+        if self.encoding:
+            return _normalize_encoding(self.encoding)
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        match = _CHARSET_RE.search(head)
+        if match:
+            return _normalize_encoding(match.group(1).decode('ascii', 'ignore'))
+        return 'utf-8'
+
+    # HTMLParser callbacks
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._end_paragraph()
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth and tag != 'meta':
+            return
+        if tag == 'title':
+            self._in_title = True
+        elif tag == 'meta':
+            self._handle_meta(dict(attrs))
+        elif tag == 'html':
+            lang = dict(attrs).get('lang')
+            if lang:
+                self.metadata.setdefault('language', lang)
+        elif tag == 'link':
+            attrs = dict(attrs)
+            if (attrs.get('rel') or '').lower() == 'canonical' and attrs.get('href'):
+                self.metadata.setdefault('canonical_url', attrs['href'])
+        elif tag in MAIN_TAGS:
+            self._main_depth += 1
+        elif tag in ('ul', 'ol'):
+            # Text before a nested list belongs to the enclosing item
+            self._end_item()
+            capacity = len(self.lists) + sum(1 for items in self._list_stack if items is not None)
+            self._list_stack.append([] if capacity < self.max_items else None)
+        elif tag == 'li':
+            self._end_item()
+            self._item = []
+            self._item_chars = 0
+        elif tag == 'table':
+            self._end_row()
+            capacity = len(self.tables) + sum(1 for rows in self._table_stack if rows is not None)
+            self._table_stack.append([] if capacity < self.max_items else None)
+        elif tag == 'tr' and self._table_stack:
+            self._end_row()
+            self._row = []
+        elif tag in ('td', 'th') and self._row is not None:
+            self._end_cell()
+            self._cell = []
+            self._cell_chars = 0
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+            return
+        if self._skip_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self._end_paragraph()
+        if tag == 'title':
+            self._in_title = False
+        elif tag in MAIN_TAGS:
+            if self._main_depth:
+                self._main_depth -= 1
+        elif tag == 'li':
+            self._end_item()
+        elif tag in ('ul', 'ol'):
+            self._end_item()
+            if self._list_stack:
+                items = self._list_stack.pop()
+                if items:
+                    self.lists.append(items)
+        elif tag in ('td', 'th'):
+            self._end_cell()
+        elif tag == 'tr':
+            self._end_row()
+        elif tag == 'table':
+            self._end_row()
+            if self._table_stack:
+                rows = self._table_stack.pop()
+                if rows:
+                    self.tables.append(rows)
+
+    def handle_data(self, data):
+        if self._in_title:
+            if len(self.title) < MAX_ITEM_CHARS:
+                self.title += data
+            return
+        if self._skip_depth:
+            return
+        # Every buffer is capped so one huge text node cannot grow memory
+        if self._item is not None and self._item_chars < MAX_ITEM_CHARS:
+            self._item.append(data)
+            self._item_chars += len(data)
+        if self._cell is not None and self._cell_chars < MAX_ITEM_CHARS:
+            self._cell.append(data)
+            self._cell_chars += len(data)
+        if self._paragraph_chars < self.max_text_chars:
+            self._paragraph.append(data)
+            self._paragraph_chars += len(data)
+
+    # Helpers
+
+    def _handle_meta(self, attrs):
+        key = (attrs.get('name') or attrs.get('property') or attrs.get('http-equiv') or '').lower()
+        content = attrs.get('content')
+        target = META_KEYS.get(key)
+        if target and content and target not in self.metadata:
+            self.metadata[target] = _clean(content)[:MAX_ITEM_CHARS]
+
+    def _end_paragraph(self):
+        if not self._paragraph:
+            return
+        text = _clean("".join(self._paragraph))
+        self._paragraph = []
+        self._paragraph_chars = 0
+        if not text:
+            return
+        if self._all_chars < self.max_text_chars:
+            text_part = text[:self.max_text_chars - self._all_chars]
+            self._all_text.append(text_part)
+            self._all_chars += len(text_part)
+        if self._main_depth and self._main_chars < self.max_text_chars:
+            text_part = text[:self.max_text_chars - self._main_chars]
+            self._main_text.append(text_part)
+            self._main_chars += len(text_part)
+
+    def _end_item(self):
+        if self._item is None:
+            return
+        text = _clean("".join(self._item))
+        self._item = None
+        items = self._list_stack[-1] if self._list_stack else None
+        if text and items is not None and len(items) < self.max_items:
+            items.append(text[:MAX_ITEM_CHARS])
+
+    def _end_cell(self):
+        if self._cell is None:
+            return
+        text = _clean("".join(self._cell))
+        self._cell = None
+        if self._row is not None and len(self._row) < self.max_items:
+            self._row.append(text[:MAX_ITEM_CHARS])
+
+    def _end_row(self):
+        self._end_cell()
+        if self._row is None:
+            return
+        row, self._row = self._row, None
+        rows = self._table_stack[-1] if self._table_stack else None
+        if row and rows is not None and len(rows) < self.max_items:
+            rows.append(row)
+
+
+def _clean(text: str) -> str:
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def _normalize_encoding(name: str) -> str:
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return 'utf-8'
+
+
+def extract_html(chunks: Iterable[bytes], max_bytes: int = DEFAULT_MAX_BYTES, **kwargs: Any) -> Dict[str, Any]:
+    """Run the streaming extractor over an iterable of byte chunks."""
+    extractor = StreamingHTMLExtractor(max_bytes=max_bytes, **kwargs)
+    for chunk in chunks:
+        if not extractor.feed_bytes(chunk):
+            break
+    return extractor.finish()
+
+
+def select_extraction(extracted: Dict[str, Any], extraction_type: str) -> Dict[str, Any]:
+    """Pick the parts of an extraction result relevant to ``extraction_type``."""
+    data = {'title': extracted['title']}
+    if extraction_type == 'text':
+        data['main_content'] = extracted['main_content']
+        data['metadata'] = extracted['metadata']
+    elif extraction_type == 'table':
+        data['tables'] = extracted['tables']
+    elif extraction_type == 'list':
+        data['lists'] = extracted['lists']
+    elif extraction_type == 'metadata':
+        data['metadata'] = extracted['metadata']
+    else:
+        raise ValueError(f"Unsupported extraction type: {extraction_type}")
+    return data
+
+
+def quality_score(extracted: Dict[str, Any]) -> float:
+    """Rough 0-1 score: enough main text, a title and descriptive metadata."""
+    content = min(1.0, len(extracted['main_content']) / 2000)
+    title = 1.0 if extracted['title'] else 0.0
+    wanted = ('author', 'publish_date', 'description')
+    metadata = sum(1 for key in wanted if key in extracted['metadata']) / len(wanted)
+    return round(0.6 * content + 0.2 * title + 0.2 * metadata, 3)
@@ -0,0 +1,169 @@
+"""
+Bounded, compact history of tool invocations with optional disk spill
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+DEFAULT_HISTORY_SIZE = 1000
+
+
+class HistoryRecord:
+    """One tool invocation: what was asked, how it ended and a few result figures."""
+
+    __slots__ = ('timestamp', 'subject', 'status', 'duration', 'error', 'summary')
+
+    def __init__(
+        self,
+        subject: str,
+        status: str,
+        timestamp: Optional[float] = None,
+        duration: float = 0.0,
+        error: Optional[str] = None,
+        summary: Optional[Dict[str, Any]] = None
+    ):
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.subject = subject
+        self.status = status
+        self.duration = duration
+        self.error = error
+        self.summary = summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HistoryRecord":
+        return cls(**{slot: data.get(slot) for slot in cls.__slots__})
+
+    def __repr__(self) -> str:
+        return f"HistoryRecord(subject={self.subject!r}, status={self.status!r}, timestamp={self.timestamp})"
+
+
+class ToolHistory:
+    """
+    Ring buffer of the most recent ``maxlen`` tool records.
+
+    Records only keep scalar summaries of a result, never the full payload.
+    With ``spill_path`` set, every record is also appended to a JSON-lines
+    file, so older records can still be audited after they leave the buffer.
+    The file stays open between records; ``close()`` releases it.
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_HISTORY_SIZE, spill_path: Optional[str] = None):
+        if maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self.maxlen = maxlen
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._records: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._spill_file: Optional[TextIO] = None
+        self._spill_lock = threading.Lock()
+        self.total_recorded = 0
+
+    def record(
+        self,
+        subject: str,
+        status: str,
+        duration: float = 0.0,
+        error: Optional[str] = None,
+        summary: Optional[Dict[str, Any]] = None
+    ) -> HistoryRecord:
+        entry = HistoryRecord(subject, status, duration=duration, error=error, summary=summary)
+        self.append(entry)
+        return entry
+
+    def append(self, entry: HistoryRecord) -> None:
+        with self._lock:
+            self._records.append(entry)
+            self.total_recorded += 1
+        if self.spill_path is not None:
+            self._spill(json.dumps(entry.to_dict(), default=str) + "\n")
+
+    def _spill(self, line: str) -> None:
+        # Readers of the ring buffer never wait on the file
+        with self._spill_lock:
+            if self._spill_file is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                # Line buffered, so each record reaches the file in one write
+                self._spill_file = open(self.spill_path, 'a', encoding='utf-8', buffering=1)
+            self._spill_file.write(line)
+
+    def close(self) -> None:
+        """Close the spill file; the next record reopens it"""
+        with self._spill_lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        with self._lock:
+            return iter(list(self._records))
+
+    def __getitem__(self, index: int) -> HistoryRecord:
+        return self._records[index]
+
+    def latest(self, n: int = 10) -> List[HistoryRecord]:
+        with self._lock:
+            return list(self._records)[-n:]
+
+    def by_status(self, status: str) -> List[HistoryRecord]:
+        return [entry for entry in self if entry.status == status]
+
+    def in_window(self, start: Optional[float] = None, end: Optional[float] = None) -> List[HistoryRecord]:
+        """Records with ``start <= timestamp < end`` (epoch seconds, either bound optional)."""
+        return [entry for entry in self if _in_window(entry.timestamp, start, end)]
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self:
+            counts[entry.status] = counts.get(entry.status, 0) + 1
+        return counts
+
+    def iter_spilled(
+        self,
+        status: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> Iterator[HistoryRecord]:
+        """Stream records back from the spill file, oldest first, optionally filtered."""
+        if self.spill_path is None or not self.spill_path.exists():
+            return
+        with open(self.spill_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = HistoryRecord.from_dict(json.loads(line))
+                if status is not None and entry.status != status:
+                    continue
+                if _in_window(entry.timestamp, start, end):
+                    yield entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+def _in_window(timestamp: float, start: Optional[float], end: Optional[float]) -> bool:
+    return (start is None or timestamp >= start) and (end is None or timestamp < end)
+
+
+def create_history(tool_name: str) -> ToolHistory:
+    """
+    Build a tool's history from the environment.
+
+    ``TOOL_HISTORY_SIZE`` sets the ring-buffer size; ``TOOL_HISTORY_DIR``
+    enables spilling to ``<dir>/<tool_name>.jsonl``.
+    """
+    size = int(os.getenv('TOOL_HISTORY_SIZE', DEFAULT_HISTORY_SIZE))
+    spill_dir = os.getenv('TOOL_HISTORY_DIR')
+    spill_path = os.path.join(spill_dir, f"{tool_name}.jsonl") if spill_dir else None
+    return ToolHistory(maxlen=size, spill_path=spill_path)
@@ -0,0 +1,275 @@
+"""
+Shared, pooled async HTTP client for the research tools
+"""
+
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from hello_world.backoff import full_jitter_backoff
+
+from .loop_thread import at_tool_loop_exit, is_tool_loop
+
+try:  # aiohttp only decodes brotli when one of these is installed
+    import brotli  # noqa: F401
+    _BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _BROTLI = True
+    except ImportError:
+        _BROTLI = False
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate, br' if _BROTLI else 'gzip, deflate'
+}
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class FetchResult:
+    """Response of a completed fetch, with the body already read."""
+
+    __slots__ = ('url', 'status', 'headers', 'body', 'elapsed', 'attempts')
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes, elapsed: float, attempts: int):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed
+        self.attempts = attempts
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400
+
+    def text(self, encoding: Optional[str] = None) -> str:
+        if encoding is None:
+            content_type = self.headers.get('Content-Type', '')
+            encoding = 'utf-8'
+            if 'charset=' in content_type:
+                encoding = content_type.split('charset=', 1)[1].split(';', 1)[0].strip() or 'utf-8'
+        return self.body.decode(encoding, errors='replace')
+
+
+class HttpClient:
+    """
+    Connection-pooled HTTP client shared by all research tools.
+
+    Keeps one ``aiohttp.ClientSession`` per event loop with keep-alive
+    connections (aiohttp connections belong to the loop that opened them), a global and per-host connection limit, timeouts and
+    transparent gzip/deflate (and brotli, when available) decoding.
+    Connection errors, timeouts and retryable statuses are retried with
+    exponential backoff and full jitter.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_per_host: int = 10,
+        timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        keepalive_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 8.0,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.stats = {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'bytes_received': 0,
+            'total_time': 0.0
+        }
+
+    async def session(self) -> aiohttp.ClientSession:
+        """
+        Return the pooled session for the running loop, creating it on first use.
+
+        Sessions on the shared tool loop are closed at process exit. A caller
+        running its own short-lived loop should ``close()`` the client
+        before that loop ends, since connections cannot be closed afterwards.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            for other in [other for other in self._sessions if other.is_closed()]:
+                del self._sessions[other]
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout),
+                auto_decompress=True
+            )
+            if is_tool_loop(loop):
+                at_tool_loop_exit(self.close)
+        return session
+
+    async def fetch(self, url: str, method: str = 'GET', max_bytes: Optional[int] = None, **kwargs: Any) -> FetchResult:
+        """
+        Fetch ``url`` and read the (decompressed) body.
+
+        Args:
+            url: URL to request
+            method: HTTP method
+            max_bytes: Stop reading the body after this many bytes
+            **kwargs: Passed through to ``aiohttp.ClientSession.request``
+
+        Returns:
+            FetchResult for the final attempt; non-retryable error statuses
+            are returned rather than raised
+        """
+        session = await self.session()
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.stats['requests'] += 1
+            retry_after = None
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status in RETRYABLE_STATUSES and attempt <= self.max_retries:
+                        retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+                        await response.release()
+                    else:
+                        body = await _read_body(response, max_bytes)
+                        elapsed = time.perf_counter() - start
+                        self.stats['bytes_received'] += len(body)
+                        self.stats['total_time'] += elapsed
+                        return FetchResult(str(response.url), response.status, dict(response.headers), body, elapsed, attempt)
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError):
+                if attempt > self.max_retries:
+                    self.stats['failures'] += 1
+                    self.stats['total_time'] += time.perf_counter() - start
+                    raise
+
+            self.stats['retries'] += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    @asynccontextmanager
+    async def open(self, url: str, method: str = 'GET', **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Open a response for streaming its body.
+
+        Retries apply until the response headers arrive; the caller reads the
+        (decompressed) body, e.g. with ``response.content.iter_chunked()``.
+        """
+        session = await self.session()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.stats['requests'] += 1
+            retry_after = None
+            try:
+                response = await session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt > self.max_retries:
+                    self.stats['failures'] += 1
+                    raise
+            else:
+                if response.status not in RETRYABLE_STATUSES or attempt > self.max_retries:
+                    break
+                retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+                await response.release()
+
+            self.stats['retries'] += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        try:
+            yield response
+        finally:
+            await response.release()
+
+    async def probe(self, url: str) -> Dict[str, Any]:
+        """
+        Check that ``url`` is reachable without reading its body.
+
+        Never raises; failures are reported in the returned dict.
+        """
+        try:
+            result = await self.fetch(url, max_bytes=0)
+        except Exception as e:
+            return {'url': url, 'reachable': False, 'status': None, 'error': str(e) or type(e).__name__}
+        return {
+            'url': url,
+            'reachable': result.ok,
+            'status': result.status,
+            'elapsed': result.elapsed,
+            'content_type': result.headers.get('Content-Type'),
+            'last_modified': result.headers.get('Last-Modified')
+        }
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return full_jitter_backoff(attempt, self.backoff_base, self.backoff_max)
+
+    async def close(self) -> None:
+        """Close the running loop's session, and those of loops still running in other threads."""
+        loop = asyncio.get_running_loop()
+        for other, session in list(self._sessions.items()):
+            if other is loop:
+                await session.close()
+            elif other.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), other)
+        self._sessions.clear()
+
+
+async def _read_body(response: aiohttp.ClientResponse, max_bytes: Optional[int]) -> bytes:
+    if max_bytes is None:
+        return await response.read()
+    if max_bytes <= 0:
+        return b''
+    parts = []
+    remaining = max_bytes
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        parts.append(chunk[:remaining])
+        remaining -= len(parts[-1])
+        if remaining <= 0:
+            break
+    return b''.join(parts)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+_shared_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client used by the research tools."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = HttpClient()
+    return _shared_client
@@ -0,0 +1,79 @@
+"""
+Long-lived background event loop for synchronous tool calls
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+
+# Seconds the exit hooks get to close what is still open on the tool loop
+SHUTDOWN_TIMEOUT = 5.0
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+_exit_hooks: List[Callable[[], Awaitable[Any]]] = []
+
+
+def get_tool_loop() -> asyncio.AbstractEventLoop:
+    """Return the tool loop, starting its thread on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name='tool-loop', daemon=True)
+            _thread.start()
+            atexit.register(_shutdown)
+        return _loop
+
+
+def is_tool_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    return loop is _loop
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run ``coro`` on the tool loop and wait for its result.
+
+    Works whether or not the calling thread has an event loop running, and
+    keeps loop-bound resources (such as the HTTP client's pooled session)
+    alive from one call to the next instead of rebuilding them per call.
+
+    Raises:
+        RuntimeError: If called from the tool loop itself, which would deadlock
+        TimeoutError: If ``timeout`` seconds pass first; the coroutine is cancelled
+    """
+    loop = get_tool_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() called from the tool loop; await the coroutine instead")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Tool call did not finish within {timeout}s") from None
+
+
+def at_tool_loop_exit(hook: Callable[[], Awaitable[Any]]) -> None:
+    """Await ``hook()`` on the tool loop before it stops at process exit."""
+    with _lock:
+        if hook not in _exit_hooks:
+            _exit_hooks.append(hook)
+
+
+def _shutdown() -> None:
+    loop = _loop
+    if loop is None or loop.is_closed():
+        return
+
+    async def run_hooks():
+        await asyncio.gather(*(hook() for hook in _exit_hooks), return_exceptions=True)
+
+    try:
+        asyncio.run_coroutine_threadsafe(run_hooks(), loop).result(SHUTDOWN_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        pass  # Exit goes ahead even if a hook hangs
+    loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,35 @@
+"""
+Shared setup for tests that run the crew on the fake model backend
+"""
+
+import os
+from unittest import mock
+from hello_world.config.config_loader import ConfigLoader
+from hello_world.crew import HelloWorldCrew
+from hello_world.llm import FakeBackend, set_backend
+from hello_world.metrics import MetricsCollector
+from hello_world.render import SILENT, Renderer, set_renderer
+
+def fake_crew(test, **backend_options):
+    """
+    Build a crew for ``test`` that streams from a FakeBackend.
+
+    The response cache is off, token echo is silenced, metrics go to a
+    fresh collector and runs are not stored. Everything is restored when
+    the test finishes. ``backend_options`` override the FakeBackend's
+    defaults of no latency, no rate limit and 30 tokens per response.
+
+    Returns:
+        The crew and the backend it streams from
+    """
+    backend = FakeBackend(**{"latency": 0.0, "tokens_per_sec": 0, "response_tokens": 30, **backend_options})
+    test.addCleanup(set_backend, set_backend(backend))
+    test.addCleanup(set_renderer, set_renderer(Renderer(SILENT)))
+    patcher = mock.patch.dict(os.environ, {"CACHE_ENABLED": "false"})
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+    crew = HelloWorldCrew()
+    crew.metrics = MetricsCollector(ConfigLoader().load_analysis())
+    crew.run_store = None
+    return crew, backend
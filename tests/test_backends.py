@@ -0,0 +1,129 @@
+import asyncio
+import contextlib
+import io
+import os
+import time
+import unittest
+from unittest import mock
+from fake_crew import fake_crew
+from hello_world.config.config_loader import ConfigLoader
+from hello_world.config.react_validation import ReactStreamValidator
+from hello_world.crew import CrewRun, stream_gemini_response
+from hello_world.llm import (
+    FakeBackend, GeminiBackend, InjectedError, LLMBackend, StreamStats, get_backend, set_backend
+)
+from hello_world.loadgen import percentile, run_load, summarize
+
+class TestFakeBackend(unittest.IsolatedAsyncioTestCase):
+    async def test_streams_valid_react_output(self):
+        backend = FakeBackend(latency=0.0, tokens_per_sec=0, response_tokens=60)
+        validator = ReactStreamValidator(ConfigLoader().load_prompts()["templates"]["validation_rules"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            output = await stream_gemini_response("Compare EV battery suppliers", backend=backend,
+                                                  validator=validator)
+
+        self.assertTrue(output.startswith("[THOUGHT] "))
+        self.assertGreaterEqual(len(output.split()), 60)
+        self.assertTrue(validator.report()["valid"], validator.report()["errors"])
+        self.assertEqual(backend.stats(), {"calls": 1, "errors": 0})
+
+    async def test_latency_and_token_rate(self):
+        backend = FakeBackend(latency=0.05, tokens_per_sec=1000, response_tokens=100, chunk_tokens=10)
+        stats = StreamStats("fake")
+        with contextlib.redirect_stdout(io.StringIO()):
+            await stream_gemini_response("prompt", backend=backend, stats=stats)
+
+        self.assertGreaterEqual(stats.time_to_first_token, 0.045)
+        # About 100 tokens at 1000/s after the first chunk
+        self.assertGreaterEqual(stats.duration - stats.time_to_first_token, 0.08)
+
+    async def test_error_injection_is_deterministic(self):
+        async def outcomes(seed):
+            backend = FakeBackend(latency=0.0, tokens_per_sec=0, error_rate=0.5, seed=seed)
+            results = []
+            for _ in range(20):
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        await stream_gemini_response("prompt", backend=backend)
+                    results.append("ok")
+                except InjectedError as e:
+                    results.append(str(e))
+            return results, backend.errors
+
+        first, errors = await outcomes(3)
+        self.assertEqual((first, errors), await outcomes(3))
+        self.assertEqual(errors, 20 - first.count("ok"))
+        self.assertIn("Injected error before the first token", first)
+        self.assertIn("Injected error mid-stream", first)
+
+    def test_backend_must_implement_create_model(self):
+        with self.assertRaises(TypeError):
+            LLMBackend()
+
+        class Incomplete(LLMBackend):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_backend_selected_from_env(self):
+        previous = set_backend(None)
+        try:
+            with mock.patch.dict(os.environ, {"LLM_BACKEND": "fake", "FAKE_LLM_LATENCY": "0.01"}):
+                backend = get_backend()
+            self.assertIsInstance(backend, FakeBackend)
+            self.assertEqual(backend.latency, 0.01)
+            self.assertIs(get_backend(), backend)
+
+            set_backend(None)
+            with mock.patch.dict(os.environ, {"LLM_BACKEND": "nope"}):
+                with self.assertRaises(ValueError):
+                    get_backend()
+            with mock.patch.dict(os.environ, {"LLM_BACKEND": "gemini"}):
+                self.assertIsInstance(get_backend(), GeminiBackend)
+        finally:
+            set_backend(previous)
+
+class TestEndToEnd(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_runs_on_fake_backend(self):
+        crew, backend = fake_crew(self, latency=0.05, tokens_per_sec=2000, response_tokens=40)
+
+        async def request(i):
+            run = CrewRun(f"prompt {i}", "both")
+            start = time.perf_counter()
+            await crew.execute(run)
+            self.assertEqual(set(run.outputs), {"researcher", "processor"})
+            self.assertTrue(all(v.report()["valid"] for v in run.validation.values()))
+            return {"ttft": min(s.first_token_at for s in run.stream_stats.values()) - start}
+
+        report = await run_load(request, total=8, concurrency=8)
+
+        self.assertEqual(report["succeeded"], 8)
+        self.assertEqual(backend.calls, 16)
+        # Runs overlap: eight of them take far less than eight times one run
+        self.assertLess(report["elapsed"], 4 * report["latency"]["max"])
+        self.assertGreaterEqual(report["ttft"]["p50"], 0.05)
+
+class TestLoadgen(unittest.TestCase):
+    def test_percentiles(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile(values, 100), 100.0)
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(summarize([2.0, 4.0])["mean"], 3.0)
+
+    def test_failures_are_counted(self):
+        async def request(i):
+            if i % 4 == 0:
+                raise InjectedError("boom")
+            await asyncio.sleep(0)
+            return {}
+
+        report = asyncio.run(run_load(request, total=20, concurrency=3))
+        self.assertEqual((report["succeeded"], report["failed"]), (15, 5))
+        self.assertEqual(report["errors"], {"InjectedError": 5})
+        self.assertEqual(report["ttft"]["count"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
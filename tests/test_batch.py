@@ -0,0 +1,101 @@
+import asyncio
+import io
+import json
+import unittest
+from hello_world.batch import parse_batch_line, run_batch
+
+class FakeCrew:
+    """Stands in for a warm HelloWorldCrew, recording how many runs overlap"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    async def execute(self, run):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if "fail" in run.prompt:
+                raise RuntimeError("model unavailable")
+            run.outputs["researcher"] = f"answer to {run.prompt}"
+        finally:
+            self.active -= 1
+        return run
+
+class FlushRecorder(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushed_lines = []
+
+    def flush(self):
+        super().flush()
+        self.flushed_lines.append(self.getvalue().count("\n"))
+
+class TestParseBatchLine(unittest.TestCase):
+    def test_object_and_string_lines(self):
+        self.assertEqual(
+            parse_batch_line('{"id": "a", "prompt": "hi", "task_type": "research"}'),
+            {"id": "a", "prompt": "hi", "task_type": "research"}
+        )
+        self.assertEqual(parse_batch_line('"hello"', default_task="execute")["task_type"], "execute")
+
+    def test_invalid_lines(self):
+        with self.assertRaises(ValueError):
+            parse_batch_line('{"task_type": "research"}')
+        with self.assertRaises(ValueError):
+            parse_batch_line('{"prompt": "hi", "task_type": "dance"}')
+        with self.assertRaises(ValueError):
+            parse_batch_line('not json')
+        with self.assertRaises(ValueError):
+            parse_batch_line('[1, 2]')
+
+class TestRunBatch(unittest.IsolatedAsyncioTestCase):
+    async def test_results_are_streamed_with_bounded_concurrency(self):
+        crew = FakeCrew()
+        lines = [json.dumps({"id": i, "prompt": f"prompt {i}", "task_type": "research"}) + "\n" for i in range(20)]
+        out = FlushRecorder()
+
+        summary = await run_batch(crew, iter(lines), out, concurrency=3)
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(summary["total"], 20)
+        self.assertEqual(summary["succeeded"], 20)
+        self.assertEqual(len(records), 20)
+        self.assertEqual(sorted(r["index"] for r in records), list(range(20)))
+        self.assertLessEqual(crew.max_active, 3)
+        self.assertEqual(crew.max_active, 3)
+        # One flush per completed prompt
+        self.assertEqual(out.flushed_lines, list(range(1, 21)))
+        record = records[0]
+        self.assertEqual(record["status"], "ok")
+        self.assertIn("elapsed", record)
+        self.assertTrue(record["outputs"]["researcher"].startswith("answer to"))
+
+    async def test_errors_are_reported_per_line(self):
+        lines = [
+            '{"prompt": "ok"}\n',
+            '\n',
+            'not json\n',
+            '{"prompt": "please fail"}\n',
+        ]
+        out = io.StringIO()
+
+        summary = await run_batch(FakeCrew(delay=0), lines, out, concurrency=2)
+
+        records = {r["index"]: r for r in map(json.loads, out.getvalue().splitlines())}
+        self.assertEqual(summary["total"], 3)
+        self.assertEqual(summary["failed"], 2)
+        self.assertEqual(records[0]["status"], "ok")
+        self.assertEqual(records[0]["task_type"], "both")
+        self.assertNotIn(1, records)
+        self.assertTrue(records[2]["error"].startswith("JSONDecodeError"))
+        self.assertEqual(records[3]["error"], "RuntimeError: model unavailable")
+
+    async def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            await run_batch(FakeCrew(), [], io.StringIO(), concurrency=0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import contextlib
+import io
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from hello_world.crew import stream_gemini_response
+from hello_world.llm import FakeBackend, GeminiBackend, ResponseCache, StreamStats, cache_key
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+class CountingModel:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = 0
+
+    async def _stream(self):
+        for text in self.chunks:
+            yield FakeChunk(text)
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        return self._stream()
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def disk_size(self):
+        return sum(os.path.getsize(os.path.join(self.tmp.name, f)) for f in os.listdir(self.tmp.name))
+
+    def test_cache_key_is_canonical(self):
+        a = cache_key("prompt", "gemini-pro", {"temperature": 0.7, "top_k": 40})
+        b = cache_key("prompt", "gemini-pro", {"top_k": 40, "temperature": 0.7})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, cache_key("prompt", "gemini-pro", {"temperature": 0.2, "top_k": 40}))
+        self.assertNotEqual(a, cache_key("prompt", "gemini-ultra", {"temperature": 0.7, "top_k": 40}))
+        self.assertNotEqual(cache_key("prompt", "gemini-pro", {}, "fake"), cache_key("prompt", "gemini-pro", {}, "gemini"))
+
+    def test_memory_and_disk_tiers(self):
+        self.cache.put("k", ["a", "b"])
+        self.assertEqual(self.cache.get("k"), ["a", "b"])
+        self.assertEqual(self.cache.stats()["memory_hits"], 1)
+
+        # A fresh cache on the same directory is served from disk
+        other = ResponseCache(cache_dir=self.tmp.name)
+        self.assertEqual(other.get("k"), ["a", "b"])
+        self.assertEqual(other.stats()["disk_hits"], 1)
+        self.assertIsNone(other.get("missing"))
+        self.assertEqual(other.stats()["misses"], 1)
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(cache_dir=self.tmp.name, ttl=0.05)
+        cache.put("k", ["a"])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("k"))
+        self.assertGreaterEqual(cache.stats()["expirations"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "k.json")))
+
+    def test_memory_lru_eviction(self):
+        cache = ResponseCache(max_memory_bytes=10)
+        cache.put("a", ["12345"])
+        cache.put("b", ["12345"])
+        cache.get("a")
+        cache.put("c", ["12345"])
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), ["12345"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_disk_size_eviction(self):
+        cache = ResponseCache(cache_dir=self.tmp.name, max_disk_bytes=200)
+        for i in range(10):
+            cache.put(f"k{i}", ["x" * 50])
+        size = sum(os.path.getsize(os.path.join(self.tmp.name, f)) for f in os.listdir(self.tmp.name))
+        self.assertLessEqual(size, 200)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "k9.json")))
+
+    def test_disk_is_scanned_only_when_over_the_limit(self):
+        self.cache.put("seed", ["x" * 50])
+        cache = ResponseCache(cache_dir=self.tmp.name, max_disk_bytes=400)
+        self.assertEqual(cache.stats()["disk_bytes"], self.disk_size())
+
+        with mock.patch.object(cache, "_sweep_disk", wraps=cache._sweep_disk) as sweep:
+            cache.put("a", ["x" * 50])
+            cache.put("a", ["x" * 50])  # Replacing an entry does not grow the total
+            self.assertEqual(sweep.call_count, 0)
+            self.assertEqual(cache.stats()["disk_bytes"], self.disk_size())
+            for i in range(5):
+                cache.put(f"k{i}", ["x" * 50])
+            self.assertGreaterEqual(sweep.call_count, 1)
+        self.assertEqual(cache.stats()["disk_bytes"], self.disk_size())
+        self.assertLessEqual(self.disk_size(), 400)
+
+    def test_disk_write_failure_keeps_memory_entry(self):
+        with mock.patch("hello_world.llm.cache.os.replace", side_effect=OSError(28, "No space left on device")):
+            self.cache.put("k", ["chunk"])
+
+        self.assertEqual(self.cache.stats()["write_errors"], 1)
+        self.assertEqual(self.cache.get("k"), ["chunk"])
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+class TestCachedStreaming(unittest.IsolatedAsyncioTestCase):
+    async def test_hit_replays_through_callback(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(cache_dir=tmp)
+            model = CountingModel(["[THOUGHT] ", "cached ", "answer"])
+
+            first = []
+            async def on_first(text):
+                first.append(text)
+            result1 = await stream_gemini_response("p", progress_callback=on_first, model=model, cache=cache)
+
+            second = []
+            async def on_second(text):
+                second.append(text)
+            stats = StreamStats("gemini-pro")
+            result2 = await stream_gemini_response("p", progress_callback=on_second, model=model, cache=cache, stats=stats)
+
+            self.assertEqual(model.calls, 1)
+            self.assertEqual(result1, result2)
+            self.assertEqual(first, second)
+            self.assertEqual(stats.chunks, 3)
+            self.assertEqual(cache.stats()["hits"], 1)
+            self.assertEqual(cache.stats()["misses"], 1)
+
+    async def test_backends_do_not_share_entries(self):
+        model = CountingModel(["[THOUGHT] from gemini"])
+
+        class StubGemini(GeminiBackend):
+            def create_model(self, model_name):
+                return model
+
+        cache = ResponseCache()
+        fake = FakeBackend(latency=0.0, tokens_per_sec=0, response_tokens=10)
+        with contextlib.redirect_stdout(io.StringIO()):
+            from_fake = await stream_gemini_response("same prompt", backend=fake, cache=cache)
+            from_gemini = await stream_gemini_response("same prompt", backend=StubGemini(), cache=cache)
+            # Each backend now hits its own entry
+            self.assertEqual(await stream_gemini_response("same prompt", backend=fake, cache=cache), from_fake)
+            self.assertEqual(await stream_gemini_response("same prompt", backend=StubGemini(), cache=cache), from_gemini)
+
+        self.assertNotEqual(from_fake, from_gemini)
+        self.assertEqual((fake.calls, model.calls), (1, 1))
+        self.assertEqual((cache.stats()["misses"], cache.stats()["hits"]), (2, 2))
+
+    async def test_generation_config_changes_miss(self):
+        cache = ResponseCache()
+        model = CountingModel(["x"])
+        await stream_gemini_response("p", model=model, cache=cache)
+        await stream_gemini_response("p", model=model, cache=cache, generation_config={"temperature": 0.1})
+        self.assertEqual(model.calls, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+import yaml
+from hello_world.catalog import AgentCatalog
+
+def write_catalog(root, count=300):
+    """Write a synthetic catalog with `count` agents spread over the agent types"""
+    root = Path(root)
+    agent_tags = {}
+    types = ["research", "execution", "analysis"]
+    for i in range(count):
+        agent_type = types[i % 3]
+        name = f"agent_{i:04d}"
+        (root / agent_type).mkdir(parents=True, exist_ok=True)
+        with open(root / agent_type / f"{name}.yaml", "w") as f:
+            yaml.safe_dump({"name": name, "type": agent_type, "role": f"Role {i}",
+                            "model": {"name": "gemini-pro", "max_tokens": 2048}}, f)
+        agent_tags[name] = {
+            "categories": [agent_type, f"group-{i % 10}"],
+            "capabilities": [f"cap-{i % 7}", "common"],
+            "use_cases": [f"use-{i % 5}", f"use-{i % 4}"],
+        }
+    with open(root / "metadata.yaml", "w") as f:
+        yaml.safe_dump({"agent_tags": agent_tags}, f)
+
+class TestAgentCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        write_catalog(self.root)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_repo_catalog_lookups(self):
+        catalog = AgentCatalog(use_snapshot=False)
+        self.assertEqual(catalog.get_agent_by_tag("research")["name"], "web_researcher")
+        self.assertEqual(catalog.get_agent_by_tag("execution")["name"], "data_processor")
+        self.assertEqual(catalog.get_agent_by_capability("insight-generation")["name"], "insight_analyzer")
+        self.assertIsNone(catalog.get_agent_by_tag("missing"))
+        self.assertIsNone(catalog.get_agent_by_capability("missing"))
+
+    def test_and_or_queries(self):
+        catalog = AgentCatalog(self.root, use_snapshot=False)
+
+        both = catalog.find_agents(tags=["research", "group-3"])
+        self.assertTrue(both)
+        for config in both:
+            tags = catalog.metadata["agent_tags"][config["name"]]["categories"]
+            self.assertIn("research", tags)
+            self.assertIn("group-3", tags)
+
+        either = catalog.find_agents(tags=["group-1", "group-2"], match="any")
+        self.assertEqual(len(either), 60)
+
+        mixed = catalog.find_agents(tags=["analysis"], capabilities=["cap-0"])
+        for config in mixed:
+            self.assertEqual(config["type"], "analysis")
+            self.assertIn("cap-0", catalog.metadata["agent_tags"][config["name"]]["capabilities"])
+
+        self.assertEqual(catalog.find_agents(tags=["research", "nope"]), [])
+        with self.assertRaises(ValueError):
+            catalog.find_agents(tags=["research"], match="xor")
+
+    def test_use_case_ranking(self):
+        catalog = AgentCatalog(self.root, use_snapshot=False)
+        ranked = catalog.find_agents(capabilities=["common"], use_cases=["use-1"])
+
+        self.assertEqual(len(ranked), 300)
+        top = catalog.metadata["agent_tags"][ranked[0]["name"]]["use_cases"]
+        self.assertIn("use-1", top)
+        # Agents covering the use case outrank those that do not
+        last = catalog.metadata["agent_tags"][ranked[-1]["name"]]["use_cases"]
+        self.assertNotIn("use-1", last)
+
+    def test_snapshot_reused_until_sources_change(self):
+        first = AgentCatalog(self.root)
+        self.assertFalse(first.loaded_from_snapshot)
+        self.assertTrue((self.root / ".catalog_snapshot.json").exists())
+
+        second = AgentCatalog(self.root)
+        self.assertTrue(second.loaded_from_snapshot)
+        self.assertEqual(second.agents, first.agents)
+        self.assertEqual(second.get_agent_by_tag("group-4")["name"], first.get_agent_by_tag("group-4")["name"])
+
+        path = self.root / "research" / "agent_0000.yaml"
+        with open(path, "w") as f:
+            yaml.safe_dump({"name": "agent_0000", "type": "research", "role": "Changed"}, f)
+        future = time.time() + 5
+        os.utime(path, (future, future))
+
+        self.assertTrue(second.is_stale())
+        third = AgentCatalog(self.root)
+        self.assertFalse(third.loaded_from_snapshot)
+        self.assertEqual(third.agents["agent_0000"]["role"], "Changed")
+
+        self.assertTrue(second.reload())
+        self.assertEqual(second.agents["agent_0000"]["role"], "Changed")
+        self.assertFalse(second.reload())
+
+    def test_new_agent_file_invalidates_snapshot(self):
+        AgentCatalog(self.root)
+        with open(self.root / "analysis" / "zz_new.yaml", "w") as f:
+            yaml.safe_dump({"name": "zz_new", "type": "analysis"}, f)
+
+        catalog = AgentCatalog(self.root)
+        self.assertFalse(catalog.loaded_from_snapshot)
+        self.assertIn("zz_new", catalog.agents)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from hello_world.tools.custom_tool import DEFAULT_ACTIONS, CustomTool, FactCheckerTool, SourceValidatorTool
+from hello_world.tools.dispatch import ActionRegistry
+from hello_world.tools.http_client import HttpClient
+
+class ConcurrencyProbe:
+    """Tracks how many calls are in flight at once"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.threads.add(threading.current_thread().name)
+
+    def exit(self):
+        with self._lock:
+            self.active -= 1
+
+class TestCustomToolDispatch(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tool = CustomTool()
+        self.probe = ConcurrencyProbe()
+
+        def slow_sync(tool, params):
+            self.probe.enter()
+            try:
+                time.sleep(params["delay"])
+                return {"echo": params["value"]}
+            finally:
+                self.probe.exit()
+
+        async def slow_async(tool, params):
+            self.probe.enter()
+            try:
+                await asyncio.sleep(params["delay"])
+                return {"echo": params["value"]}
+            finally:
+                self.probe.exit()
+
+        self.tool.actions.register("slow_sync", slow_sync, max_concurrency=2)
+        self.tool.actions.register("slow_async", async_handler=slow_async)
+
+    def test_registry_copies_are_independent(self):
+        self.assertIn("slow_sync", self.tool.actions)
+        self.assertNotIn("slow_sync", DEFAULT_ACTIONS)
+        self.assertNotIn("slow_sync", CustomTool().actions)
+        self.assertEqual(DEFAULT_ACTIONS.names(), ["extract_data", "fact_check", "search", "validate_source"])
+
+    def test_sync_run_uses_registry(self):
+        result = self.tool._run({"action": "slow_sync", "params": {"delay": 0, "value": 1}})
+        self.assertEqual(result, {"echo": 1})
+        validated = self.tool._run({"action": "validate_source", "params": {"url": "https://www.nature.com/x"}})
+        self.assertEqual(validated["domain"], "nature.com")
+        unknown = self.tool._run({"action": "nope"})
+        self.assertEqual(unknown["error"], "Unknown action: nope")
+
+    async def test_async_only_action_runs_synchronously_inside_a_loop(self):
+        result = self.tool._run({"action": "slow_async", "params": {"delay": 0, "value": 2}})
+        self.assertEqual(result, {"echo": 2})
+
+    async def test_builtin_cpu_work_runs_on_tool_workers(self):
+        threads = {}
+
+        def recording(method):
+            def wrapper(tool, *args):
+                threads[method.__name__] = threading.current_thread().name
+                return method(tool, *args)
+            return wrapper
+
+        async def unreachable(client, url):
+            return {"url": url, "reachable": False, "status": None}
+
+        with mock.patch.object(FactCheckerTool, "check_many", recording(FactCheckerTool.check_many)), \
+                mock.patch.object(SourceValidatorTool, "validate_many", recording(SourceValidatorTool.validate_many)), \
+                mock.patch.object(HttpClient, "probe", unreachable):
+            results = await self.tool.arun_many([
+                {"action": "fact_check", "params": {"claim": "Water boils at 100C at sea level"}},
+                {"action": "validate_source", "params": {"url": "https://www.nature.com/x"}},
+            ])
+        self.assertFalse([r for r in results if "error" in r])
+        self.assertEqual(set(threads), {"check_many", "validate_many"})
+        self.assertTrue(all(name.startswith("tool-worker") for name in threads.values()))
+
+    async def test_results_in_order_with_errors_in_place(self):
+        items = [
+            {"action": "slow_async", "params": {"delay": 0.03, "value": "a"}},
+            {"action": "missing", "params": {}},
+            {"action": "slow_sync", "params": {"delay": 0.01, "value": "b"}},
+            {"action": "slow_async", "params": {"value": "no delay"}},
+        ]
+        results = await self.tool.arun_many(items)
+
+        self.assertEqual(results[0], {"echo": "a"})
+        self.assertEqual(results[1]["action"], "missing")
+        self.assertIn("Unknown action", results[1]["error"])
+        self.assertEqual(results[2], {"echo": "b"})
+        self.assertIn("delay", results[3]["error"])
+
+    async def test_items_run_concurrently(self):
+        items = [{"action": "slow_async", "params": {"delay": 0.1, "value": i}} for i in range(20)]
+        start = time.perf_counter()
+        results = await self.tool.arun_many(items)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([r["echo"] for r in results], list(range(20)))
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(self.probe.peak, 20)
+
+    async def test_per_action_limit_on_worker_pool(self):
+        items = [{"action": "slow_sync", "params": {"delay": 0.05, "value": i}} for i in range(6)]
+        results = await self.tool.arun_many(items)
+
+        self.assertEqual([r["echo"] for r in results], list(range(6)))
+        self.assertEqual(self.probe.peak, 2)
+        self.assertTrue(all(name.startswith("tool-worker") for name in self.probe.threads))
+
+    async def test_dedicated_executor(self):
+        registry = ActionRegistry()
+        registry.register("who", lambda tool, params: threading.current_thread().name)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="custom-pool") as executor:
+            names = await registry.arun_many(None, [{"action": "who"}] * 3, executor=executor)
+        self.assertEqual(set(names), {"custom-pool_0"})
+
+    async def test_as_completed_yields_fastest_first(self):
+        items = [
+            {"action": "slow_async", "params": {"delay": 0.15, "value": "slow"}},
+            {"action": "slow_async", "params": {"delay": 0.0, "value": "fast"}},
+            {"action": "slow_sync", "params": {"delay": 0.05, "value": "medium"}},
+        ]
+        order = [index async for index, _ in self.tool.as_completed(items)]
+        self.assertEqual(order, [1, 2, 0])
+
+if __name__ == "__main__":
+    unittest.main()
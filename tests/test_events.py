@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import unittest
+from hello_world.config.react_validation import ReactValidator
+from hello_world.crew import CrewRun, HelloWorldCrew
+from hello_world.events import COALESCE, DROP_OLDEST, ProgressBus
+
+class TestProgressBus(unittest.IsolatedAsyncioTestCase):
+    async def test_drop_oldest_keeps_newest_events(self):
+        bus = ProgressBus()
+        subscription = bus.subscribe(maxsize=3, policy=DROP_OLDEST)
+        for i in range(10):
+            bus.publish("token", "researcher", str(i))
+
+        self.assertEqual([e.message for e in subscription.drain()], ["7", "8", "9"])
+        self.assertEqual(subscription.dropped, 7)
+
+    async def test_coalesce_keeps_latest_state_per_key(self):
+        bus = ProgressBus()
+        subscription = bus.subscribe(maxsize=10, policy=COALESCE)
+        for i in range(100):
+            bus.publish("token", "researcher", str(i))
+            bus.publish("token", "processor", str(i))
+        bus.publish("progress", message="done")
+
+        events = subscription.drain()
+        self.assertEqual([(e.kind, e.stage, e.message) for e in events], [
+            ("token", "researcher", "99"), ("token", "processor", "99"), ("progress", None, "done")
+        ])
+
+    async def test_slow_consumer_does_not_slow_publisher_or_others(self):
+        bus = ProgressBus()
+        fast = bus.subscribe(maxsize=10_000)
+        slow = bus.subscribe(maxsize=8, policy=COALESCE)
+        received = []
+
+        async def consume_fast():
+            async for event in fast:
+                received.append(event.seq)
+
+        async def consume_slow():
+            async for _ in slow:
+                await asyncio.sleep(0.01)
+
+        consumers = [asyncio.create_task(consume_fast()), asyncio.create_task(consume_slow())]
+        for i in range(5000):
+            bus.publish("token", "researcher", "x")
+            if i % 100 == 0:
+                await asyncio.sleep(0)
+        bus.close()
+        await asyncio.wait_for(asyncio.gather(*consumers), timeout=2)
+
+        self.assertEqual(received, list(range(1, 5001)))
+        self.assertGreater(slow.dropped, 4000)
+        self.assertLessEqual(len(slow), 8)
+
+    async def test_kind_filter_and_close(self):
+        bus = ProgressBus()
+        progress = bus.subscribe(kinds=("progress",))
+        bus.publish("token", "researcher", "t")
+        bus.publish("progress", message="step")
+        bus.close()
+
+        self.assertEqual([e.message async for e in progress], ["step"])
+        self.assertEqual(bus.subscribers, 0)
+        late = bus.subscribe()
+        self.assertIsNone(await late.get())
+
+    async def test_publish_from_worker_thread(self):
+        bus = ProgressBus()
+        subscription = bus.subscribe()
+        thread = threading.Thread(target=lambda: [bus.publish("tool", message=str(i)) for i in range(5)])
+        thread.start()
+        thread.join()
+        events = [await subscription.get() for _ in range(5)]
+        self.assertEqual([e.message for e in events], ["0", "1", "2", "3", "4"])
+
+class TestProgressSources(unittest.IsolatedAsyncioTestCase):
+    async def test_crew_progress_goes_to_the_run_bus(self):
+        crew = HelloWorldCrew()
+        run = CrewRun("prompt", "research")
+        ui = run.events.subscribe()
+        logger = run.events.subscribe(policy=COALESCE)
+
+        crew.track_progress("Research Initialization", "Starting ReACT analysis", run)
+
+        for subscription in (ui, logger):
+            event = subscription.get_nowait()
+            self.assertEqual(event.kind, "progress")
+            self.assertEqual(event.data["step_type"], "Research Initialization")
+            self.assertEqual(event.message, "Starting ReACT analysis")
+
+    def test_validator_history_is_bounded(self):
+        validator = ReactValidator({})
+        stream = validator.create_stream(maxsize=5)
+        for i in range(1000):
+            validator.stream_update(f"update {i}")
+
+        self.assertEqual(len(validator.stream_history), validator.stream_history.maxlen)
+        self.assertEqual([e.message for e in stream.drain()], [f"update {i}" for i in range(995, 1000)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import asyncio
+import tracemalloc
+import unittest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from hello_world.tools.custom_tool import CustomTool, DataExtractorTool
+from hello_world.tools.extraction import StreamingHTMLExtractor, extract_html
+from hello_world.tools.http_client import HttpClient
+from hello_world.tools.loop_thread import run_sync
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Quantum Computing Roundup</title>
+  <meta name="author" content="Ada Lovelace">
+  <meta property="article:published_time" content="2025-01-20">
+  <meta name="description" content="Latest developments">
+  <link rel="canonical" href="https://example.com/quantum">
+  <style>body { color: red; }</style>
+  <script>var tracking = "should not appear";</script>
+</head>
+<body>
+  <nav><ul><li>Home</li><li>About</li></ul></nav>
+  <article>
+    <h1>Qubits in 2025</h1>
+    <p>Researchers reported error-corrected logical qubits with longer coherence times &amp; lower noise.
+       The result is a step towards fault-tolerant machines that can run useful algorithms.</p>
+    <p>Several labs replicated the approach, using surface codes on superconducting hardware.</p>
+    <ul><li>Surface codes</li><li>Cat qubits<ol><li>Bosonic</li></ol></li></ul>
+    <table>
+      <tr><th>Lab</th><th>Qubits</th></tr>
+      <tr><td>Alpha</td><td>105</td></tr>
+      <tr><td>Beta<td>72</tr>
+    </table>
+  </article>
+  <footer>Copyright footer text</footer>
+</body>
+</html>""".encode("utf-8")
+
+def chunked(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+class TestStreamingExtractor(unittest.TestCase):
+    def test_single_pass_extraction(self):
+        result = extract_html([PAGE])
+
+        self.assertEqual(result["title"], "Quantum Computing Roundup")
+        self.assertEqual(result["metadata"]["author"], "Ada Lovelace")
+        self.assertEqual(result["metadata"]["publish_date"], "2025-01-20")
+        self.assertEqual(result["metadata"]["canonical_url"], "https://example.com/quantum")
+        self.assertEqual(result["metadata"]["language"], "en")
+        self.assertIn("error-corrected logical qubits", result["main_content"])
+        self.assertIn("Qubits in 2025", result["main_content"])
+        self.assertIn("& lower noise", result["main_content"])
+        for boilerplate in ("tracking", "color: red", "Copyright", "About"):
+            self.assertNotIn(boilerplate, result["main_content"])
+        self.assertEqual(result["lists"], [["Bosonic"], ["Surface codes", "Cat qubits"]])
+        self.assertEqual(result["tables"], [[["Lab", "Qubits"], ["Alpha", "105"], ["Beta", "72"]]])
+        self.assertFalse(result["truncated"])
+
+    def test_chunk_boundaries_do_not_matter(self):
+        whole = extract_html([PAGE])
+        for size in (1, 7, 64):
+            self.assertEqual(extract_html(chunked(PAGE, size)), whole)
+
+    def test_multibyte_characters_split_across_chunks(self):
+        page = "<html><body><p>Café naïve 日本語 — résumé</p></body></html>".encode("utf-8")
+        result = extract_html(chunked(page, 3))
+        self.assertEqual(result["main_content"], "Café naïve 日本語 — résumé")
+
+    def test_declared_charset_is_used(self):
+        page = '<html><head><meta charset="iso-8859-1"></head><body><p>Caf\xe9</p></body></html>'.encode("latin-1")
+        self.assertEqual(extract_html([page])["main_content"], "Café")
+
+    def test_byte_cap_is_enforced(self):
+        extractor = StreamingHTMLExtractor(max_bytes=1000)
+        accepted = [extractor.feed_bytes(chunk) for chunk in chunked(PAGE, 300)]
+        result = extractor.finish()
+
+        self.assertEqual(result["bytes_processed"], 1000)
+        self.assertTrue(result["truncated"])
+        self.assertFalse(accepted[-1])
+
+    def test_large_page_memory_is_bounded(self):
+        paragraph = b"<p>" + b"lorem ipsum dolor sit amet " * 40 + b"</p>"
+        rows = b"<table>" + b"<tr><td>cell</td><td>value</td></tr>" * 20000 + b"</table>"
+        body = paragraph * 8000 + rows
+        page = b"<html><body><article>" + body + b"</article></body></html>"
+        self.assertGreater(len(page), 8 * 1024 * 1024)
+
+        tracemalloc.start()
+        try:
+            result = extract_html(chunked(page, 64 * 1024), max_bytes=len(page), max_text_chars=50_000)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLessEqual(len(result["main_content"]), 50_000 + 8000)
+        self.assertEqual(len(result["tables"][0]), 200)
+        # Far below the page size: nothing proportional to the input is kept
+        self.assertLess(peak, 4 * 1024 * 1024)
+
+class TestDataExtractorTool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def page(request):
+            return web.Response(body=PAGE, content_type="text/html", charset="utf-8")
+        app = web.Application()
+        app.router.add_get("/article", page)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.client = HttpClient()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_extraction_types(self):
+        tool = DataExtractorTool(http=self.client)
+        url = str(self.server.make_url("/article"))
+
+        text = await tool._arun(url, "text")
+        self.assertEqual(text["data"]["title"], "Quantum Computing Roundup")
+        self.assertIn("surface codes", text["data"]["main_content"])
+        self.assertEqual(text["stats"]["http_status"], 200)
+        self.assertEqual(text["stats"]["content_length"], len(PAGE))
+        self.assertGreater(text["stats"]["quality_score"], 0)
+
+        tables = await tool._arun(url, "table")
+        self.assertEqual(tables["data"]["tables"][0][1], ["Alpha", "105"])
+        lists = await tool._arun(url, "list")
+        self.assertIn(["Surface codes", "Cat qubits"], lists["data"]["lists"])
+        metadata = await tool._arun(url, "metadata")
+        self.assertEqual(metadata["data"]["metadata"]["author"], "Ada Lovelace")
+        self.assertNotIn("main_content", metadata["data"])
+
+    async def test_byte_cap_on_tool(self):
+        tool = DataExtractorTool(http=self.client, max_page_bytes=500)
+        result = await tool._arun(str(self.server.make_url("/article")))
+        self.assertEqual(result["stats"]["content_length"], 500)
+        self.assertTrue(result["stats"]["truncated"])
+
+class TestSyncExtraction(unittest.TestCase):
+    def setUp(self):
+        async def start():
+            async def page(request):
+                return web.Response(body=PAGE, content_type="text/html", charset="utf-8")
+            app = web.Application()
+            app.router.add_get("/article", page)
+            server = TestServer(app)
+            await server.start_server()
+            return server
+        # Served from the tool loop, so it keeps answering while the test's own loop is blocked
+        self.server = run_sync(start())
+        self.client = HttpClient()
+
+    def tearDown(self):
+        run_sync(self.client.close())
+        run_sync(self.server.close())
+
+    def test_sync_calls_share_one_session_with_or_without_a_running_loop(self):
+        tool = DataExtractorTool(http=self.client)
+        url = str(self.server.make_url("/article"))
+        first = tool._run(url)
+
+        async def from_running_loop():
+            return CustomTool(data_extractor=tool)._run({"action": "extract_data", "params": {"url": url}})
+
+        second = asyncio.run(from_running_loop())
+        self.assertNotIn("error", second)
+        self.assertEqual(second["data"], first["data"])
+        self.assertEqual(len(self.client._sessions), 1)
+
+if __name__ == "__main__":
+    unittest.main()
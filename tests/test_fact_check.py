@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from hello_world.tools.claims import VerdictMemo, group_near_duplicates, normalize_claim
+from hello_world.tools.custom_tool import FactCheckerTool
+
+QUBITS = "Researchers reported error-corrected logical qubits with longer coherence times in 2025"
+
+class CountingFactChecker(FactCheckerTool):
+    verify_calls: int = 0
+
+    def _verify(self, claim):
+        self.verify_calls += 1
+        return super()._verify(claim)
+
+class TestClaimGrouping(unittest.TestCase):
+    def test_normalize_claim(self):
+        self.assertEqual(normalize_claim("  The Earth orbits the SUN!! "), "earth orbits sun")
+        self.assertEqual(normalize_claim("Water isn't wet"), "water is not wet")
+        self.assertEqual(normalize_claim("Pi is 3.14."), "pi is 3.14")
+
+    def test_near_duplicates_share_a_group(self):
+        claims = [
+            QUBITS,
+            "In 2025, researchers reported error-corrected logical qubits with longer coherence times",
+            "researchers have reported error corrected logical qubits with longer coherence times in 2025.",
+            "The moon is made of cheese"
+        ]
+        groups = group_near_duplicates([normalize_claim(c) for c in claims])
+        self.assertEqual(groups, [0, 0, 0, 3])
+
+    def test_negations_and_numbers_are_never_merged(self):
+        claims = [
+            QUBITS,
+            QUBITS.replace("reported", "never reported"),
+            QUBITS.replace("2025", "2024")
+        ]
+        groups = group_near_duplicates([normalize_claim(c) for c in claims], threshold=0.5)
+        self.assertEqual(groups, [0, 1, 2])
+
+class TestCheckMany(unittest.TestCase):
+    def setUp(self):
+        self.tool = CountingFactChecker(memo=VerdictMemo())
+
+    def test_each_group_verified_once(self):
+        claims = [QUBITS, QUBITS.upper(), QUBITS + ".", "In 2025, researchers reported error-corrected "
+                  "logical qubits with longer coherence times", "The moon is made of cheese"] * 20
+        report = self.tool.check_many(claims)
+
+        self.assertEqual(self.tool.verify_calls, 2)
+        self.assertEqual(len(report["results"]), 100)
+        self.assertEqual([r["claim"] for r in report["results"]], claims)
+        self.assertEqual(report["stats"]["unique_claims"], 3)
+        self.assertEqual(report["stats"]["verified"], 2)
+        self.assertEqual(report["stats"]["dedup_ratio"], 0.98)
+        self.assertEqual(report["results"][3]["canonical_claim"], QUBITS)
+        self.assertEqual(len(self.tool.verification_history), 100)
+
+    def test_verdicts_memoized_across_calls(self):
+        self.tool.check_many([QUBITS])
+        report = self.tool.check_many([QUBITS.lower(), "  " + QUBITS + "!"])
+        self.assertEqual(self.tool.verify_calls, 1)
+        self.assertEqual(report["stats"]["memo_hits"], 1)
+        self.assertEqual(report["stats"]["dedup_ratio"], 1.0)
+
+    def test_results_are_independent_copies(self):
+        results = self.tool.check_many([QUBITS, QUBITS])["results"]
+        results[0]["supporting_sources"][0]["reachable"] = False
+        self.assertNotIn("reachable", results[1]["supporting_sources"][0])
+
+    def test_single_claim_run(self):
+        result = self.tool._run(QUBITS)
+        self.assertEqual(result["claim"], QUBITS)
+        self.assertEqual(result["verification_status"], "verified")
+
+class TestVerdictMemo(unittest.TestCase):
+    def test_persists_between_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "memo.jsonl")
+            CountingFactChecker(memo=VerdictMemo(path=path)).check_many([QUBITS])
+
+            fresh = CountingFactChecker(memo=VerdictMemo(path=path))
+            report = fresh.check_many([QUBITS])
+            self.assertEqual(fresh.verify_calls, 0)
+            self.assertEqual(report["stats"]["memo_hits"], 1)
+
+    def test_file_is_opened_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "nested", "memo.jsonl")
+            memo = VerdictMemo(path=path)
+            with mock.patch("hello_world.tools.claims.open", create=True, wraps=open) as opened:
+                for index in range(20):
+                    memo.put(f"claim-{index}", {"verification_status": "verified"})
+            memo.close()
+            self.assertEqual(opened.call_count, 1)
+
+            memo.put("after-close", {})
+            memo.close()
+            self.assertEqual(len(VerdictMemo(path=path)), 21)
+
+    def test_bounded(self):
+        memo = VerdictMemo(maxlen=2)
+        for key in ("a", "b", "c"):
+            memo.put(key, {})
+        self.assertEqual(len(memo), 2)
+        self.assertIsNone(memo.get("a"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import asyncio
+import gzip
+import unittest
+from unittest import mock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from hello_world.tools.custom_tool import DataExtractorTool, FactCheckerTool, SourceValidatorTool, WebSearchTool
+from hello_world.tools.http_client import HttpClient
+
+PAGE = b"<html><head><title>Stand-in</title></head><body>" + b"content " * 2000 + b"</body></html>"
+
+class StandInServer:
+    """Local HTTP server standing in for the web during tests"""
+
+    def __init__(self):
+        self.connections = set()
+        self.flaky_calls = 0
+        app = web.Application()
+        app.router.add_get("/page", self.page)
+        app.router.add_get("/gzip", self.gzipped)
+        app.router.add_get("/flaky", self.flaky)
+        app.router.add_get("/slow", self.slow)
+        self.server = TestServer(app)
+
+    async def start(self):
+        await self.server.start_server()
+
+    async def close(self):
+        await self.server.close()
+
+    def url(self, path):
+        return str(self.server.make_url(path))
+
+    async def page(self, request):
+        self.connections.add(request.transport.get_extra_info("peername"))
+        return web.Response(body=PAGE, content_type="text/html",
+                            headers={"Last-Modified": "Mon, 27 Jan 2025 00:00:00 GMT"})
+
+    async def gzipped(self, request):
+        return web.Response(body=gzip.compress(PAGE), headers={
+            "Content-Encoding": "gzip", "Content-Type": "text/html"
+        })
+
+    async def flaky(self, request):
+        self.flaky_calls += 1
+        if self.flaky_calls < 3:
+            return web.Response(status=503)
+        return web.Response(text="recovered")
+
+    async def slow(self, request):
+        await asyncio.sleep(1)
+        return web.Response(text="late")
+
+class TestHttpClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = StandInServer()
+        await self.server.start()
+        self.client = HttpClient(max_per_host=4, backoff_base=0.01, max_retries=3)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_connections_are_pooled_per_host(self):
+        results = await asyncio.gather(*(self.client.fetch(self.server.url("/page")) for _ in range(40)))
+        self.assertTrue(all(r.status == 200 and r.body == PAGE for r in results))
+        self.assertLessEqual(len(self.server.connections), 4)
+
+    async def test_gzip_is_decoded_transparently(self):
+        result = await self.client.fetch(self.server.url("/gzip"))
+        self.assertEqual(result.body, PAGE)
+        self.assertIn("gzip", self.client.headers["Accept-Encoding"])
+
+    async def test_retries_retryable_status(self):
+        result = await self.client.fetch(self.server.url("/flaky"))
+        self.assertEqual(result.status, 200)
+        self.assertEqual(result.attempts, 3)
+        self.assertEqual(result.text(), "recovered")
+        self.assertEqual(self.client.stats["retries"], 2)
+
+    async def test_timeout_raises_after_retries(self):
+        client = HttpClient(timeout=0.05, max_retries=1, backoff_base=0.01)
+        try:
+            with self.assertRaises(asyncio.TimeoutError):
+                await client.fetch(self.server.url("/slow"))
+            self.assertEqual(client.stats["failures"], 1)
+            probe = await client.probe(self.server.url("/slow"))
+            self.assertFalse(probe["reachable"])
+        finally:
+            await client.close()
+
+    async def test_max_bytes_caps_body(self):
+        result = await self.client.fetch(self.server.url("/page"), max_bytes=100)
+        self.assertEqual(result.body, PAGE[:100])
+
+    async def test_tools_share_the_client(self):
+        extractor = DataExtractorTool(http=self.client)
+        validator = SourceValidatorTool(http=self.client)
+        search = WebSearchTool(http=self.client)
+        self.assertIs(search.http, extractor.http)
+
+        extracted = await extractor._arun(self.server.url("/page"))
+        validated = await validator._arun(self.server.url("/page"))
+
+        self.assertEqual(extracted["stats"]["content_length"], len(PAGE))
+        self.assertEqual(extracted["stats"]["http_status"], 200)
+        self.assertTrue(validated["availability"]["reachable"])
+        self.assertIsNotNone(validated["availability"]["last_modified"])
+
+    async def test_canned_results_are_not_fetched(self):
+        async def no_network(client, url, *args, **kwargs):
+            raise AssertionError(f"fetched {url}")
+
+        with mock.patch.object(HttpClient, "fetch", no_network):
+            searched = await WebSearchTool(http=self.client)._arun("quantum error correction")
+            checked = await FactCheckerTool()._arun("Qubits decohere")
+        self.assertEqual(searched["results"][0]["url"], "https://example.com/1")
+        self.assertEqual(checked["verification_status"], "verified")
+
+    async def test_concurrent_fetches_share_pooled_connections(self):
+        results = await asyncio.gather(*(self.client.fetch(self.server.url("/page")) for _ in range(300)))
+        self.assertTrue(all(r.status == 200 and r.attempts == 1 for r in results))
+        self.assertEqual((self.client.stats["requests"], self.client.stats["retries"]), (300, 0))
+        self.assertEqual(self.client.stats["bytes_received"], 300 * len(PAGE))
+        self.assertLessEqual(len(self.server.connections), 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import unittest
+from fake_crew import fake_crew
+from hello_world.config.config_loader import ConfigLoader
+from hello_world.crew import CrewRun
+from hello_world.llm import InjectedError
+from hello_world.metrics import Histogram, MetricsCollector, Rule
+
+class TestRules(unittest.TestCase):
+    def setUp(self):
+        self.collector = MetricsCollector(ConfigLoader().load_analysis())
+
+    def test_rules_resolve_analysis_thresholds(self):
+        rules = {rule.name: rule for rule in self.collector.rules}
+        self.assertEqual(set(rules), {"Cache Optimization", "Memory Management", "Load Balancing", "Error Handling"})
+        self.assertEqual(rules["Cache Optimization"].threshold, 200.0)
+        self.assertEqual(rules["Memory Management"].value_name, "memory_usage")
+        self.assertEqual(rules["Error Handling"].threshold, 1.0)
+
+    def test_evaluate_against_values(self):
+        values = {"response_time": 250.0, "memory_usage": 100.0, "cpu_utilization": 10.0, "error_rate": None}
+        alerts = self.collector.alerts(values)
+        self.assertEqual([a["rule"] for a in alerts], ["Cache Optimization"])
+        self.assertEqual(alerts[0]["action"], "Implement response caching")
+        self.assertEqual(alerts[0]["value"], 250.0)
+
+    def test_unsupported_conditions(self):
+        with self.assertRaises(ValueError):
+            Rule({"rule": "x", "condition": "__import__('os') > 1"}, {})
+        with self.assertRaises(ValueError):
+            Rule({"rule": "x", "condition": "latency > metrics.Latency.threshold"}, {})
+        self.assertTrue(Rule({"condition": "error_rate >= 5"}, {}).evaluate({"error_rate": 5})["triggered"])
+
+class TestCollector(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [("0.1", 2), ("1", 3), ("+Inf", 4)])
+
+    def test_window_values(self):
+        collector = MetricsCollector(ConfigLoader().load_analysis(), window=100)
+        for _ in range(95):
+            collector.record_stage("researcher", "web_researcher", 0.5, time_to_first_token=0.05)
+        for _ in range(5):
+            collector.record_stage("researcher", "web_researcher", 0.5, error=InjectedError("x"))
+
+        values = collector.values()
+        self.assertAlmostEqual(values["response_time"], 50.0)
+        self.assertEqual(values["error_rate"], 5.0)
+        self.assertGreater(values["memory_usage"], 1)
+        self.assertEqual({a["rule"] for a in collector.alerts()}, {"Error Handling"})
+
+        snapshot = json.loads(json.dumps(collector.snapshot()))
+        stage = snapshot["stages"]["researcher/web_researcher"]
+        self.assertEqual((stage["duration"]["count"], stage["errors"]), (100, 5))
+
+    def test_response_time_is_time_to_first_token(self):
+        collector = MetricsCollector(ConfigLoader().load_analysis())
+        # A long answer that starts quickly is not slow to respond
+        for _ in range(20):
+            collector.record_stage("processor", "data_processor", 3.0, time_to_first_token=0.08)
+        self.assertAlmostEqual(collector.values()["response_time"], 80.0)
+        self.assertEqual(collector.alerts(), [])
+
+        collector.record_stage("processor", "data_processor", 3.0, time_to_first_token=0.9)
+        collector.record_stage("processor", "data_processor", 3.0, time_to_first_token=0.9)
+        self.assertEqual([a["rule"] for a in collector.alerts()], ["Cache Optimization"])
+
+    def test_prometheus_text(self):
+        collector = MetricsCollector(ConfigLoader().load_analysis())
+        collector.record_stage("researcher", "web_researcher", 0.4, time_to_first_token=0.3)
+        collector.record_run(0.4)
+        text = collector.to_prometheus()
+
+        self.assertIn('hello_world_stage_duration_seconds_bucket{stage="researcher",agent="web_researcher",le="0.5"} 1', text)
+        self.assertIn('hello_world_stage_duration_seconds_count{stage="researcher",agent="web_researcher"} 1', text)
+        self.assertIn('hello_world_runs_total{status="ok"} 1', text)
+        self.assertIn('hello_world_rule_triggered{rule="Cache Optimization",priority="high"} 1', text)
+        self.assertIn("# TYPE hello_world_run_duration_seconds histogram", text)
+        for line in text.splitlines():
+            if not line.startswith("#"):
+                float(line.rsplit(" ", 1)[1])
+
+class TestCrewMetrics(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_stage_raises_alert_on_run(self):
+        crew, _ = fake_crew(self, latency=0.25, response_tokens=20)
+        run = CrewRun("prompt", "research")
+        alerts = run.events.subscribe(kinds=("alert",))
+        await crew.execute(run)
+
+        self.assertEqual([a["rule"] for a in run.alerts], ["Cache Optimization"])
+        self.assertEqual([e.data["rule"] for e in alerts.drain()], ["Cache Optimization"])
+        self.assertEqual(run.to_dict()["alerts"][0]["threshold"], 200.0)
+        self.assertEqual(crew.metrics.snapshot()["runs"]["ok"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from hello_world.microbench import (
+    CASES, IMPROVED, NEW, OK, OVER_BUDGET, REGRESSED, compare, failures, load_baseline, measure,
+    response_time_budget_ms, run_cases, save_baseline
+)
+
+class TestMicrobench(unittest.TestCase):
+    def test_budget_comes_from_analysis_yaml(self):
+        self.assertEqual(response_time_budget_ms(), 200.0)
+        self.assertEqual(response_time_budget_ms("missing.yaml"), 200.0)
+
+    def test_measure_calibrates_call_count(self):
+        calls = []
+        result = measure(lambda: calls.append(1), rounds=3, min_time=0.005)
+        self.assertGreater(result["number"], 1)
+        self.assertGreaterEqual(len(calls), result["number"] * 3)
+        self.assertGreater(result["ops_per_sec"], 0)
+
+    def test_compare_gates_regressions_and_budget(self):
+        baseline = {"a": {"ms_per_op": 1.0}, "b": {"ms_per_op": 1.0}, "c": {"ms_per_op": 1.0},
+                    "d": {"ms_per_op": 100.0}}
+        results = {"a": {"ms_per_op": 1.1}, "b": {"ms_per_op": 1.5}, "c": {"ms_per_op": 0.5},
+                   "d": {"ms_per_op": 250.0}, "e": {"ms_per_op": 2.0}}
+        report = compare(results, baseline, tolerance=0.25, budget_ms=200.0)
+
+        self.assertEqual({e["case"]: e["status"] for e in report},
+                         {"a": OK, "b": REGRESSED, "c": IMPROVED, "d": OVER_BUDGET, "e": NEW})
+        self.assertAlmostEqual(report[1]["change"], 0.5)
+        self.assertEqual([e["case"] for e in failures(report)], ["b", "d"])
+
+    def test_baseline_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            self.assertEqual(load_baseline(path), {})
+            save_baseline(path, {"a": {"ms_per_op": 1.0}})
+            self.assertEqual(load_baseline(path), {"a": {"ms_per_op": 1.0}})
+
+    def test_run_cases_reports_every_case(self):
+        # Timings are only checked by benchmarks/ and the CLI, not here
+        results = run_cases(rounds=1, min_time=0.001)
+        self.assertEqual(set(results), set(CASES))
+        for result in results.values():
+            self.assertGreater(result["ms_per_op"], 0)
+
+    def test_over_budget_takes_precedence(self):
+        budget = response_time_budget_ms()
+        baseline = {"slow": {"ms_per_op": budget + 1}, "fast": {"ms_per_op": 1.0}}
+        results = {"slow": {"ms_per_op": budget + 1}, "fast": {"ms_per_op": 5.0},
+                   "new": {"ms_per_op": budget * 2}, "edge": {"ms_per_op": budget}}
+        report = compare(results, baseline, budget_ms=budget)
+
+        self.assertEqual({e["case"]: e["status"] for e in report},
+                         {"slow": OVER_BUDGET, "fast": REGRESSED, "new": OVER_BUDGET, "edge": NEW})
+
+    def test_unknown_case(self):
+        with self.assertRaises(ValueError):
+            run_cases(["nope"])
+
+if __name__ == "__main__":
+    unittest.main()
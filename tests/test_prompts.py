@@ -0,0 +1,87 @@
+import unittest
+from hello_world.catalog import AgentCatalog
+from hello_world.crew import CrewRun, HelloWorldCrew
+from hello_world.llm import TRIM_MARKER, estimate_tokens, trim_to_tokens
+from hello_world.prompts import PromptTemplate
+
+def legacy_prompt(config, user_prompt):
+    """The f-string HelloWorldCrew._get_agent_prompt built on every call"""
+    return f"""You are a {config['role']} with the goal: {config['goal']}.
+Use ReACT (Reasoning and Acting) methodology with the following structure:
+
+1. Thought: {config['react_config']['components']['thought']['structure']}
+2. Action: Specify the action to take
+3. Observation: Document results
+4. {config['react_config']['components'].get('reflection', {}).get('name', 'Reflection')}: Analyze and plan next steps
+
+Format your response using this template:
+[THOUGHT] Your reasoning here...
+[ACTION] Your proposed action...
+[OBSERVATION] Results and findings...
+[{config['react_config']['components'].get('reflection', {}).get('name', 'REFLECTION')}] Analysis and next steps...
+
+User Prompt: {user_prompt}
+"""
+
+class TestTrimToTokens(unittest.TestCase):
+    def test_short_text_unchanged(self):
+        self.assertEqual(trim_to_tokens("short prompt", 100), "short prompt")
+
+    def test_trim_is_deterministic_and_within_budget(self):
+        text = " ".join(f"word{i}" for i in range(5000))
+        trimmed = trim_to_tokens(text, 200)
+
+        self.assertEqual(trimmed, trim_to_tokens(text, 200))
+        self.assertLessEqual(estimate_tokens(trimmed), 200)
+        self.assertIn(TRIM_MARKER, trimmed)
+        self.assertTrue(trimmed.startswith("word0 word1"))
+        self.assertTrue(trimmed.endswith("word4999"))
+        head, tail = trimmed.split(TRIM_MARKER)
+        # Cuts fall on word boundaries
+        self.assertTrue(tail.split()[0].startswith("word") and tail.split()[0][4:].isdigit())
+        self.assertIn(head.split()[-1], text.split())
+
+class TestPromptTemplates(unittest.TestCase):
+    def setUp(self):
+        self.catalog = AgentCatalog(use_snapshot=False)
+
+    def test_render_matches_previous_prompt(self):
+        for name, config in self.catalog.agents.items():
+            template = self.catalog.prompt_template(name)
+            self.assertEqual(template.render("Compare EV battery suppliers"),
+                             legacy_prompt(config, "Compare EV battery suppliers"))
+
+    def test_templates_built_once_per_load(self):
+        template = self.catalog.prompt_template("web_researcher")
+        self.assertIs(self.catalog.prompt_template("web_researcher"), template)
+        report = self.catalog.prompt_report()
+        self.assertEqual(set(report), set(self.catalog.agents))
+        self.assertEqual(report["web_researcher"]["budget"], 2048)
+        self.assertEqual(report["web_researcher"]["template_tokens"], template.template_tokens)
+
+    def test_oversized_user_prompt_is_trimmed_to_budget(self):
+        config = dict(self.catalog.agents["web_researcher"], model={"name": "gemini-pro", "max_prompt_tokens": 512})
+        template = PromptTemplate.from_config(config)
+        prompt, report = template.render_with_report("lorem ipsum " * 10_000)
+
+        self.assertTrue(report["trimmed"])
+        self.assertLessEqual(report["prompt_tokens"], 512)
+        self.assertEqual(report["prompt_tokens"], estimate_tokens(prompt))
+        self.assertTrue(prompt.startswith(template.prefix))
+
+        # The response cap is a separate setting and leaves the prompt budget alone
+        config = dict(config, model={"name": "gemini-pro", "max_tokens": 512})
+        self.assertEqual(PromptTemplate.from_config(config).budget, 2048)
+
+    def test_crew_records_prompt_size_on_run(self):
+        crew = HelloWorldCrew()
+        run = CrewRun("What changed in solid state batteries?")
+        config = crew.agent_catalog.get_agent_by_tag("research")
+        prompt = crew._get_agent_prompt(config, run.prompt, run, "researcher")
+
+        self.assertEqual(prompt, legacy_prompt(config, run.prompt))
+        self.assertFalse(run.prompts["researcher"]["trimmed"])
+        self.assertEqual(run.to_dict()["prompts"]["researcher"]["agent"], "web_researcher")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import time
+import unittest
+from unittest import mock
+from hello_world.catalog import AgentCatalog
+from hello_world.crew import stream_gemini_response
+from hello_world.llm import (
+    FakeBackend, RateLimiter, RateLimitError, RetryPolicy, SingleFlight, TokenBucket, is_rate_limit_error,
+    is_retryable_error, limited_stream
+)
+from hello_world.render import SILENT, Renderer
+from hello_world.tools.http_client import HttpClient
+
+class ResourceExhausted(Exception):
+    """Stands in for google.api_core.exceptions.ResourceExhausted"""
+    code = 429
+
+class TestTokenBucket(unittest.TestCase):
+    def test_refill_and_wait_time(self):
+        bucket = TokenBucket(10, period=1.0)
+        now = time.monotonic()
+        self.assertEqual(bucket.wait_time(10, now), 0.0)
+        bucket.take(10)
+        self.assertAlmostEqual(bucket.wait_time(5, now), 0.5, places=2)
+        # More than the capacity only ever waits for a full bucket
+        self.assertAlmostEqual(bucket.wait_time(50, now), 1.0, places=2)
+
+class TestErrors(unittest.TestCase):
+    def test_classification(self):
+        self.assertTrue(is_rate_limit_error(RateLimitError()))
+        self.assertTrue(is_rate_limit_error(ResourceExhausted()))
+        self.assertFalse(is_rate_limit_error(ConnectionError()))
+        self.assertTrue(is_retryable_error(ConnectionError()))
+        self.assertTrue(is_retryable_error(asyncio.TimeoutError()))
+        self.assertFalse(is_retryable_error(ValueError()))
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_from_agent_config(self):
+        catalog = AgentCatalog()
+        researcher = RetryPolicy.from_config(catalog.get_agent_by_tag("research"))
+        self.assertEqual((researcher.retry_attempts, researcher.fallback_strategy), (3, "alternate_sources"))
+        self.assertEqual(RetryPolicy.from_config(catalog.get_agent_by_tag("execution")).retry_attempts, 2)
+        self.assertEqual(RetryPolicy.from_config({}).retry_attempts, 0)
+
+    def test_should_retry_and_backoff(self):
+        policy = RetryPolicy(retry_attempts=2, backoff_base=0.1, backoff_max=0.3)
+        self.assertTrue(policy.should_retry(RateLimitError(), 2))
+        self.assertFalse(policy.should_retry(RateLimitError(), 3))
+        self.assertFalse(policy.should_retry(ValueError(), 1))
+        for attempt in range(1, 6):
+            self.assertLessEqual(policy.backoff(attempt), min(0.3, 0.1 * 2 ** (attempt - 1)))
+
+    def test_model_and_http_retries_share_backoff(self):
+        client = HttpClient(backoff_base=0.1, backoff_max=0.3)
+        policy = RetryPolicy(backoff_base=0.1, backoff_max=0.3)
+        with mock.patch("hello_world.backoff.random.uniform", side_effect=lambda low, high: high):
+            self.assertEqual([policy.backoff(a) for a in range(1, 4)], [0.1, 0.2, 0.3])
+            self.assertEqual([client._backoff(a) for a in range(1, 4)], [0.1, 0.2, 0.3])
+        self.assertEqual(client._backoff(1, retry_after=5.0), 0.3)
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_requests_per_period(self):
+        limiter = RateLimiter(rpm=5, period=0.5)
+        started = time.perf_counter()
+
+        async def request():
+            await limiter.acquire()
+            limiter.release()
+
+        await asyncio.gather(*(request() for _ in range(10)))
+        # The first 5 go at once, the next 5 as the bucket refills at 10/sec
+        self.assertGreaterEqual(time.perf_counter() - started, 0.4)
+        self.assertEqual(limiter.stats()["granted"], 10)
+
+    async def test_concurrency_limit_and_queue_depth(self):
+        limiter = RateLimiter(max_concurrency=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        cancelled = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        self.assertEqual((limiter.stats()["in_flight"], limiter.stats()["queue_depth"]), (2, 2))
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.queue_depth, 1)
+        limiter.release()
+        await waiter
+        self.assertEqual((limiter.in_flight, limiter.queue_depth), (2, 0))
+
+    async def test_aimd(self):
+        limiter = RateLimiter(max_concurrency=8)
+        for _ in range(4):
+            await limiter.acquire()
+        limiter.release(error=RateLimitError())
+        # Halved from the 4 in flight when the quota pushed back
+        self.assertEqual(limiter.concurrency_limit, 2.0)
+        limiter.release(error=ConnectionError())
+        self.assertEqual(limiter.concurrency_limit, 2.0)
+        for _ in range(2):
+            limiter.release()
+        self.assertGreater(limiter.concurrency_limit, 2.0)
+        stats = limiter.stats()
+        self.assertEqual((stats["rate_limited"], stats["failed"], stats["succeeded"]), (1, 1, 2))
+
+    async def test_unused_tokens_are_returned(self):
+        limiter = RateLimiter(tpm=100, period=60.0)
+        await limiter.acquire(80)
+        self.assertLess(limiter.stats()["tokens_available"], 21)
+        limiter.release(80, used=20)
+        self.assertGreater(limiter.stats()["tokens_available"], 79)
+
+    async def test_prometheus_text(self):
+        limiter = RateLimiter(rpm=60, max_concurrency=4)
+        text = limiter.to_prometheus()
+        self.assertIn("hello_world_llm_limiter_concurrency_limit 4", text)
+        self.assertIn("hello_world_llm_limiter_queue_depth 0", text)
+        self.assertIn("# TYPE hello_world_llm_limiter_rate_limited_total counter", text)
+        self.assertNotIn("tokens_available", text)
+
+class TestLimitedStream(unittest.IsolatedAsyncioTestCase):
+    async def test_retries_before_the_first_chunk_only(self):
+        failures = [RateLimitError("quota"), ConnectionError("reset")]
+
+        async def chunks():
+            yield "hello "
+            yield "world"
+
+        async def open_stream():
+            if failures:
+                raise failures.pop(0)
+            return chunks()
+
+        limiter = RateLimiter()
+        policy = RetryPolicy(retry_attempts=2, backoff_base=0.001)
+        received = [c async for c in limited_stream(open_stream, policy, limiter)]
+        self.assertEqual(received, ["hello ", "world"])
+        self.assertEqual((limiter.counters["retries"], limiter.in_flight), (2, 0))
+
+        async def broken():
+            yield "partial"
+            raise ConnectionError("reset")
+
+        async def open_broken():
+            return broken()
+
+        received = []
+        with self.assertRaises(ConnectionError):
+            async for chunk in limited_stream(open_broken, policy, limiter):
+                received.append(chunk)
+        self.assertEqual(received, ["partial"])
+        self.assertEqual(limiter.counters["retries"], 2)
+
+    async def test_attempts_are_limited(self):
+        calls = []
+
+        async def open_stream():
+            calls.append(1)
+            raise RateLimitError("quota")
+
+        with self.assertRaises(RateLimitError):
+            async for _ in limited_stream(open_stream, RetryPolicy(retry_attempts=1, backoff_base=0.001)):
+                pass
+        self.assertEqual(len(calls), 2)
+
+class TestQuotaCeiling(unittest.IsolatedAsyncioTestCase):
+    async def run_streams(self, backend, limiter, retry_policy=None, count=12):
+        with mock.patch.dict(os.environ, {"CACHE_ENABLED": "false"}):
+            return await asyncio.gather(*(
+                stream_gemini_response(f"prompt {i}", backend=backend, limiter=limiter, retry_policy=retry_policy,
+                                       renderer=Renderer(SILENT), single_flight=SingleFlight())
+                for i in range(count)
+            ), return_exceptions=True)
+
+    async def test_limiter_and_retries_run_at_the_quota_without_failures(self):
+        backend = FakeBackend(latency=0.0, tokens_per_sec=0, response_tokens=10, rpm_quota=4, quota_period=0.25)
+        limiter = RateLimiter(rpm=4, period=0.25)
+        results = await self.run_streams(backend, limiter, RetryPolicy(retry_attempts=3, backoff_base=0.05))
+        self.assertFalse([r for r in results if isinstance(r, Exception)])
+        self.assertEqual(backend.calls, 12)
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+    async def test_without_limiter_the_quota_rejects_requests(self):
+        backend = FakeBackend(latency=0.0, tokens_per_sec=0, response_tokens=10, rpm_quota=4, quota_period=0.25)
+        results = await self.run_streams(backend, RateLimiter())
+        self.assertEqual(sum(isinstance(r, RateLimitError) for r in results), 8)
+        self.assertEqual(backend.stats()["rate_limited"], 8)
+
+if __name__ == "__main__":
+    unittest.main()
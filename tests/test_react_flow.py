@@ -1,6 +1,6 @@
 import unittest
 import yaml
-from hello_world.config.react_validation import ReactValidator
+from hello_world.config.react_validation import ReactStreamValidator, ReactValidator
 
 class TestReactFlow(unittest.TestCase):
     def setUp(self):
@@ -67,5 +67,72 @@ class TestReactFlow(unittest.TestCase):
         self.validator.stream_update(message)
         self.assertIn(message, self.validator.stream_history)
 
+class TestReactStreamValidator(unittest.TestCase):
+    RESPONSE = ("[THOUGHT] I should analyze the user input before proceeding\n"
+                "[ACTION] search_web(query=\"CrewAI framework\")\n"
+                "[OBSERVATION] Found 5 relevant articles about CrewAI\n"
+                "[REFLECTION] The articles cover the basics; next, compare frameworks.")
+
+    def setUp(self):
+        with open("src/hello_world/config/prompts.yaml", "r") as f:
+            self.rules = yaml.safe_load(f)["templates"]["validation_rules"]
+
+    def feed_in_chunks(self, validator, text, size):
+        closed = []
+        for i in range(0, len(text), size):
+            closed.extend(validator.feed(text[i:i + size]))
+        return closed
+
+    def test_sections_validated_as_they_close(self):
+        validator = ReactStreamValidator(self.rules)
+        closed = validator.feed("[THOUGHT] I should analyze the user input before proceeding\n[ACT")
+        self.assertEqual(closed, [])
+        closed = validator.feed("ION] search_web(query=1)\n[OBS")
+        self.assertEqual(closed, [{"section": "THOUGHT", "valid": True, "length": 49}])
+        self.assertEqual(validator.feed("ERVATION] ok")[0]["section"], "ACTION")
+
+    def test_chunk_size_does_not_matter(self):
+        reports = []
+        for size in (1, 3, 17, len(self.RESPONSE)):
+            validator = ReactStreamValidator(self.rules)
+            self.feed_in_chunks(validator, self.RESPONSE, size)
+            reports.append(validator.finish())
+        self.assertTrue(reports[0]["valid"])
+        self.assertEqual(len(reports[0]["sections"]), 4)
+        self.assertTrue(all(report == reports[0] for report in reports))
+
+    def test_missing_header_aborts_early(self):
+        validator = ReactStreamValidator(self.rules, max_preamble_chars=50)
+        validator.feed("Here is a long answer that ignores the template entirely, ")
+        self.assertTrue(validator.should_abort)
+        self.assertIn("No ReACT section header", validator.abort_reason)
+        self.assertEqual(validator.feed("[THOUGHT] too late"), [])
+
+    def test_out_of_order_section_aborts(self):
+        validator = ReactStreamValidator(self.rules)
+        validator.feed("[THOUGHT] I should analyze the user input before proceeding [OBSERVATION] x")
+        self.assertTrue(validator.should_abort)
+        self.assertEqual(validator.abort_reason, "[OBSERVATION] is out of order after [THOUGHT]")
+
+    def test_invalid_sections_abort_after_limit(self):
+        validator = ReactStreamValidator(self.rules, max_invalid_sections=2)
+        validator.feed("[THOUGHT] short [ACTION] no parens ")
+        self.assertFalse(validator.should_abort)
+        validator.feed("[OBSERVATION] fine")
+        self.assertTrue(validator.should_abort)
+        self.assertEqual([s["valid"] for s in validator.sections], [False, False])
+
+    def test_report_only_mode_and_missing_sections(self):
+        validator = ReactStreamValidator(self.rules, max_preamble_chars=5, early_abort=False)
+        validator.feed("no template here at all")
+        self.assertFalse(validator.should_abort)
+        report = validator.finish()
+        self.assertFalse(report["valid"])
+        self.assertFalse(report["aborted"])
+
+        validator = ReactStreamValidator(self.rules)
+        validator.feed("[THOUGHT] I should analyze the user input before proceeding")
+        self.assertIn("Missing [ACTION] section", validator.finish()["errors"])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import io
+import json
+import unittest
+from hello_world.crew import stream_gemini_response
+from hello_world.llm import FakeBackend
+from hello_world.render import CONSOLE, JSONL, SILENT, Renderer
+
+class CountingIO(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+class TestRenderer(unittest.IsolatedAsyncioTestCase):
+    def test_tokens_are_written_per_frame(self):
+        out = CountingIO()
+        renderer = Renderer(CONSOLE, fps=1, file=out)
+        for i in range(1000):
+            renderer.write(f"token {i}\n")
+        self.assertLessEqual(out.writes, 1)
+        renderer.close()
+        self.assertEqual(out.getvalue().count("\n"), 1000)
+        self.assertEqual(renderer.tokens, 1000)
+
+    def test_concurrent_streams_do_not_interleave_mid_line(self):
+        out = io.StringIO()
+        renderer = Renderer(CONSOLE, fps=1000, file=out)
+        for word in ["alpha ", "beta ", "gamma\n"]:
+            renderer.write(word, "researcher")
+            renderer.write(word.upper(), "processor")
+        renderer.write("unfinished", "processor")
+        renderer.end_stream("researcher")
+        renderer.end_stream("processor")
+
+        self.assertCountEqual(out.getvalue().splitlines(), [
+            "[researcher] alpha beta gamma",
+            "[processor] ALPHA BETA GAMMA",
+            "[processor] unfinished",
+        ])
+
+    def test_message_follows_pending_tokens(self):
+        out = io.StringIO()
+        renderer = Renderer(CONSOLE, fps=1, file=out)
+        renderer.write("first line\n")
+        renderer.message("status")
+        self.assertEqual(out.getvalue(), "first line\nstatus\n")
+
+    def test_jsonl_and_silent_modes(self):
+        out = io.StringIO()
+        renderer = Renderer(JSONL, fps=1, file=out)
+        renderer.write("Hello ", "researcher")
+        renderer.write("world", "researcher")
+        renderer.end_stream("researcher")
+        renderer.banner("BANNER")
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        tokens = [r for r in records if r["type"] == "tokens"]
+        self.assertEqual("".join(r["text"] for r in tokens), "Hello world")
+        self.assertTrue(all(r["stream"] == "researcher" for r in tokens))
+        self.assertEqual(records[-2:], [
+            {"type": "stream_end", "stream": "researcher"},
+            {"type": "banner", "text": "BANNER"},
+        ])
+
+        silent_out = io.StringIO()
+        silent = Renderer(SILENT, file=silent_out)
+        silent.write("x")
+        silent.message("y")
+        silent.close()
+        self.assertEqual(silent_out.getvalue(), "")
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            Renderer("fancy")
+
+    async def test_timer_flushes_idle_stream(self):
+        out = io.StringIO()
+        renderer = Renderer(CONSOLE, fps=50, file=out)
+        renderer.write("warm up\n")
+        renderer.write("complete line\n")
+        self.assertNotIn("complete line", out.getvalue())
+        await asyncio.sleep(0.05)
+        self.assertIn("complete line", out.getvalue())
+
+    async def test_stream_gemini_response_renders_named_stream(self):
+        out = io.StringIO()
+        renderer = Renderer(CONSOLE, file=out)
+        backend = FakeBackend(latency=0.0, tokens_per_sec=0, response_tokens=30)
+        output = await stream_gemini_response("prompt", backend=backend, renderer=renderer, stream_id="researcher")
+
+        lines = out.getvalue().splitlines()
+        self.assertTrue(all(line.startswith("[researcher] ") for line in lines))
+        self.assertEqual("\n".join(line[len("[researcher] "):] for line in lines), output.rstrip("\n"))
+
+if __name__ == "__main__":
+    unittest.main()
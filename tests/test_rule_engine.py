@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import yaml
+from hello_world.config.react_validation import ReactValidator
+from hello_world.config.rule_engine import RuleEngine, compile_format, format_prefix
+
+class TestRuleEngine(unittest.TestCase):
+    def setUp(self):
+        with open("src/hello_world/config/prompts.yaml", "r") as f:
+            self.rules = yaml.safe_load(f)["templates"]["validation_rules"]
+        self.engine = RuleEngine(self.rules)
+
+    def test_format_templates_compile_to_named_fields(self):
+        pattern = compile_format("Action: {action_name}({params})")
+        match = pattern.match('Action: search_web(query="a (b)")')
+        self.assertEqual(match.group("action_name"), "search_web")
+        self.assertEqual(match.group("params"), 'query="a (b)"')
+        self.assertIsNone(pattern.match("Action: search_web"))
+        self.assertEqual(format_prefix("Thought: {reasoning}"), "Thought:")
+
+    def test_rules_come_from_prompts_yaml(self):
+        action = self.engine.rules["action"]
+        self.assertEqual(action.format, self.rules["action"]["format"])
+        self.assertEqual(action.required_fields, ("action_name", "params"))
+        self.assertEqual(self.engine.rules["thought"].min_length, 20)
+
+    def test_failure_reasons(self):
+        self.assertIsNone(self.engine.rules["action"].failure("Action: fact_check(claim=\"x\")"))
+        self.assertEqual(self.engine.rules["action"].failure("Action: fact_check()"), "required_fields")
+        self.assertEqual(self.engine.rules["action"].failure("Act: fact_check(x)"), "format")
+        self.assertEqual(self.engine.rules["thought"].failure("Thought: short"), "min_length")
+
+    def test_custom_formats_are_honoured(self):
+        engine = RuleEngine({"action": {"format": "CALL {action_name} WITH {params}",
+                                        "required_fields": ["action_name"]}})
+        self.assertTrue(engine.check("action", "CALL search WITH query=x"))
+        self.assertFalse(engine.check("action", "Action: search(query=x)"))
+        self.assertTrue(ReactValidator({"action": {"format": "CALL {action_name} WITH {params}"}})
+                        .validate_action("CALL search WITH x"))
+
+    def test_bulk_counts_per_rule(self):
+        lines = [
+            "Thought: I should analyze the user input before proceeding\n",
+            "Thought: too short\n",
+            "[THOUGHT] Section headers are validated like prefixed lines\n",
+            "Action: search_web(query=\"CrewAI\")\n",
+            "Action: search_web\n",
+            "Observation: Found 5 relevant articles\n",
+            "free text\n",
+        ]
+        report = ReactValidator(self.rules).validate_transcripts(lines)
+
+        self.assertEqual(report["lines"], 7)
+        self.assertEqual(report["unmatched"], 1)
+        self.assertEqual(report["rules"]["thought"], {"passed": 2, "failed": 1, "failures": {"min_length": 1}})
+        self.assertEqual(report["rules"]["action"], {"passed": 1, "failed": 1, "failures": {"format": 1}})
+        self.assertEqual(report["rules"]["observation"]["passed"], 1)
+
+    def test_bulk_files(self):
+        lines = ["Thought: I should analyze the user input before proceeding",
+                 "Action: search_web(query=\"CrewAI\")", "Observation: ok", "narrative"] * 5_000
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i in range(2):
+                paths.append(os.path.join(tmp, f"run_{i}.txt"))
+                with open(paths[-1], "w") as f:
+                    f.write("\n".join(lines) + "\n")
+            report = self.engine.validate_files(paths)
+
+        self.assertEqual(report["files"], 2)
+        self.assertEqual(report["lines"], 40_000)
+        self.assertEqual(report["unmatched"], 10_000)
+        self.assertEqual(report["rules"]["thought"]["passed"], 10_000)
+        self.assertEqual(report["rules"]["action"]["passed"], 10_000)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+from hello_world.scheduler import StageScheduler
+
+class TestStageScheduler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.scheduler = StageScheduler()
+        self.events = []
+
+    def _stage(self, name, delay=0.1, fail=False):
+        async def run():
+            self.events.append(f"start:{name}")
+            await asyncio.sleep(delay)
+            if fail:
+                raise RuntimeError(f"{name} failed")
+            self.events.append(f"end:{name}")
+            return name
+        return run
+
+    async def test_independent_stages_overlap(self):
+        self.scheduler.add_stage("researcher", self._stage("researcher"))
+        self.scheduler.add_stage("processor", self._stage("processor"))
+
+        report = await self.scheduler.run()
+
+        # Wall time tracks the longest stage rather than the sum
+        self.assertLess(report.wall_time, 0.18)
+        self.assertGreater(report.total_stage_time, 0.18)
+        self.assertGreater(report.overlap_ratio, 0.3)
+        self.assertEqual(report.stages["researcher"]["status"], "completed")
+
+    async def test_dependencies_run_in_order(self):
+        self.scheduler.add_stage("analyzer", self._stage("analyzer", 0.01), depends_on=["processor"])
+        self.scheduler.add_stage("processor", self._stage("processor", 0.05))
+
+        report = await self.scheduler.run()
+
+        self.assertLess(self.events.index("end:processor"), self.events.index("start:analyzer"))
+        self.assertGreaterEqual(report.stages["analyzer"]["start"], report.stages["processor"]["end"])
+        self.assertEqual(report.stages["analyzer"]["depends_on"], ["processor"])
+
+    async def test_unselected_dependency_is_satisfied(self):
+        self.scheduler.add_stage("processor", self._stage("processor", 0.01))
+        self.scheduler.add_stage("analyzer", self._stage("analyzer", 0.01), depends_on=["processor"])
+
+        report = await self.scheduler.run(["analyzer"])
+
+        self.assertEqual(list(report.stages), ["analyzer"])
+        self.assertNotIn("start:processor", self.events)
+
+    async def test_failure_skips_dependents(self):
+        self.scheduler.add_stage("processor", self._stage("processor", 0.01, fail=True))
+        self.scheduler.add_stage("analyzer", self._stage("analyzer", 0.01), depends_on=["processor"])
+        self.scheduler.add_stage("researcher", self._stage("researcher", 0.02))
+
+        with self.assertRaises(RuntimeError):
+            await self.scheduler.run()
+
+        report = self.scheduler.last_report
+        self.assertEqual(report.stages["processor"]["status"], "failed")
+        self.assertEqual(report.stages["analyzer"]["status"], "skipped")
+        self.assertEqual(report.stages["researcher"]["status"], "completed")
+
+    def test_cycle_detection(self):
+        self.scheduler.add_stage("a", self._stage("a"), depends_on=["b"])
+        self.scheduler.add_stage("b", self._stage("b"), depends_on=["a"])
+        with self.assertRaises(ValueError):
+            self.scheduler.execution_order()
+
+    def test_unknown_stage(self):
+        self.scheduler.add_stage("a", self._stage("a"), depends_on=["missing"])
+        with self.assertRaises(ValueError):
+            self.scheduler.execution_order()
+        with self.assertRaises(ValueError):
+            self.scheduler.execution_order(["nope"])
+
+    async def test_report_format(self):
+        self.scheduler.add_stage("researcher", self._stage("researcher", 0.01))
+        report = await self.scheduler.run()
+        text = report.format()
+        self.assertIn("researcher", text)
+        self.assertIn("Overlap", text)
+        self.assertIn("wall_time", report.to_dict())
+
+if __name__ == "__main__":
+    unittest.main()
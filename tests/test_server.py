@@ -0,0 +1,148 @@
+import asyncio
+import json
+import unittest
+from aiohttp.test_utils import TestClient, TestServer
+from fake_crew import fake_crew
+from hello_world.server import CrewServer, sse_frame
+
+def parse_sse(body):
+    """(event, data) pairs of a server-sent event stream"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+class TestCrewServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        crew, self.backend = fake_crew(self)
+        self.server = CrewServer(crew, max_runs=4, drain_timeout=5.0)
+        self.client = TestClient(TestServer(self.server.app(), handler_cancellation=True))
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_startup_warms_the_crew(self):
+        self.assertIsNotNone(self.server.crew.validation_rules)
+
+    async def test_json_run(self):
+        response = await self.client.post("/runs", json={"prompt": "battery suppliers", "task_type": "research",
+                                                          "id": "r1"})
+        self.assertEqual(response.status, 200)
+        record = await response.json()
+        self.assertEqual((record["id"], record["status"], record["task_type"]), ("r1", "ok", "research"))
+        self.assertEqual(list(record["outputs"]), ["researcher"])
+        self.assertIn("[THOUGHT]", record["outputs"]["researcher"])
+
+    async def test_task_type_from_path(self):
+        response = await self.client.post("/analyze", json="battery suppliers")
+        record = await response.json()
+        self.assertEqual(record["task_type"], "analyze")
+        self.assertEqual(list(record["outputs"]), ["analyzer"])
+
+    async def test_invalid_requests(self):
+        response = await self.client.post("/runs", data="not json")
+        self.assertEqual(response.status, 400)
+        response = await self.client.post("/runs", json={"prompt": "x", "task_type": "dance"})
+        self.assertEqual(response.status, 400)
+        self.assertIn("task_type", (await response.json())["error"])
+        response = await self.client.post("/runs", json={"task_type": "research"})
+        self.assertEqual(response.status, 400)
+
+    async def test_server_sent_events(self):
+        response = await self.client.post("/research", json={"prompt": "battery suppliers"},
+                                          headers={"Accept": "text/event-stream"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers["Content-Type"], "text/event-stream")
+        events = parse_sse(await response.text())
+
+        kinds = [kind for kind, _ in events]
+        self.assertEqual(kinds[0], "run_started")
+        self.assertEqual(kinds[-1], "result")
+        self.assertLess(kinds.index("stage_started"), kinds.index("token"))
+        tokens = "".join(data["text"] for kind, data in events if kind == "token")
+        result = events[-1][1]
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(tokens, result["outputs"]["researcher"])
+
+    async def test_concurrent_runs_share_one_loop(self):
+        responses = await asyncio.gather(*(
+            self.client.post("/runs?stream=true", json={"prompt": f"prompt {i}", "task_type": "both"})
+            for i in range(8)
+        ))
+        results = [parse_sse(await r.text())[-1][1] for r in responses]
+        self.assertTrue(all(r["status"] == "ok" for r in results))
+        self.assertEqual(self.backend.calls, 16)
+
+        health = await (await self.client.get("/health")).json()
+        self.assertEqual((health["status"], health["in_flight"], health["succeeded"]), ("ok", 0, 8))
+
+    async def test_model_error_is_reported(self):
+        self.backend.error_rate = 1.0
+        response = await self.client.post("/runs", json={"prompt": "x", "task_type": "research"})
+        self.assertEqual(response.status, 502)
+        self.assertIn("InjectedError", (await response.json())["error"])
+
+    async def test_drain_finishes_runs_in_flight_and_rejects_new_ones(self):
+        self.backend.latency = 0.2
+        pending = asyncio.ensure_future(self.client.post("/runs", json={"prompt": "x", "task_type": "research"}))
+        while self.server.in_flight == 0:
+            await asyncio.sleep(0.01)
+
+        cancelled = await self.server.drain()
+        self.assertEqual(cancelled, 0)
+        self.assertEqual((await (await pending).json())["status"], "ok")
+        response = await self.client.post("/runs", json={"prompt": "x"})
+        self.assertEqual(response.status, 503)
+        self.assertEqual((await (await self.client.get("/health")).json())["status"], "draining")
+
+    async def test_drain_timeout_cancels_runs(self):
+        self.backend.latency = 5.0
+        pending = asyncio.ensure_future(self.client.post("/runs", json={"prompt": "x", "task_type": "research"}))
+        while self.server.in_flight == 0:
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(await self.server.drain(timeout=0.05), 1)
+        record = await (await pending).json()
+        self.assertIn("CancelledError", record["error"])
+
+    async def wait_until_idle(self):
+        while self.server.in_flight:
+            await asyncio.sleep(0.01)
+
+    async def test_client_disconnect_cancels_json_run(self):
+        self.backend.latency = 5.0
+        pending = asyncio.ensure_future(self.client.post("/runs", json={"prompt": "x", "task_type": "research"}))
+        while self.server.in_flight == 0:
+            await asyncio.sleep(0.01)
+
+        pending.cancel()
+        await asyncio.wait_for(self.wait_until_idle(), 2.0)
+        health = await (await self.client.get("/health")).json()
+        self.assertEqual((health["cancelled"], health["succeeded"]), (1, 0))
+
+    async def test_client_disconnect_cancels_streamed_run(self):
+        self.backend.latency = 5.0
+        response = await self.client.post("/research", json={"prompt": "x"},
+                                          headers={"Accept": "text/event-stream"})
+        self.assertIn(b"run_started", await response.content.readuntil(b"\n\n"))
+
+        response.close()
+        await asyncio.wait_for(self.wait_until_idle(), 2.0)
+        health = await (await self.client.get("/health")).json()
+        self.assertEqual((health["cancelled"], health["succeeded"]), (1, 0))
+
+    async def test_metrics_endpoint(self):
+        await self.client.post("/runs", json={"prompt": "x", "task_type": "research"})
+        response = await self.client.get("/metrics")
+        text = await response.text()
+        self.assertIn('hello_world_runs_total{status="ok"} 1', text)
+        self.assertIn("hello_world_llm_limiter_in_flight 0", text)
+
+class TestSseFrame(unittest.TestCase):
+    def test_frame_encoding(self):
+        self.assertEqual(sse_frame("token", {"text": "a\nb"}), b'event: token\ndata: {"text": "a\\nb"}\n\n')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+from hello_world.crew import stream_gemini_response
+from hello_world.llm import FakeBackend, InjectedError, ResponseCache, SingleFlight, get_single_flight
+from hello_world.render import SILENT, Renderer
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.backend = FakeBackend(latency=0.05, tokens_per_sec=400, response_tokens=40)
+        self.flights = SingleFlight()
+        self.renderer = Renderer(SILENT)
+        patcher = mock.patch.dict(os.environ, {"CACHE_ENABLED": "false"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stream(self, prompt="prompt", **kwargs):
+        options = {"backend": self.backend, "single_flight": self.flights, "renderer": self.renderer, **kwargs}
+        return stream_gemini_response(prompt, **options)
+
+    async def test_identical_requests_share_one_upstream_stream(self):
+        outputs = await asyncio.gather(*(self.stream() for _ in range(10)))
+        self.assertEqual(self.backend.calls, 1)
+        self.assertEqual(len(set(outputs)), 1)
+        self.assertEqual(self.flights.stats(), {"leaders": 1, "joins": 9, "abandoned": 0, "in_flight": 0})
+
+    async def test_different_requests_are_not_shared(self):
+        await asyncio.gather(self.stream("a"), self.stream("b"),
+                             self.stream("a", generation_config={"temperature": 0.1}))
+        self.assertEqual(self.backend.calls, 3)
+
+    async def test_late_joiner_gets_chunks_already_emitted(self):
+        first = asyncio.create_task(self.stream())
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.flights.in_flight, 1)
+        late = await self.stream()
+        self.assertEqual(late, await first)
+        self.assertEqual(self.backend.calls, 1)
+        self.assertEqual(self.flights.counters["joins"], 1)
+
+    async def test_cancelled_subscriber_does_not_end_stream_for_others(self):
+        leader = asyncio.create_task(self.stream())
+        follower = asyncio.create_task(self.stream())
+        await asyncio.sleep(0.08)
+        leader.cancel()
+        output = await follower
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+
+        # The follower got the whole response from the one upstream stream
+        self.assertEqual(self.backend.calls, 1)
+        fresh = FakeBackend(latency=0.0, tokens_per_sec=0, response_tokens=40)
+        self.assertEqual(output, await self.stream(backend=fresh, single_flight=SingleFlight()))
+        self.assertEqual(self.flights.counters["abandoned"], 0)
+
+    async def test_stream_is_cancelled_once_every_subscriber_left(self):
+        tasks = [asyncio.create_task(self.stream()) for _ in range(3)]
+        await asyncio.sleep(0.08)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(0)
+        self.assertEqual(self.flights.stats()["abandoned"], 1)
+        self.assertEqual(self.flights.in_flight, 0)
+
+    async def test_upstream_error_reaches_every_subscriber(self):
+        self.backend.error_rate = 1.0
+        results = await asyncio.gather(*(self.stream() for _ in range(3)), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, InjectedError) for r in results))
+        self.assertEqual(self.backend.calls, 1)
+
+    async def test_shared_response_is_cached_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(cache_dir=tmp)
+            outputs = await asyncio.gather(*(self.stream(cache=cache) for _ in range(4)))
+            self.assertEqual(cache.counters["stores"], 1)
+            self.assertEqual(await self.stream(cache=cache), outputs[0])
+            self.assertEqual(self.backend.calls, 1)
+
+    async def test_disabled_by_environment(self):
+        with mock.patch.dict(os.environ, {"SINGLE_FLIGHT_ENABLED": "false"}):
+            self.assertIsNone(get_single_flight())
+            await asyncio.gather(*(self.stream(single_flight=None) for _ in range(3)))
+        self.assertEqual(self.backend.calls, 3)
+
+if __name__ == "__main__":
+    unittest.main()
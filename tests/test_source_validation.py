@@ -0,0 +1,115 @@
+import os
+import time
+import unittest
+from unittest import mock
+from datetime import date
+from hello_world.tools.credibility import (
+    DomainCredibilityCache, domain_signals, normalize_domain, page_signals, score_batch
+)
+from hello_world.tools.custom_tool import SourceValidatorTool
+
+def research_urls(pages=300, domains=30):
+    return [f"https://www.site{i % domains}.com/articles/{i}" for i in range(pages)]
+
+class TestCredibilitySignals(unittest.TestCase):
+    def test_normalize_domain(self):
+        self.assertEqual(normalize_domain("WWW.Nature.com:443"), "nature.com")
+        self.assertEqual(normalize_domain("user@news.example.org"), "news.example.org")
+        self.assertEqual(normalize_domain("[::1]:8080"), "::1")
+
+    def test_domain_signals(self):
+        self.assertEqual(domain_signals("nature.com"), {"domain_authority": 0.9, "peer_review_status": 1.0})
+        self.assertEqual(domain_signals("cs.stanford.edu")["domain_authority"], 0.85)
+        self.assertEqual(domain_signals("en.wikipedia.org")["domain_authority"], 0.9)
+        self.assertLess(domain_signals("127.0.0.1")["domain_authority"], 0.5)
+        self.assertLess(domain_signals("")["domain_authority"], 0.5)
+
+    def test_recency_from_url_path(self):
+        today = date(2025, 6, 1)
+        self.assertEqual(page_signals("https://a.com/2025/06/story", today)["last_updated"], 1.0)
+        self.assertEqual(page_signals("https://a.com/2015-01-02/story", today)["last_updated"], 0.0)
+        self.assertEqual(page_signals("https://a.com/story", today)["last_updated"], 0.5)
+
+    def test_score_batch_matches_per_url_weighted_sum(self):
+        weights = {"domain_authority": 0.3, "citation_count": 0.2, "last_updated": 0.15,
+                   "author_credentials": 0.2, "peer_review_status": 0.15}
+        rows = [{"citation_count": 0.5, "last_updated": v, "author_credentials": 0.5} for v in (0.0, 0.5, 1.0)]
+        scores = score_batch([0.1, 0.2, 0.3], rows, weights)
+        expected = [round(p + 0.2 * 0.5 + 0.15 * r["last_updated"] + 0.2 * 0.5, 4)
+                    for p, r in zip([0.1, 0.2, 0.3], rows)]
+        self.assertEqual(scores, expected)
+
+class TestDomainCredibilityCache(unittest.TestCase):
+    def test_ttl_expiry(self):
+        cache = DomainCredibilityCache(ttl=0.05)
+        cache.put("a.com", {"domain_authority": 0.5})
+        self.assertIsNotNone(cache.get("a.com"))
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("a.com"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_lru_bound(self):
+        cache = DomainCredibilityCache(max_domains=2)
+        for domain in ("a.com", "b.com", "c.com"):
+            cache.put(domain, {})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("a.com"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+class TestValidateMany(unittest.TestCase):
+    def setUp(self):
+        self.cache = DomainCredibilityCache()
+        self.tool = SourceValidatorTool(domain_cache=self.cache)
+
+    def test_domain_metrics_computed_once_per_domain(self):
+        urls = research_urls(pages=300, domains=30)
+        results = self.tool.validate_many(urls)
+
+        self.assertEqual([r["source_url"] for r in results], urls)
+        self.assertEqual(self.cache.stats()["misses"], 30)
+        self.assertEqual(len(self.tool.validation_history), 300)
+
+        self.tool.validate_many(urls)
+        stats = self.cache.stats()
+        self.assertEqual(stats["misses"], 30)
+        self.assertEqual(stats["hits"], 30)
+
+    def test_batch_matches_single_validation(self):
+        urls = ["https://www.nature.com/articles/x", "https://blog.example.net/2019/03/post", "http://10.0.0.1/"]
+        batch = self.tool.validate_many(urls)
+        for url, result in zip(urls, batch):
+            single = self.tool._run(url)
+            self.assertEqual(single["credibility_score"], result["credibility_score"])
+            self.assertEqual(single["metrics"], result["metrics"])
+        self.assertGreater(batch[0]["credibility_score"], batch[1]["credibility_score"])
+        self.assertGreater(batch[1]["credibility_score"], batch[2]["credibility_score"])
+        self.assertIn("Published by a peer-reviewed outlet", batch[0]["recommendations"])
+
+    def test_shared_cache_across_tools(self):
+        other = SourceValidatorTool(domain_cache=self.cache)
+        self.tool.validate_many(["https://reuters.com/a"])
+        other.validate_many(["https://reuters.com/b"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_trusted_domains_change_rescores(self):
+        url = "https://example.org/report"
+        before = self.tool.validate_many([url])[0]["metrics"]["domain_authority"]
+        with mock.patch.dict(os.environ, {"TRUSTED_DOMAINS": "example.org"}):
+            trusted = self.tool.validate_many([url])[0]["metrics"]["domain_authority"]
+        self.assertLess(before, trusted)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_batch_scores_each_domain_once(self):
+        urls = research_urls(pages=600, domains=40)
+        uncached = SourceValidatorTool(domain_cache=DomainCredibilityCache(ttl=0))
+        with mock.patch("hello_world.tools.custom_tool.domain_signals", wraps=domain_signals) as computed:
+            for url in urls:
+                uncached._run(url)
+            self.assertEqual(computed.call_count, 600)
+
+            computed.reset_mock()
+            self.tool.validate_many(urls)
+            self.assertEqual(computed.call_count, 40)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+
+HEAVY_MODULES = ["crewai", "langchain", "google.generativeai", "requests", "bs4"]
+
+REPORT_HEAVY = "[m for m in %r if m in sys.modules]" % (HEAVY_MODULES,)
+
+def run_fresh(script):
+    """Run `script` in a fresh interpreter and return the JSON it prints last"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), CACHE_ENABLED="false")
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script)],
+        capture_output=True, text=True, env=env, timeout=60
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+class TestStartup(unittest.TestCase):
+    def test_help_does_not_load_heavy_dependencies(self):
+        report = run_fresh(f"""
+            import json, runpy, sys
+            sys.argv = ["main", "--help"]
+            try:
+                runpy.run_module("hello_world.main", run_name="__main__")
+            except SystemExit:
+                pass
+            print()
+            print(json.dumps({REPORT_HEAVY}))
+        """)
+        self.assertEqual(report, [])
+
+    def test_crew_import_does_not_load_heavy_dependencies(self):
+        report = run_fresh(f"""
+            import json, sys
+            import hello_world.crew
+            import hello_world.tools
+            print(json.dumps({REPORT_HEAVY}))
+        """)
+        self.assertEqual(report, [])
+
+    def test_first_prompt_is_sent_without_heavy_dependencies(self):
+        report = run_fresh(f"""
+            import asyncio, json, sys
+            from hello_world.crew import HelloWorldCrew, stream_gemini_response
+
+            sent = []
+
+            class FakeModel:
+                async def generate_content_async(self, prompt, generation_config=None, stream=False):
+                    sent.append(prompt)
+                    async def chunks():
+                        yield "[THOUGHT] ok"
+                    return chunks()
+
+            crew = HelloWorldCrew()
+            config = crew.agent_catalog.get_agent_by_tag("research")
+            prompt = crew._get_agent_prompt(config, "startup benchmark")
+            asyncio.run(stream_gemini_response(prompt, model=FakeModel()))
+            print()
+            print(json.dumps({{"sent": len(sent), "heavy": {REPORT_HEAVY}}}))
+        """)
+        self.assertEqual(report, {"sent": 1, "heavy": []})
+
+    def test_tools_load_on_demand(self):
+        report = run_fresh("""
+            import json, sys
+            import hello_world.tools as tools
+            before = "hello_world.tools.custom_tool" in sys.modules
+            tool_class = tools.CustomTool
+            after = "hello_world.tools.custom_tool" in sys.modules
+            print(json.dumps({"before": before, "after": after, "name": tool_class.__name__}))
+        """)
+        self.assertFalse(report["before"])
+        self.assertTrue(report["after"])
+        self.assertEqual(report["name"], "CustomTool")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from fake_crew import fake_crew
+from hello_world.crew import CrewRun
+from hello_world.store import RunStore, get_run_store, prompt_hash
+
+class TestRunStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.crew, self.backend = fake_crew(self)
+        self.store = RunStore(os.path.join(self.tmp.name, "runs.db"), flush_interval=0.05)
+        self.crew.run_store = self.store
+
+    def tearDown(self):
+        self.store.close()
+
+    def execute(self, prompt, task_type="both"):
+        return asyncio.run(self.crew.execute(CrewRun(prompt, task_type)))
+
+    def test_run_is_stored_with_stages_outputs_and_validation(self):
+        run = self.execute("battery suppliers")
+        self.assertTrue(self.store.flush(timeout=5))
+
+        stored = self.store.get_run(run.run_id)
+        self.assertEqual((stored["prompt"], stored["prompt_hash"], stored["status"]),
+                         ("battery suppliers", prompt_hash("battery suppliers"), "ok"))
+        self.assertEqual(set(stored["stages"]), {"researcher", "processor"})
+        self.assertEqual(stored["outputs"], run.outputs)
+        self.assertEqual(stored["validation"]["researcher"], run.validation["researcher"].report())
+        researcher = stored["stages"]["researcher"]
+        self.assertEqual(researcher["agent"], run.prompts["researcher"]["agent"])
+        self.assertEqual(researcher["tokens"], run.stream_stats["researcher"].tokens)
+        self.assertGreaterEqual(researcher["started_at"], stored["started_at"])
+
+    def test_failed_run_is_stored(self):
+        self.backend.error_rate = 1.0
+        with self.assertRaises(Exception):
+            self.execute("flaky", "research")
+        self.store.flush(timeout=5)
+        [stored] = self.store.runs(prompt="flaky")
+        self.assertEqual(stored["status"], "error")
+        self.assertIn("InjectedError", stored["error"])
+        self.assertEqual(self.store.stages(stage="researcher")[0]["status"], "failed")
+
+    def test_queries(self):
+        before = time.time()
+        for prompt in ("a", "b", "a"):
+            self.execute(prompt, "research")
+        self.store.flush(timeout=5)
+
+        self.assertEqual(self.store.count(), 3)
+        self.assertEqual(len(self.store.runs(prompt="a")), 2)
+        self.assertEqual(len(self.store.runs(since=before, limit=2)), 2)
+        self.assertEqual(self.store.runs(until=before), [])
+        newest = self.store.runs(prompt="a")[0]
+        self.assertEqual(self.store.latest_outputs("a"), self.store.get_run(newest["run_id"])["outputs"])
+        self.assertIsNone(self.store.latest_outputs("never asked"))
+
+        agent = self.store.stages()[0]["agent"]
+        self.assertEqual(len(self.store.stages(agent=agent)), 3)
+        [summary] = self.store.stage_summary()
+        self.assertEqual((summary["stage"], summary["runs"], summary["failed"]), ("researcher", 3, 0))
+        self.assertGreater(summary["mean_duration"], 0)
+
+    def test_writes_are_batched(self):
+        self.store.close()
+        self.store = RunStore(os.path.join(self.tmp.name, "batched.db"), batch_size=50, flush_interval=5.0)
+        self.crew.run_store = self.store
+        for i in range(20):
+            self.execute(f"prompt {i}", "research")
+        # Nothing is written until the batch fills or a flush asks for it
+        self.assertEqual(self.store.stats()["written"], 0)
+        self.assertTrue(self.store.flush(timeout=5))
+        self.assertEqual((self.store.stats()["written"], self.store.stats()["batches"]), (20, 1))
+        self.assertEqual(self.store.count(), 20)
+
+    def test_database_is_in_wal_mode_and_survives_reopening(self):
+        run = self.execute("persisted", "research")
+        self.store.close()
+        self.store = RunStore(self.store.path)
+        self.assertEqual(self.store.get_run(run.run_id)["outputs"], run.outputs)
+        journal_mode = self.store._query("PRAGMA journal_mode", [])[0][0]
+        self.assertEqual(journal_mode, "wal")
+
+class TestStuckWriter(unittest.TestCase):
+    def test_flush_and_close_give_up_after_timeout(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with mock.patch.object(RunStore, "_write_batch", lambda store, conn, batch: release.wait(5)):
+            store = RunStore(os.path.join(tmp.name, "runs.db"), batch_size=1, max_pending=1)
+            # The writer takes the first run and hangs; the second fills the queue
+            store.record(object())
+            while store.pending:
+                time.sleep(0.01)
+            store.record(object())
+
+            start = time.monotonic()
+            self.assertFalse(store.flush(timeout=0.1))
+            self.assertFalse(store.close(timeout=0.1))
+            self.assertLess(time.monotonic() - start, 1.0)
+
+            release.set()
+            store._writer.join(5)
+            self.assertTrue(store.close())
+
+class TestGetRunStore(unittest.TestCase):
+    def test_disabled_by_default(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("RUN_STORE_ENABLED", None)
+            self.assertIsNone(get_run_store())
+
+if __name__ == "__main__":
+    unittest.main()
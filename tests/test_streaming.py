@@ -0,0 +1,168 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+from hello_world.config.react_validation import ReactStreamValidator
+from hello_world.crew import stream_gemini_response
+from hello_world.llm import StreamStats, buffered_stream
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+class FakeStreamingModel:
+    """Local stand-in for the Gemini streaming endpoint"""
+
+    def __init__(self, chunks, delay=0.01, first_delay=0.0, fail_after=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.first_delay = first_delay
+        self.fail_after = fail_after
+        self.produced = 0
+        self.calls = []
+
+    async def _stream(self):
+        await asyncio.sleep(self.first_delay)
+        for i, text in enumerate(self.chunks):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("stream reset")
+            await asyncio.sleep(self.delay)
+            self.produced += 1
+            yield FakeChunk(text)
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        self.calls.append({"prompt": prompt, "generation_config": generation_config, "stream": stream})
+        return self._stream()
+
+class TestBufferedStream(unittest.IsolatedAsyncioTestCase):
+    async def test_yields_chunk_text_and_records_stats(self):
+        model = FakeStreamingModel(["Hello ", "", "world"], delay=0.0, first_delay=0.02)
+        stats = StreamStats("fake")
+        stats.start()
+        texts = [t async for t in buffered_stream(await model.generate_content_async("p"), stats=stats)]
+
+        self.assertEqual(texts, ["Hello ", "world"])
+        self.assertEqual(stats.chunks, 2)
+        self.assertGreater(stats.tokens, 0)
+        self.assertGreaterEqual(stats.time_to_first_token, 0.015)
+        self.assertIsNone(stats.error)
+
+    async def test_backpressure_bounds_read_ahead(self):
+        model = FakeStreamingModel([f"t{i} " for i in range(50)], delay=0.0)
+        stream = buffered_stream(await model.generate_content_async("p"), buffer_size=4)
+
+        await stream.__anext__()
+        await asyncio.sleep(0.05)
+        # Reader can hold at most the queue plus the chunk it is trying to put
+        self.assertLessEqual(model.produced, 4 + 2)
+        await stream.aclose()
+
+    async def test_early_close_stops_upstream(self):
+        model = FakeStreamingModel([f"t{i} " for i in range(100)], delay=0.001)
+        stats = StreamStats("fake")
+        stream = buffered_stream(await model.generate_content_async("p"), buffer_size=2, stats=stats)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        produced = model.produced
+        await asyncio.sleep(0.02)
+
+        self.assertEqual(model.produced, produced)
+        self.assertLess(produced, 100)
+        self.assertIsNone(stats.error)
+
+    async def test_upstream_error_propagates(self):
+        model = FakeStreamingModel(["a", "b", "c"], delay=0.0, fail_after=2)
+        stats = StreamStats("fake")
+        received = []
+        with self.assertRaises(ConnectionError):
+            async for text in buffered_stream(await model.generate_content_async("p"), stats=stats):
+                received.append(text)
+
+        self.assertEqual(received, ["a", "b"])
+        self.assertEqual(stats.error, "stream reset")
+
+    def test_invalid_buffer_size(self):
+        async def consume():
+            async for _ in buffered_stream(FakeStreamingModel([])._stream(), buffer_size=0):
+                pass
+        with self.assertRaises(ValueError):
+            asyncio.run(consume())
+
+class TestStreamGeminiResponse(unittest.IsolatedAsyncioTestCase):
+    async def test_streams_through_callback(self):
+        model = FakeStreamingModel(["[THOUGHT] ", "thinking ", "done"], delay=0.0)
+        received = []
+
+        async def on_chunk(text):
+            received.append(text)
+
+        stats = StreamStats("fake")
+        result = await stream_gemini_response("prompt", progress_callback=on_chunk, model=model, stats=stats)
+
+        self.assertEqual(result, "[THOUGHT] thinking done")
+        self.assertEqual(received, ["[THOUGHT] ", "thinking ", "done"])
+        self.assertTrue(model.calls[0]["stream"])
+        self.assertEqual(stats.chunks, 3)
+
+    async def test_concurrent_streams_share_the_loop(self):
+        models = [FakeStreamingModel([f"c{i} " for i in range(10)], delay=0.01) for _ in range(10)]
+        stats = [StreamStats("fake") for _ in models]
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            stream_gemini_response("prompt", model=model, stats=s) for model, s in zip(models, stats)
+        ))
+        elapsed = time.perf_counter() - start
+
+        # Ten 100ms streams finish together rather than back to back
+        self.assertLess(elapsed, 0.5)
+        self.assertTrue(all(r.startswith("c0 ") for r in results))
+        self.assertTrue(all(s.tokens_per_sec > 0 for s in stats))
+        self.assertTrue(all(s.time_to_first_token is not None for s in stats))
+
+    async def test_malformed_output_cancels_stream(self):
+        model = FakeStreamingModel(["Sure! "] + ["rambling without any template " for _ in range(200)], delay=0.001)
+        validator = ReactStreamValidator({"thought": {"min_length": 20}}, max_preamble_chars=100)
+
+        result = await stream_gemini_response("prompt", model=model, validator=validator)
+
+        self.assertTrue(validator.should_abort)
+        self.assertLess(len(result), 300)
+        # Upstream stopped before the call returned: only the chunks read ahead
+        # into the buffer were produced, and no more arrive afterwards
+        produced = model.produced
+        self.assertLess(produced, 60)
+        await asyncio.sleep(0.05)
+        self.assertEqual(model.produced, produced)
+
+    async def test_aborted_stream_is_closed_before_returning(self):
+        closed = []
+
+        async def tracked(source, **kwargs):
+            try:
+                async for text in buffered_stream(source, **kwargs):
+                    yield text
+            finally:
+                closed.append(True)
+
+        model = FakeStreamingModel(["Sure! "] + ["rambling without any template " for _ in range(200)], delay=0.001)
+        validator = ReactStreamValidator({"thought": {"min_length": 20}}, max_preamble_chars=100)
+        with mock.patch("hello_world.crew.buffered_stream", tracked):
+            await stream_gemini_response("prompt", model=model, validator=validator)
+        self.assertEqual(closed, [True])
+
+    async def test_well_formed_output_streams_to_the_end(self):
+        chunks = ["[THO", "UGHT] I need to check the sources first. [ACT", "ION] search(query=\"x\") ",
+                  "[OBSERVATION] Found two. [REFLECTION] Good enough."]
+        validator = ReactStreamValidator({"thought": {"min_length": 20}})
+        result = await stream_gemini_response("prompt", model=FakeStreamingModel(chunks, delay=0.0),
+                                              validator=validator)
+
+        self.assertEqual(result, "".join(chunks))
+        report = validator.report()
+        self.assertTrue(report["valid"])
+        self.assertEqual([s["section"] for s in report["sections"]], ["THOUGHT", "ACTION", "OBSERVATION", "REFLECTION"])
+
+if __name__ == "__main__":
+    unittest.main()
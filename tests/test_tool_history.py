@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from hello_world.tools.custom_tool import DataExtractorTool, WebSearchTool
+from hello_world.tools.history import HistoryRecord, ToolHistory
+
+class TestToolHistory(unittest.TestCase):
+    def test_ring_buffer_is_bounded(self):
+        history = ToolHistory(maxlen=5)
+        for i in range(12):
+            history.record(f"query {i}", "completed")
+
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history.total_recorded, 12)
+        self.assertEqual([r.subject for r in history], [f"query {i}" for i in range(7, 12)])
+        self.assertEqual(history.latest(2)[-1].subject, "query 11")
+
+    def test_records_are_compact(self):
+        record = HistoryRecord("q", "completed")
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(HistoryRecord.from_dict(record.to_dict()).subject, "q")
+
+    def test_query_helpers(self):
+        history = ToolHistory(maxlen=10)
+        history.append(HistoryRecord("a", "completed", timestamp=100.0))
+        history.append(HistoryRecord("b", "failed", timestamp=200.0, error="boom"))
+        history.append(HistoryRecord("c", "completed", timestamp=300.0))
+
+        self.assertEqual([r.subject for r in history.by_status("completed")], ["a", "c"])
+        self.assertEqual([r.subject for r in history.in_window(150.0, 300.0)], ["b"])
+        self.assertEqual([r.subject for r in history.in_window(start=200.0)], ["b", "c"])
+        self.assertEqual(history.counts(), {"completed": 2, "failed": 1})
+
+    def test_spill_keeps_evicted_records(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "web_search.jsonl")
+            history = ToolHistory(maxlen=2, spill_path=path)
+            for i in range(6):
+                history.record(f"q{i}", "failed" if i % 3 == 0 else "completed")
+
+            self.assertEqual(len(history), 2)
+            with open(path) as f:
+                self.assertEqual(len(f.readlines()), 6)
+            self.assertEqual([r.subject for r in history.iter_spilled(status="failed")], ["q0", "q3"])
+            self.assertEqual(len(list(history.iter_spilled(start=time.time() + 60))), 0)
+            history.close()
+
+    def test_spill_file_is_opened_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "nested", "web_search.jsonl")
+            history = ToolHistory(maxlen=2, spill_path=path)
+            with mock.patch("hello_world.tools.history.open", create=True, wraps=open) as opened:
+                for i in range(50):
+                    history.record(f"q{i}", "completed")
+            self.assertEqual(opened.call_count, 1)
+            self.assertEqual(len(list(history.iter_spilled())), 50)
+
+            history.close()
+            history.record("after close", "completed")
+            history.close()
+            self.assertEqual(list(history.iter_spilled())[-1].subject, "after close")
+            self.assertEqual(len(list(history.iter_spilled())), 51)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            ToolHistory(maxlen=0)
+
+class TestToolsRecordHistory(unittest.TestCase):
+    def test_search_history_omits_payload(self):
+        tool = WebSearchTool(search_history=ToolHistory(maxlen=3))
+        for i in range(5):
+            tool._run(f"query {i}")
+
+        self.assertEqual(len(tool.search_history), 3)
+        record = tool.search_history[-1]
+        self.assertEqual(record.subject, "query 4")
+        self.assertEqual(record.status, "completed")
+        self.assertEqual(record.summary, {"total_results": 1})
+        self.assertLess(len(json.dumps(record.to_dict())), 200)
+
+    def test_failures_are_recorded(self):
+        tool = DataExtractorTool()
+        with self.assertRaises(ValueError):
+            tool._run("https://example.com", extraction_type="video")
+
+        failed = tool.extraction_history.by_status("failed")
+        self.assertEqual(len(failed), 1)
+        self.assertIn("Unsupported extraction type", failed[0].error)
+
+if __name__ == "__main__":
+    unittest.main()